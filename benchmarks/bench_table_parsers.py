@@ -0,0 +1,59 @@
+"""
+Parse-throughput benchmark for HTML table parser backends.
+
+Usage::
+
+    python benchmarks/bench_table_parsers.py [saved_page.html ...] [--repeat N]
+
+Without saved registry pages a synthetic registry table is generated.
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List
+
+from polish_energy_regulatory_office.parsers import BeautifulSoupTableParser, LxmlTableParser, TableParser
+
+
+def synthetic_registry_page(rows: int = 20000) -> bytes:
+    """Generate a registry-like HTML table with given number of rows."""
+    columns = ("ID", "Nazwa", "Moc", "Data", "Woj.", "Gmina", "Operator", "Status")
+    header = "<tr>" + "".join(f"<th>{column}</th>" for column in columns) + "</tr>"
+    body = "".join(
+        f"<tr><td>OZE{i:07d}</td><td>Instalacja <b>{i}</b></td><td>{i % 900},5</td><td>2023-01-{i % 28 + 1:02d}</td>"
+        f"<td>mazowieckie</td><td>Gmina {i % 300}</td><td>Operator {i % 50} Sp. z o.o.</td><td>active</td></tr>"
+        for i in range(rows)
+    )
+    return f"<html><body><table>{header}{body}</table></body></html>".encode("utf-8")
+
+
+def benchmark(parser: TableParser, pages: List[bytes], repeat: int) -> None:
+    """Print rows and megabytes parsed per second for a parser backend."""
+    total_bytes = sum(len(page) for page in pages) * repeat
+    total_rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            total_rows += len(parser.extract_rows(page))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{parser.name:>12}: {elapsed:8.3f} s  {total_rows / elapsed:12,.0f} rows/s  "
+        f"{total_bytes / elapsed / 1e6:8.2f} MB/s"
+    )
+
+
+def main() -> None:
+    """Run benchmark for all backends."""
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument("pages", nargs="*", type=Path, help="saved registry HTML pages")
+    arguments.add_argument("--repeat", type=int, default=3, help="number of passes over the pages")
+    options = arguments.parse_args()
+
+    pages = [path.read_bytes() for path in options.pages] or [synthetic_registry_page()]
+    for parser in (LxmlTableParser(), BeautifulSoupTableParser()):
+        benchmark(parser, pages, options.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Dictionary-encoded and free-text columns shared by the registry tables and chunks."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(eq=False)
+class CategoricalColumn:
+    """Dictionary-encoded string column: integer codes into a list of categories, -1 for missing."""
+
+    codes: np.ndarray
+    categories: List[str]
+
+    def __post_init__(self) -> None:
+        """Normalize code dtype and index categories."""
+        self.codes = np.asarray(self.codes, dtype=np.int32)
+        self._lookup: Dict[str, int] = {category: code for code, category in enumerate(self.categories)}
+
+    @classmethod
+    def encode(cls, values: Sequence[Optional[str]], categories: Optional[Sequence[str]] = None) -> "CategoricalColumn":
+        """Encode values, appending unseen categories in order of first appearance."""
+        lookup: Dict[str, int] = {category: code for code, category in enumerate(categories or [])}
+        codes = np.fromiter(
+            (-1 if value is None else lookup.setdefault(value, len(lookup)) for value in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+        return cls(codes=codes, categories=list(lookup))
+
+    def code_of(self, value: str) -> int:
+        """Return code of a category or -1 when it does not occur."""
+        return self._lookup.get(value, -1)
+
+    def codes_matching(self, value: str) -> np.ndarray:
+        """Return codes of categories equal to value, ignoring case."""
+        folded = value.casefold()
+        return np.array(
+            [code for code, category in enumerate(self.categories) if category.casefold() == folded], dtype=np.int32
+        )
+
+    def recode(self, target: "CategoricalColumn") -> np.ndarray:
+        """Return row codes in target's categories: -1 for missing values, -2 for categories target lacks."""
+        translation = np.array(
+            [target._lookup.get(category, -2) for category in self.categories] + [-1], dtype=np.int32
+        )
+        codes: np.ndarray = translation[self.codes]
+        return codes
+
+    def decode(self, index: Any = slice(None)) -> List[Optional[str]]:
+        """Return category strings for selected rows."""
+        return [self.categories[code] if code >= 0 else None for code in self.codes[index].tolist()]
+
+    def take(self, index: Any) -> "CategoricalColumn":
+        """Return column restricted to selected rows, sharing categories."""
+        return CategoricalColumn(codes=self.codes[index], categories=self.categories)
+
+
+@dataclass(eq=False)
+class TextColumn:
+    """Free-text column stored as concatenated UTF-8 bytes and row offsets.
+
+    Row ``i`` is ``data[offsets[i]:offsets[i + 1]]``, so a long value only costs
+    its own row, and both arrays can be memory-mapped from a snapshot. Text is
+    decoded to ``str`` only for the rows that are read.
+    """
+
+    data: np.ndarray
+    offsets: np.ndarray
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.offsets) - 1
+
+    @classmethod
+    def encode(cls, values: Sequence[str]) -> "TextColumn":
+        """Encode values as UTF-8."""
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(data=np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets=offsets)
+
+    def decode(self, index: Any = slice(None)) -> List[str]:
+        """Return strings of selected rows."""
+        view = np.ascontiguousarray(self.data).data
+        starts = self.offsets[:-1][index].tolist()
+        stops = self.offsets[1:][index].tolist()
+        return [str(view[start:stop], "utf-8") for start, stop in zip(starts, stops)]
+
+    def to_numpy(self) -> np.ndarray:
+        """Return all rows decoded into an object array of str, for set operations."""
+        column = np.empty(len(self), dtype=object)
+        column[:] = self.decode()
+        return column
+
+    def take(self, index: Any) -> "TextColumn":
+        """Return column restricted to selected rows, gathering their bytes without decoding."""
+        starts = self.offsets[:-1][index]
+        lengths = self.offsets[1:][index] - starts
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return TextColumn(data=self.data[positions], offsets=offsets)
+
+
+def extend_categories(column: CategoricalColumn, categories: List[str]) -> np.ndarray:
+    """Return row codes of column in categories, appending categories not seen yet.
+
+    Lets consumers that accumulate many tables or chunks keep one growing
+    category list, as every column encodes its own categories.
+    """
+    lookup = {category: code for code, category in enumerate(categories)}
+    for category in column.categories:
+        if category not in lookup:
+            lookup[category] = len(categories)
+            categories.append(category)
+    translation = np.array([lookup[category] for category in column.categories], dtype=np.intp)
+    codes: np.ndarray = translation[column.codes]
+    return codes
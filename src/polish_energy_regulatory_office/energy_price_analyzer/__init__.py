@@ -6,16 +6,38 @@ It includes tools for tracking price trends, comparing tariffs, and generating
 price forecasts based on historical data.
 """
 
+from .accumulator import PriceAccumulator
 from .analyzer import EnergyPriceAnalyzer
-from .models import PriceAnalysis, PriceData, TariffStructure
+from .cache import CachingAdapter, ResponseCache
+from .forecasting import BatchForecaster
+from .models import (
+    PriceAnalysis,
+    PriceData,
+    PriceSeries,
+    RollingWindowStatistics,
+    TariffBatchResult,
+    TariffStructure,
+)
+from .rolling import rolling_statistics
 from .scrapers import UREPriceScraper
-from .utils import format_currency
+from .store import PriceStore
+from .utils import calculate_cost_matrix, format_currency
 
 __all__ = [
     "EnergyPriceAnalyzer",
     "PriceData",
+    "PriceSeries",
     "TariffStructure",
+    "TariffBatchResult",
+    "RollingWindowStatistics",
     "PriceAnalysis",
+    "PriceAccumulator",
+    "PriceStore",
     "UREPriceScraper",
+    "ResponseCache",
+    "BatchForecaster",
+    "CachingAdapter",
     "format_currency",
+    "calculate_cost_matrix",
+    "rolling_statistics",
 ]
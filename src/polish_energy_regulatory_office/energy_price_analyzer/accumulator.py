@@ -0,0 +1,145 @@
+"""Online accumulator for incremental energy price analysis."""
+
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Deque, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from .models import PriceAnalysis, PriceData, PriceSeries
+from .utils import classify_trend
+
+
+class PriceAccumulator:
+    """Incrementally maintained PriceAnalysis metrics.
+
+    Count, mean and variance are tracked with Welford's algorithm, extremes and the
+    half-window sums used for the trend label are updated on every append. Only the
+    second half of the observed prices is retained, since its oldest values move into
+    the first half as the series grows. Observations at or before the latest seen
+    timestamp are ignored, so overlapping fetches can be fed in safely.
+    """
+
+    def __init__(self, energy_type: str = "electricity"):
+        """Initialize an empty accumulator for given energy type."""
+        self.energy_type = energy_type
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_price: Optional[float] = None
+        self.max_price: Optional[float] = None
+        self.first_half_sum = 0.0
+        self.second_half_sum = 0.0
+        self.period_start: Optional[date] = None
+        self.last_timestamp: Optional[np.datetime64] = None
+        self._second_half: Deque[float] = deque()
+
+    @property
+    def period_end(self) -> Optional[date]:
+        """Return date of the latest accumulated observation."""
+        if self.last_timestamp is None:
+            return None
+        day: date = self.last_timestamp.astype("datetime64[D]").astype(object)
+        return day
+
+    @property
+    def variance(self) -> float:
+        """Return sample variance of accumulated prices."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def update(self, data: Union[PriceData, PriceSeries, Iterable[PriceData]]) -> "PriceAccumulator":
+        """Add a single observation or a batch of observations."""
+        if isinstance(data, PriceData):
+            series = PriceSeries.from_price_data([data], self.energy_type)
+        elif isinstance(data, PriceSeries):
+            series = data
+        else:
+            series = PriceSeries.from_price_data(list(data), self.energy_type)
+
+        dates, prices = series.dates, series.prices
+        if self.last_timestamp is not None:
+            newer = dates > self.last_timestamp
+            dates, prices = dates[newer], prices[newer]
+        if len(prices) == 0:
+            return self
+
+        batch_count = len(prices)
+        batch_mean = float(prices.mean())
+        batch_m2 = float(np.square(prices - batch_mean).sum())
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.m2 += batch_m2 + delta * delta * self.count * batch_count / total
+        self.mean += delta * batch_count / total
+        self.count = total
+
+        batch_min, batch_max = float(prices.min()), float(prices.max())
+        self.min_price = batch_min if self.min_price is None else min(self.min_price, batch_min)
+        self.max_price = batch_max if self.max_price is None else max(self.max_price, batch_max)
+
+        if self.period_start is None:
+            self.period_start = dates[0].astype("datetime64[D]").astype(object)
+        self.last_timestamp = dates[-1]
+
+        self._second_half.extend(prices.tolist())
+        self.second_half_sum += float(prices.sum())
+        while len(self._second_half) > self.count - self.count // 2:
+            moved = self._second_half.popleft()
+            self.first_half_sum += moved
+            self.second_half_sum -= moved
+
+        return self
+
+    def analysis(self, period_start: Optional[date] = None, period_end: Optional[date] = None) -> PriceAnalysis:
+        """Emit PriceAnalysis for the accumulated observations."""
+        start = period_start or self.period_start or date.today()
+        end = period_end or self.period_end or start
+
+        if self.count < 2:
+            trend = "stable"
+        else:
+            half = self.count // 2
+            trend = classify_trend(self.first_half_sum / half, self.second_half_sum / (self.count - half))
+
+        return PriceAnalysis(
+            period_start=start,
+            period_end=end,
+            energy_type=self.energy_type,
+            average_price=self.mean if self.count else 0.0,
+            price_trend=trend,
+            volatility=float(np.sqrt(self.variance)),
+            min_price=self.min_price,
+            max_price=self.max_price,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize accumulator state to a JSON-compatible dictionary."""
+        return {
+            "energy_type": self.energy_type,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min_price": self.min_price,
+            "max_price": self.max_price,
+            "first_half_sum": self.first_half_sum,
+            "second_half": list(self._second_half),
+            "period_start": self.period_start.isoformat() if self.period_start else None,
+            "last_timestamp": str(self.last_timestamp) if self.last_timestamp is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PriceAccumulator":
+        """Restore accumulator from dictionary produced by to_dict."""
+        accumulator = cls(energy_type=data["energy_type"])
+        accumulator.count = int(data["count"])
+        accumulator.mean = float(data["mean"])
+        accumulator.m2 = float(data["m2"])
+        accumulator.min_price = data.get("min_price")
+        accumulator.max_price = data.get("max_price")
+        accumulator.first_half_sum = float(data["first_half_sum"])
+        accumulator._second_half = deque(float(value) for value in data["second_half"])
+        accumulator.second_half_sum = float(sum(accumulator._second_half))
+        if data.get("period_start"):
+            accumulator.period_start = datetime.strptime(data["period_start"], "%Y-%m-%d").date()
+        if data.get("last_timestamp"):
+            accumulator.last_timestamp = np.datetime64(data["last_timestamp"], "s")
+        return accumulator
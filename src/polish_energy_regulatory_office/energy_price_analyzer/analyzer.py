@@ -1,95 +1,235 @@
 """Main analyzer class for energy price analysis."""
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from .models import PriceAnalysis, PriceData, TariffStructure
+from .accumulator import PriceAccumulator
+from .cache import PriceRangeCache
+from .forecasting import BatchForecaster, daily_matrix
+from .models import (
+    PriceAnalysis,
+    PriceData,
+    PriceSeries,
+    RollingWindowStatistics,
+    TariffBatchResult,
+    TariffStructure,
+)
+from .rolling import DEFAULT_WINDOWS, rolling_statistics
 from .scrapers import UREPriceScraper
-from .utils import calculate_average_price
+from .utils import calculate_cost_matrix, calculate_price_statistics
 
 
 class EnergyPriceAnalyzer:
     """Main class for analyzing energy prices from URE data sources."""
 
-    def __init__(self, scraper: Optional[UREPriceScraper] = None):
-        """Initialize the analyzer with optional custom scraper."""
+    def __init__(self, scraper: Optional[UREPriceScraper] = None, cache_max_bytes: int = 64 * 1024 * 1024):
+        """Initialize the analyzer with optional custom scraper and result cache size."""
         self.scraper = scraper or UREPriceScraper()
-        self._cache: Dict[str, Any] = {}
+        self._cache = PriceRangeCache(max_bytes=cache_max_bytes)
+        self._forecasters: Dict[Hashable, Tuple[BatchForecaster, np.ndarray]] = {}
 
     def analyze_price_trends(self, start_date: date, end_date: date, energy_type: str = "electricity") -> PriceAnalysis:
         """Analyze price trends for a given period."""
-        # Implementation placeholder
-        price_data = self.scraper.fetch_price_data(start_date, end_date, energy_type)
-
-        # Convert list of PriceData to pandas DataFrame for analysis
-        if not price_data:
-            return PriceAnalysis(
-                period_start=start_date,
-                period_end=end_date,
-                energy_type=energy_type,
-                average_price=0.0,
-                price_trend="stable",
-                volatility=0.0,
-            )
-
-        # Convert to DataFrame
-        df_data = [
-            {
-                "date": item.date,
-                "price": float(item.price),
-                "energy_type": item.energy_type,
-            }
-            for item in price_data
-        ]
-        df = pd.DataFrame(df_data)
-
-        # Calculate analysis metrics
-        prices = [float(item.price) for item in price_data]
-        average_price = calculate_average_price(prices)
-        volatility = float(df["price"].std()) if len(df) > 1 else 0.0
-
-        # Determine trend
-        if len(prices) < 2:
-            trend = "stable"
-        else:
-            first_half_avg = sum(prices[: len(prices) // 2]) / (len(prices) // 2)
-            second_half_avg = sum(prices[len(prices) // 2 :]) / (len(prices) - len(prices) // 2)
-            if second_half_avg > first_half_avg * 1.05:
-                trend = "increasing"
-            elif second_half_avg < first_half_avg * 0.95:
-                trend = "decreasing"
-            else:
-                trend = "stable"
+        series = self._fetch_price_series(start_date, end_date, energy_type)
+        return self.analyze_price_series(series, start_date, end_date)
 
+    def analyze_price_series(self, series: PriceSeries, start_date: date, end_date: date) -> PriceAnalysis:
+        """Compute all price analysis metrics for a price series in one vectorized pass."""
+        statistics = calculate_price_statistics(series.prices)
         return PriceAnalysis(
             period_start=start_date,
             period_end=end_date,
-            energy_type=energy_type,
-            average_price=average_price,
-            price_trend=trend,
-            volatility=volatility,
-            min_price=min(prices) if prices else None,
-            max_price=max(prices) if prices else None,
+            energy_type=series.energy_type,
+            **statistics,
         )
 
+    def analyze_rolling_trends(
+        self,
+        start_date: date,
+        end_date: date,
+        energy_type: str = "electricity",
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+    ) -> Dict[int, RollingWindowStatistics]:
+        """Compute rolling statistics for several trailing windows over a given period."""
+        series = self._fetch_price_series(start_date, end_date, energy_type)
+        return rolling_statistics(series, windows)
+
+    def create_price_accumulator(
+        self, start_date: date, end_date: date, energy_type: str = "electricity"
+    ) -> PriceAccumulator:
+        """Create an online accumulator seeded with price data for a given period."""
+        series = self._fetch_price_series(start_date, end_date, energy_type)
+        return PriceAccumulator(energy_type=energy_type).update(series)
+
+    def refresh_price_accumulator(
+        self, accumulator: PriceAccumulator, end_date: Optional[date] = None
+    ) -> PriceAnalysis:
+        """Feed data newer than the accumulator's latest observation and return updated analysis."""
+        end_date = end_date or date.today()
+        start_date = accumulator.period_end or end_date
+        if start_date <= end_date:
+            accumulator.update(self._fetch_price_series(start_date, end_date, accumulator.energy_type, use_cache=False))
+        return accumulator.analysis()
+
     def compare_tariffs(
         self,
         tariff_ids: List[str],
         consumption_profile: Optional[Dict[str, float]] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
     ) -> Dict[str, TariffStructure]:
-        """Compare multiple tariff structures."""
-        # Implementation placeholder
-        tariffs = {}
-        for tariff_id in tariff_ids:
-            tariff_data = self.scraper.fetch_tariff_data(tariff_id)
-            tariffs[tariff_id] = TariffStructure.from_dict(tariff_data)
-
-        return tariffs
-
-    def forecast_prices(self, historical_data: List[PriceData], forecast_days: int = 30) -> List[PriceData]:
-        """Generate price forecasts based on historical data."""
-        # Implementation placeholder - would use ML models
-        # For now, return empty list
-        return []
+        """Compare multiple tariff structures.
+
+        With ``max_workers`` set, tariffs are fetched concurrently and tariffs that
+        failed or missed the ``timeout`` deadline are left out of the result. A
+        ``consumption_profile`` maps periods to consumption in kWh; tariffs are then
+        ordered from cheapest to most expensive for that profile, costed with
+        ``calculate_cost_matrix``.
+        """
+        if max_workers is not None:
+            tariffs = self.fetch_tariffs(tariff_ids, max_workers=max_workers, timeout=timeout).tariffs
+        else:
+            tariffs = {}
+            for tariff_id in dict.fromkeys(tariff_ids):
+                tariff_data = self.scraper.fetch_tariff_data(tariff_id)
+                tariffs[tariff_id] = TariffStructure.from_dict(tariff_data)
+
+        if consumption_profile is None or not tariffs:
+            return tariffs
+        costs = calculate_cost_matrix(list(tariffs.values()), [list(consumption_profile.values())])[:, 0]
+        ranked = list(tariffs.items())
+        return dict(ranked[position] for position in np.argsort(costs, kind="stable").tolist())
+
+    def fetch_tariffs(
+        self, tariff_ids: List[str], max_workers: int = 8, timeout: Optional[float] = None
+    ) -> TariffBatchResult:
+        """Fetch tariffs concurrently through a bounded thread pool sharing the scraper session.
+
+        Repeated IDs are fetched once. ``timeout`` is a deadline in seconds for the whole
+        batch; tariffs not fetched by then are reported as timed out, and failures are
+        reported per ID instead of aborting the batch.
+        """
+        unique_ids = list(dict.fromkeys(tariff_ids))
+        result = TariffBatchResult()
+        if not unique_ids:
+            return result
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids)))
+        futures = {tariff_id: executor.submit(self.scraper.fetch_tariff_data, tariff_id) for tariff_id in unique_ids}
+        try:
+            wait(futures.values(), timeout=timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for tariff_id, future in futures.items():
+            if not future.done():
+                result.timed_out.append(tariff_id)
+                continue
+            try:
+                result.tariffs[tariff_id] = TariffStructure.from_dict(future.result())
+            except Exception as e:
+                result.errors[tariff_id] = str(e)
+
+        return result
+
+    def calculate_portfolio_costs(self, tariff_ids: List[str], consumption_kwh: Any) -> pd.DataFrame:
+        """Calculate costs in grosze of every consumption value or profile under each tariff.
+
+        Rows are tariff IDs and columns are positions in ``consumption_kwh``.
+        """
+        tariffs = self.compare_tariffs(tariff_ids)
+        costs = calculate_cost_matrix(list(tariffs.values()), consumption_kwh)
+        portfolio_costs: pd.DataFrame = pd.DataFrame(costs, index=list(tariffs.keys()))
+        return portfolio_costs
+
+    def forecast_prices(
+        self,
+        historical_data: Union[List[PriceData], PriceSeries],
+        forecast_days: int = 30,
+        model: str = "holt_winters",
+    ) -> List[PriceData]:
+        """Generate daily price forecasts based on historical data.
+
+        Observations are averaged per day and gaps are forward-filled. Fitted models are
+        cached per energy type, so a history extended by new days is updated incrementally.
+        """
+        if not historical_data:
+            return []
+        series = (
+            historical_data
+            if isinstance(historical_data, PriceSeries)
+            else PriceSeries.from_price_data(historical_data)
+        )
+        start_date, matrix = daily_matrix(series.dates, series.prices)
+
+        predictions = self.forecast_matrix(
+            matrix, start_date, forecast_days, model=model, cache_key=(series.energy_type, model)
+        )[0]
+        first_day = np.datetime64(start_date, "D") + matrix.shape[1]
+        forecast = PriceSeries(
+            dates=first_day + np.arange(forecast_days),
+            prices=np.round(np.clip(predictions, 0.0, None), 2),
+            energy_type=series.energy_type,
+            unit=series.unit,
+            source=f"forecast:{model}",
+        )
+        return forecast.to_price_data()
+
+    def forecast_matrix(
+        self,
+        matrix: Any,
+        start_date: date,
+        forecast_days: int = 30,
+        model: str = "holt_winters",
+        cache_key: Optional[Hashable] = None,
+    ) -> np.ndarray:
+        """Forecast every row of an (S, T) daily series matrix starting at start_date.
+
+        When ``cache_key`` is given, the fitted model is kept and a matrix that extends the
+        previously fitted one by new days is applied as an incremental update. Only the
+        last fitted column is kept to recognize the extension, so a revised earlier
+        history needs a new ``cache_key``. Returns an (S, forecast_days) array.
+        """
+        values = np.array(matrix, dtype=np.float64, ndmin=2)
+        if cache_key is None:
+            return BatchForecaster(model=model).fit(values, start_date).forecast(forecast_days)
+
+        cached = self._forecasters.get(cache_key)
+        if cached is not None:
+            forecaster, last_column = cached
+            fitted = forecaster.n_observations
+            if (
+                forecaster.model == model
+                and forecaster.start_date == start_date
+                and forecaster.n_series == values.shape[0]
+                and fitted <= values.shape[1]
+                and np.array_equal(values[:, fitted - 1 : fitted], last_column, equal_nan=True)
+            ):
+                forecaster.update(values[:, fitted:])
+                self._forecasters[cache_key] = (forecaster, values[:, -1:].copy())
+                return forecaster.forecast(forecast_days)
+
+        forecaster = BatchForecaster(model=model).fit(values, start_date)
+        self._forecasters[cache_key] = (forecaster, values[:, -1:].copy())
+        return forecaster.forecast(forecast_days)
+
+    def invalidate_cache(self, energy_type: Optional[str] = None) -> None:
+        """Drop cached price data for energy type or, when not given, for all energy types."""
+        self._cache.invalidate(energy_type)
+
+    def _fetch_price_series(
+        self, start_date: date, end_date: date, energy_type: str, use_cache: bool = True
+    ) -> PriceSeries:
+        """Fetch price data for a given period as a columnar series, reusing cached date ranges."""
+
+        def fetch(fetch_start: date, fetch_end: date) -> PriceSeries:
+            price_data = self.scraper.fetch_price_data(fetch_start, fetch_end, energy_type, as_series=True)
+            return PriceSeries.coerce(price_data, energy_type)
+
+        if not use_cache:
+            return fetch(start_date, end_date)
+        return self._cache.get_or_fetch(energy_type, start_date, end_date, fetch)
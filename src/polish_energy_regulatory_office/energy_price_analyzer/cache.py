@@ -0,0 +1,417 @@
+"""Persistent HTTP response cache for URE scrapers."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .models import PriceSeries
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """HTTP response stored in the cache."""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Check whether the entry can be served without revalidation."""
+        return self.expires_at > (time.time() if now is None else now)
+
+
+class ResponseCache:
+    """SQLite-backed HTTP response cache with per-endpoint TTLs and LRU eviction.
+
+    The database file may be shared by many processes. Entries are evicted in
+    least-recently-used order once the stored bytes exceed ``max_bytes``. Each
+    thread opens its own connection; ``close`` closes them all, and later calls
+    open new ones.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 3600.0,
+        endpoint_ttls: Optional[Mapping[str, float]] = None,
+    ):
+        """Initialize cache stored in an SQLite database at given path."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, revalidation, store and eviction counters of this instance."""
+        with self._lock:
+            return dict(self._stats)
+
+    def record(self, event: str) -> None:
+        """Increment a cache counter."""
+        with self._lock:
+            self._stats[event] += 1
+
+    def close(self) -> None:
+        """Close the SQLite connections opened by every thread."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def ttl_for(self, url: str) -> float:
+        """Return TTL for URL, using the longest matching endpoint path prefix."""
+        path = urlsplit(url).path
+        matches = [prefix for prefix in self.endpoint_ttls if path.startswith(prefix)]
+        if not matches:
+            return self.default_ttl
+        return self.endpoint_ttls[max(matches, key=len)]
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return cached response for URL and mark it as recently used."""
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT status_code, headers, content, etag, last_modified, expires_at FROM responses WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        with connection:
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        return CachedResponse(
+            url=url,
+            status_code=row[0],
+            headers=json.loads(row[1]),
+            content=bytes(row[2]),
+            etag=row[3],
+            last_modified=row[4],
+            expires_at=row[5],
+        )
+
+    def store(self, url: str, status_code: int, headers: Mapping[str, str], content: bytes) -> CachedResponse:
+        """Store response for URL and evict least recently used entries over the byte budget."""
+        header_map = dict(headers)
+        validators = CaseInsensitiveDict(header_map)
+        serialized_headers = json.dumps(header_map)
+        now = time.time()
+        entry = CachedResponse(
+            url=url,
+            status_code=status_code,
+            headers=header_map,
+            content=content,
+            etag=validators.get("ETag"),
+            last_modified=validators.get("Last-Modified"),
+            expires_at=now + self.ttl_for(url),
+        )
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    status_code,
+                    serialized_headers,
+                    content,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.expires_at,
+                    now,
+                    len(content) + len(serialized_headers),
+                ),
+            )
+        self.record("stores")
+        self._evict()
+        return entry
+
+    def refresh(self, url: str) -> None:
+        """Extend lifetime of an entry that was revalidated by the server."""
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE url = ?",
+                (now + self.ttl_for(url), now, url),
+            )
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Remove a single URL or, when not given, all entries."""
+        connection = self._connection()
+        with connection:
+            if url is None:
+                connection.execute("DELETE FROM responses")
+            else:
+                connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+
+    def total_bytes(self) -> int:
+        """Return number of bytes currently stored."""
+        row = self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return int(row[0])
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the byte budget is met."""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        connection = self._connection()
+        with connection:
+            rows = connection.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+            for url, size in rows:
+                if excess <= 0:
+                    break
+                connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+                excess -= size
+                self.record("evictions")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return SQLite connection owned by the current thread."""
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None:
+            # Used only by this thread, but closed by whichever thread calls close()
+            connection = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            with self._lock:
+                self._local.connection = connection
+                self._connections.append(connection)
+        return connection
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter serving GET requests from a ResponseCache.
+
+    Fresh entries are returned without network access. Stale entries are
+    revalidated with ``If-None-Match``/``If-Modified-Since`` and a ``304`` reply
+    returns the stored body unchanged.
+    """
+
+    def __init__(self, cache: ResponseCache, **kwargs: Any):
+        """Initialize adapter on top of given cache."""
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+        """Send request, using the cache for GET requests."""
+        if request.method != "GET" or request.url is None:
+            return super().send(request, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+        if entry is not None and entry.is_fresh():
+            self.cache.record("hits")
+            return self._build_response(request, entry)
+
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = super().send(request, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            response.close()
+            self.cache.refresh(url)
+            self.cache.record("revalidated")
+            return self._build_response(request, entry)
+
+        self.cache.record("misses")
+        if response.status_code == 200:
+            self.cache.store(url, response.status_code, response.headers, response.content)
+        return response
+
+    def close(self) -> None:
+        """Close pooled connections and the cache's database connections."""
+        super().close()
+        self.cache.close()
+
+    def _build_response(self, request: PreparedRequest, entry: CachedResponse) -> Response:
+        """Build a requests Response from a cached entry."""
+        response = Response()
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.content
+        response.url = entry.url
+        response.request = request
+        response.reason = "OK"
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.connection = self
+        return response
+
+
+@dataclass
+class CoveredSeries:
+    """Price series together with the date range it is known to cover."""
+
+    start_date: date
+    end_date: date
+    series: PriceSeries
+
+
+class PriceRangeCache:
+    """In-memory cache of price series keyed by energy type with the date segments fetched.
+
+    Each energy type holds disjoint covered segments, so queries anywhere inside
+    them are answered by slicing and other queries fetch only the dates no
+    segment covers; adjacent segments are merged. Fetches run outside the lock,
+    so a slow request does not block lookups of other energy types. Energy types
+    are evicted in least-recently-used order once the cached arrays exceed
+    ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize cache with a memory cap in bytes."""
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, List[CoveredSeries]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "partial_hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return hit, partial hit, miss and eviction counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    @property
+    def nbytes(self) -> int:
+        """Return memory used by cached series."""
+        with self._lock:
+            return sum(segment.series.nbytes for segments in self._entries.values() for segment in segments)
+
+    def coverage(self, energy_type: str) -> List[Tuple[date, date]]:
+        """Return date segments cached for energy type in ascending order."""
+        with self._lock:
+            return [(segment.start_date, segment.end_date) for segment in self._entries.get(energy_type, [])]
+
+    def get_or_fetch(
+        self,
+        energy_type: str,
+        start_date: date,
+        end_date: date,
+        fetch: Callable[[date, date], PriceSeries],
+    ) -> PriceSeries:
+        """Return series for date range, calling fetch only for dates not yet covered."""
+        counted = False
+        while True:
+            with self._lock:
+                segments = self._entries.get(energy_type, [])
+                gaps = _uncovered(segments, start_date, end_date)
+                if not counted:
+                    covered = len(gaps) != 1 or gaps[0] != (start_date, end_date)
+                    self._stats["hits" if not gaps else "partial_hits" if covered else "misses"] += 1
+                    counted = True
+                if not gaps:
+                    self._entries.move_to_end(energy_type)
+                    return _slice(segments, energy_type, start_date, end_date)
+
+            fetched = [CoveredSeries(gap_start, gap_end, fetch(gap_start, gap_end)) for gap_start, gap_end in gaps]
+
+            with self._lock:
+                existing = self._entries.get(energy_type, [])
+                segments = list(existing)
+                for segment in fetched:
+                    # Other threads may have covered part of the gap meanwhile
+                    for piece_start, piece_end in _uncovered(existing, segment.start_date, segment.end_date):
+                        segments.append(
+                            CoveredSeries(piece_start, piece_end, segment.series.between(piece_start, piece_end))
+                        )
+                self._entries[energy_type] = _coalesce(segments)
+                self._entries.move_to_end(energy_type)
+                result = self._entries[energy_type]
+                if not _uncovered(result, start_date, end_date):
+                    series = _slice(result, energy_type, start_date, end_date)
+                    self._evict()
+                    return series
+
+    def invalidate(self, energy_type: Optional[str] = None) -> None:
+        """Drop cached series for energy type or, when not given, for all energy types."""
+        with self._lock:
+            if energy_type is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(energy_type, None)
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the memory cap is met."""
+        total = sum(segment.series.nbytes for segments in self._entries.values() for segment in segments)
+        while self._entries and total > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            total -= sum(segment.series.nbytes for segment in evicted)
+            self._stats["evictions"] += 1
+
+
+def _uncovered(segments: List[CoveredSeries], start_date: date, end_date: date) -> List[Tuple[date, date]]:
+    """Return date ranges within start_date..end_date that no segment (sorted, disjoint) covers."""
+    gaps: List[Tuple[date, date]] = []
+    cursor = start_date
+    for segment in segments:
+        if segment.end_date < cursor:
+            continue
+        if segment.start_date > end_date:
+            break
+        if segment.start_date > cursor:
+            gaps.append((cursor, segment.start_date - timedelta(days=1)))
+        cursor = segment.end_date + timedelta(days=1)
+        if cursor > end_date:
+            return gaps
+    if cursor <= end_date:
+        gaps.append((cursor, end_date))
+    return gaps
+
+
+def _slice(segments: List[CoveredSeries], energy_type: str, start_date: date, end_date: date) -> PriceSeries:
+    """Return observations of sorted segments between two dates as one series."""
+    parts = [segment.series.between(start_date, end_date) for segment in segments]
+    parts = [part for part in parts if len(part)]
+    return PriceSeries.concatenate(parts) if parts else PriceSeries.empty(energy_type)
+
+
+def _coalesce(segments: List[CoveredSeries]) -> List[CoveredSeries]:
+    """Sort disjoint segments and merge those whose dates are adjacent."""
+    merged: List[CoveredSeries] = []
+    for segment in sorted(segments, key=lambda item: item.start_date):
+        if merged and merged[-1].end_date + timedelta(days=1) >= segment.start_date:
+            previous = merged[-1]
+            merged[-1] = CoveredSeries(
+                previous.start_date, segment.end_date, PriceSeries.concatenate([previous.series, segment.series])
+            )
+        else:
+            merged.append(segment)
+    return merged
@@ -0,0 +1,199 @@
+"""Vectorized batch forecasting of daily energy price series."""
+
+from datetime import date, timedelta
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+FORECAST_MODELS = ("seasonal_naive", "holt_winters", "ridge")
+
+
+def fill_missing(matrix: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN gaps along each row, back-filling leading gaps and zero-filling empty rows."""
+    values = np.array(matrix, dtype=np.float64, ndmin=2)
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    columns = np.arange(values.shape[1])
+    last_valid = np.maximum.accumulate(np.where(missing, 0, columns), axis=1)
+    first_valid = np.where(missing.all(axis=1), 0, np.argmax(~missing, axis=1))
+    last_valid = np.maximum(last_valid, first_valid[:, np.newaxis])
+    filled = np.take_along_axis(values, last_valid, axis=1)
+    return np.nan_to_num(filled, nan=0.0)
+
+
+def calendar_features(start_date: date, count: int, offset: int = 0) -> np.ndarray:
+    """Build ridge regression design matrix: intercept, trend, day of week and annual seasonality."""
+    days = np.datetime64(start_date, "D") + np.arange(offset, offset + count)
+    trend = np.arange(offset, offset + count, dtype=np.float64) / 365.25
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    weekday_dummies = (weekday[:, np.newaxis] == np.arange(1, 7)).astype(np.float64)
+    day_of_year = (days - days.astype("datetime64[Y]")).astype(np.float64)
+    angle = 2 * np.pi * day_of_year / 365.25
+    return np.column_stack([np.ones(count), trend, weekday_dummies, np.sin(angle), np.cos(angle)])
+
+
+class BatchForecaster:
+    """Fit and forecast many daily series at once.
+
+    Series are rows of an (S, T) matrix of consecutive daily observations starting at
+    ``start_date``. Every model keeps compact fitted state (last season, smoothing
+    components or ridge normal equations), so appending new days with ``update``
+    costs an incremental step instead of a refit.
+    """
+
+    def __init__(
+        self,
+        model: str = "holt_winters",
+        season_length: int = 7,
+        alpha: float = 0.3,
+        beta: float = 0.05,
+        gamma: float = 0.2,
+        ridge_lambda: float = 1.0,
+    ):
+        """Initialize forecaster with model name and its parameters."""
+        if model not in FORECAST_MODELS:
+            raise ValueError(f"Unsupported forecast model: {model}")
+        self.model = model
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.ridge_lambda = ridge_lambda
+        self.start_date: Optional[date] = None
+        self.n_observations = 0
+        self.n_series = 0
+        self._last_values = np.empty(0)
+        self._season_tail = np.empty((0, 0))
+        self._level = np.empty(0)
+        self._trend = np.empty(0)
+        self._season = np.empty((0, 0))
+        self._xtx = np.empty((0, 0))
+        self._xty = np.empty((0, 0))
+        self._coefficients: Optional[np.ndarray] = None
+
+    @property
+    def end_date(self) -> Optional[date]:
+        """Return date of the last fitted observation."""
+        if self.start_date is None or self.n_observations == 0:
+            return None
+        return self.start_date + timedelta(days=self.n_observations - 1)
+
+    def fit(self, matrix: Any, start_date: date) -> "BatchForecaster":
+        """Fit all series of an (S, T) matrix observed daily from start_date."""
+        values = fill_missing(matrix)
+        self.start_date = start_date
+        self.n_series = values.shape[0]
+        self.n_observations = 0
+        self._last_values = np.zeros(self.n_series)
+        self._season_tail = np.zeros((self.n_series, 0))
+        self._coefficients = None
+        m = self.season_length
+
+        if self.model == "holt_winters":
+            self._trend = np.zeros(self.n_series)
+            self._season = np.zeros((self.n_series, m))
+            if values.shape[1] < m:
+                self._level = values[:, 0].copy() if values.shape[1] else np.zeros(self.n_series)
+            else:
+                # The first season seeds level and seasonal components, the second one the trend
+                first_season = values[:, :m]
+                self._level = first_season.mean(axis=1)
+                self._season = first_season - self._level[:, np.newaxis]
+                if values.shape[1] >= 2 * m:
+                    self._trend = (values[:, m : 2 * m].mean(axis=1) - self._level) / m
+                self.n_observations = m
+                self._last_values = values[:, m - 1].copy()
+                values = values[:, m:]
+        elif self.model == "ridge":
+            features = calendar_features(start_date, 1).shape[1]
+            self._xtx = np.zeros((features, features))
+            self._xty = np.zeros((features, self.n_series))
+
+        return self.update(values)
+
+    def update(self, new_columns: Any) -> "BatchForecaster":
+        """Append new daily observations and update fitted state incrementally.
+
+        ``new_columns`` is an (S, k) array, or one value per series for a single new day.
+        """
+        if self.start_date is None:
+            raise ValueError("Forecaster must be fitted before update")
+        values = np.array(new_columns, dtype=np.float64, ndmin=2)
+        if values.shape[0] != self.n_series:
+            values = values.reshape(self.n_series, -1)
+        if np.isnan(values).any():
+            previous = self._last_values[:, np.newaxis] if self.n_observations else np.full((self.n_series, 1), np.nan)
+            values = fill_missing(np.hstack([previous, values]))[:, 1:]
+        count = values.shape[1]
+        if count == 0:
+            return self
+
+        if self.model == "seasonal_naive":
+            self._season_tail = np.hstack([self._season_tail, values])[:, -self.season_length :]
+        elif self.model == "holt_winters":
+            self._update_holt_winters(values)
+        else:
+            features = calendar_features(self.start_date, count, offset=self.n_observations)
+            self._xtx += features.T @ features
+            self._xty += features.T @ values.T
+            self._coefficients = None
+
+        self.n_observations += count
+        self._last_values = values[:, -1].copy()
+        return self
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        """Forecast the next horizon days for every series as an (S, horizon) array."""
+        if self.start_date is None or self.n_observations == 0:
+            raise ValueError("Forecaster must be fitted before forecasting")
+        steps = np.arange(1, horizon + 1)
+
+        if self.model == "seasonal_naive":
+            tail = self._season_tail
+            return tail[:, (steps - 1) % tail.shape[1]]
+
+        if self.model == "holt_winters":
+            season_index = (self.n_observations + steps - 1) % self.season_length
+            trend = self._trend[:, np.newaxis] * steps
+            return self._level[:, np.newaxis] + trend + self._season[:, season_index]
+
+        features = calendar_features(self.start_date, horizon, offset=self.n_observations)
+        predictions: np.ndarray = (features @ self._ridge_coefficients()).T
+        return predictions
+
+    def _update_holt_winters(self, values: np.ndarray) -> None:
+        """Run additive Holt-Winters recursions over new columns, vectorized across series."""
+        m = self.season_length
+        for offset in range(values.shape[1]):
+            t = self.n_observations + offset
+            observed = values[:, offset]
+            index = t % m
+            previous_level = self._level
+            self._level = self.alpha * (observed - self._season[:, index]) + (1 - self.alpha) * (
+                self._level + self._trend
+            )
+            self._trend = self.beta * (self._level - previous_level) + (1 - self.beta) * self._trend
+            self._season[:, index] = self.gamma * (observed - self._level) + (1 - self.gamma) * self._season[:, index]
+
+    def _ridge_coefficients(self) -> np.ndarray:
+        """Solve ridge normal equations shared by all series, leaving the intercept unpenalized."""
+        if self._coefficients is None:
+            penalty = np.eye(self._xtx.shape[0]) * self.ridge_lambda
+            penalty[0, 0] = 0.0
+            self._coefficients = np.linalg.solve(self._xtx + penalty, self._xty)
+        return self._coefficients
+
+
+def daily_matrix(dates: np.ndarray, prices: np.ndarray) -> Tuple[date, np.ndarray]:
+    """Average observations per day onto a contiguous daily grid with NaN for missing days."""
+    days = dates.astype("datetime64[D]")
+    first = days.min()
+    positions = (days - first).astype(np.int64)
+    length = int(positions.max()) + 1
+    sums = np.bincount(positions, weights=prices, minlength=length)
+    counts = np.bincount(positions, minlength=length)
+    with np.errstate(invalid="ignore"):
+        row = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    start: date = first.astype(object)
+    return start, row[np.newaxis, :]
@@ -1,9 +1,11 @@
 """Data models for energy price analysis."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
 
 
 @dataclass
@@ -24,6 +26,136 @@ class PriceData:
             raise ValueError("Energy type is required")
 
 
+@dataclass(eq=False)
+class PriceSeries:
+    """Columnar price series backed by NumPy arrays.
+
+    Timestamps are stored as ``datetime64[s]`` so both daily and hourly series fit,
+    prices as ``float64``. The series is kept sorted by timestamp.
+    """
+
+    dates: np.ndarray
+    prices: np.ndarray
+    energy_type: str
+    unit: str = "PLN/MWh"
+    source: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        """Normalize array dtypes, validate and sort by timestamp."""
+        self.dates = np.asarray(self.dates, dtype="datetime64[s]")
+        self.prices = np.asarray(self.prices, dtype=np.float64)
+        if self.dates.ndim != 1 or self.dates.shape != self.prices.shape:
+            raise ValueError("Dates and prices must be one-dimensional arrays of equal length")
+        if not self.energy_type:
+            raise ValueError("Energy type is required")
+        if np.any(self.prices < 0):
+            raise ValueError("Price cannot be negative")
+        if len(self.dates) > 1 and np.any(self.dates[1:] < self.dates[:-1]):
+            order = np.argsort(self.dates, kind="stable")
+            self.dates = self.dates[order]
+            self.prices = self.prices[order]
+
+    def __len__(self) -> int:
+        """Return number of observations in the series."""
+        return len(self.prices)
+
+    @classmethod
+    def empty(cls, energy_type: str, unit: str = "PLN/MWh") -> "PriceSeries":
+        """Create an empty series for given energy type."""
+        return cls(
+            dates=np.empty(0, dtype="datetime64[s]"),
+            prices=np.empty(0, dtype=np.float64),
+            energy_type=energy_type,
+            unit=unit,
+        )
+
+    @classmethod
+    def from_price_data(cls, data: Sequence[PriceData], energy_type: Optional[str] = None) -> "PriceSeries":
+        """Create PriceSeries from a sequence of PriceData records."""
+        if not data:
+            return cls.empty(energy_type or "electricity")
+        count = len(data)
+        return cls(
+            dates=np.array([item.date for item in data], dtype="datetime64[s]"),
+            prices=np.fromiter((item.price for item in data), dtype=np.float64, count=count),
+            energy_type=energy_type or data[0].energy_type,
+            unit=data[0].unit,
+            source=data[0].source,
+        )
+
+    @classmethod
+    def coerce(cls, data: Union["PriceSeries", Sequence[PriceData]], energy_type: str) -> "PriceSeries":
+        """Return data as PriceSeries, converting PriceData sequences if needed."""
+        if isinstance(data, PriceSeries):
+            return data
+        return cls.from_price_data(data, energy_type)
+
+    @property
+    def nbytes(self) -> int:
+        """Return memory used by the underlying arrays."""
+        return int(self.dates.nbytes + self.prices.nbytes)
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["PriceSeries"]) -> "PriceSeries":
+        """Join series of the same energy type into one sorted series."""
+        if not parts:
+            raise ValueError("At least one series is required")
+        first = parts[0]
+        return cls(
+            dates=np.concatenate([part.dates for part in parts]),
+            prices=np.concatenate([part.prices for part in parts]),
+            energy_type=first.energy_type,
+            unit=first.unit,
+            source=first.source,
+        )
+
+    def between(self, start_date: date, end_date: date) -> "PriceSeries":
+        """Return observations between two dates (inclusive) as a view on the same arrays."""
+        lower = np.datetime64(start_date, "D").astype("datetime64[s]")
+        upper = (np.datetime64(end_date, "D") + 1).astype("datetime64[s]")
+        start = int(np.searchsorted(self.dates, lower, side="left"))
+        stop = int(np.searchsorted(self.dates, upper, side="left"))
+        return self._view(start, stop)
+
+    def _view(self, start: int, stop: int) -> "PriceSeries":
+        """Return positional slice sharing memory with this series, skipping validation."""
+        view = object.__new__(type(self))
+        view.dates = self.dates[start:stop]
+        view.prices = self.prices[start:stop]
+        view.energy_type = self.energy_type
+        view.unit = self.unit
+        view.source = self.source
+        return view
+
+    def to_price_data(self) -> List[PriceData]:
+        """Convert series back to a list of PriceData records."""
+        days = self.dates.astype("datetime64[D]")
+        timestamps = days if np.array_equal(days, self.dates) else self.dates
+        return [
+            PriceData(
+                date=timestamp,
+                price=Decimal(str(price)),
+                energy_type=self.energy_type,
+                unit=self.unit,
+                source=self.source,
+            )
+            for timestamp, price in zip(timestamps.astype(object), self.prices.tolist())
+        ]
+
+
+@dataclass(eq=False)
+class RollingWindowStatistics:
+    """Rolling statistics over a trailing window, aligned to the dates of a price series."""
+
+    window_days: int
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    pct_change: np.ndarray
+
+
 @dataclass
 class TariffStructure:
     """Represents a tariff structure with various pricing components."""
@@ -58,6 +190,20 @@ class TariffStructure:
         return self.base_price + (self.energy_price * Decimal(str(consumption_kwh))) + self.network_fee
 
 
+@dataclass
+class TariffBatchResult:
+    """Results of a batch tariff fetch with per-ID failures."""
+
+    tariffs: Dict[str, TariffStructure] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+
+    @property
+    def is_complete(self) -> bool:
+        """Check whether every requested tariff was fetched."""
+        return not self.errors and not self.timed_out
+
+
 @dataclass
 class PriceAnalysis:
     """Results of price analysis for a given period."""
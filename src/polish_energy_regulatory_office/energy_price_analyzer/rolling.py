@@ -0,0 +1,97 @@
+"""Multi-window rolling analytics for price series."""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .models import PriceSeries, RollingWindowStatistics
+
+DEFAULT_WINDOWS = (7, 30, 90, 365)
+
+
+class RangeExtremaTable:
+    """Sparse table answering min/max over any index range in constant time.
+
+    Built once per series in O(n log n), it serves every window length, so all
+    rolling extremes are computed with vectorized lookups instead of per-row loops.
+    """
+
+    def __init__(self, values: np.ndarray):
+        """Precompute minima and maxima of all power-of-two length ranges."""
+        self._minima = [values]
+        self._maxima = [values]
+        span = 1
+        while span * 2 <= len(values):
+            previous_min, previous_max = self._minima[-1], self._maxima[-1]
+            self._minima.append(np.minimum(previous_min[:-span], previous_min[span:]))
+            self._maxima.append(np.maximum(previous_max[:-span], previous_max[span:]))
+            span *= 2
+
+    def query(self, start: np.ndarray, stop: np.ndarray) -> Dict[str, np.ndarray]:
+        """Return minima and maxima of the non-empty ranges ``[start, stop)``."""
+        length = stop - start
+        level = np.floor(np.log2(np.maximum(length, 1))).astype(np.int64)
+        minima = np.empty(len(start))
+        maxima = np.empty(len(start))
+        for k in np.unique(level):
+            selected = level == k
+            left = start[selected]
+            right = stop[selected] - (1 << int(k))
+            minima[selected] = np.minimum(self._minima[k][left], self._minima[k][right])
+            maxima[selected] = np.maximum(self._maxima[k][left], self._maxima[k][right])
+        return {"min": minima, "max": maxima}
+
+
+def rolling_statistics(
+    series: PriceSeries, windows: Sequence[int] = DEFAULT_WINDOWS
+) -> Dict[int, RollingWindowStatistics]:
+    """Compute rolling mean, std, min/max and percent change for several trailing windows.
+
+    A window of ``w`` days ending at an observation covers observations within the
+    preceding ``w`` days, so irregular and hourly series are handled by time, not by
+    row count. Cumulative sums and the extrema table are built once and shared by all
+    windows. Percent change compares with the last observation at least ``w`` days
+    older; it is NaN when no such observation exists.
+    """
+    dates, prices = series.dates, series.prices
+    count = len(prices)
+    positions = np.arange(count)
+
+    reference = prices[0] if count else 0.0
+    shifted = prices - reference  # reduces cancellation in the sum of squares
+    cumulative = np.concatenate([[0.0], np.cumsum(shifted)])
+    cumulative_squares = np.concatenate([[0.0], np.cumsum(shifted * shifted)])
+    extrema = RangeExtremaTable(prices)
+
+    results = {}
+    for window in windows:
+        horizon = dates - np.timedelta64(window, "D")
+        start = np.searchsorted(dates, horizon, side="right")
+        stop = positions + 1
+        observations = stop - start
+
+        sums = cumulative[stop] - cumulative[start]
+        squares = cumulative_squares[stop] - cumulative_squares[start]
+        mean = sums / observations
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.maximum(squares - sums * mean, 0.0) / (observations - 1)
+        std = np.where(observations > 1, np.sqrt(variance), np.nan)
+
+        previous = start - 1
+        has_previous = previous >= 0
+        base = prices[np.maximum(previous, 0)]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct_change = np.where(has_previous & (base != 0), prices / base - 1.0, np.nan)
+
+        window_extrema = extrema.query(start, stop) if count else {"min": prices, "max": prices}
+        results[window] = RollingWindowStatistics(
+            window_days=window,
+            count=observations,
+            mean=mean + reference,
+            std=std,
+            min=window_extrema["min"],
+            max=window_extrema["max"],
+            pct_change=pct_change,
+        )
+
+    return results
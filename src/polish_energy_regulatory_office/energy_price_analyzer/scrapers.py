@@ -1,12 +1,15 @@
 """Web scrapers for URE energy price data."""
 
+from collections import OrderedDict
 from datetime import date
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union, overload
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
-from .models import PriceData
+from ..parsers import TableParser, get_table_parser
+from .cache import CachingAdapter, ResponseCache
+from .models import PriceData, PriceSeries
 
 
 class UREPriceScraper:
@@ -19,14 +22,62 @@ class UREPriceScraper:
         "heat": "/pl/cieplownictwo/ceny-i-taryfyz",
     }
 
-    def __init__(self, timeout: int = 30):
-        """Initialize scraper with configuration."""
+    PARSED_CACHE_SIZE = 32
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        cache: Optional[ResponseCache] = None,
+        pool_maxsize: int = 10,
+        parser: Optional[TableParser] = None,
+    ):
+        """Initialize scraper with configuration.
+
+        When a ResponseCache is given, it is mounted under the session so repeated
+        requests are served from disk or revalidated with conditional requests.
+        ``pool_maxsize`` bounds the connections kept per host for concurrent use.
+        ``parser`` selects the HTML table backend (lxml with BeautifulSoup fallback by default).
+        """
         self.timeout = timeout
+        self.parser = parser or get_table_parser()
+        self.cache = cache
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Mozilla/5.0 (compatible; PolishEnergyBot/1.0)"})
-
-    def fetch_price_data(self, start_date: date, end_date: date, energy_type: str = "electricity") -> List[PriceData]:
-        """Fetch price data for given date range and energy type."""
+        adapter = (
+            HTTPAdapter(pool_maxsize=pool_maxsize)
+            if cache is None
+            else CachingAdapter(cache, pool_maxsize=pool_maxsize)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._parsed: "OrderedDict[Tuple[str, date, date, str], Tuple[str, PriceSeries]]" = OrderedDict()
+
+    @overload
+    def fetch_price_data(
+        self,
+        start_date: date,
+        end_date: date,
+        energy_type: str = ...,
+        as_series: Literal[False] = ...,
+    ) -> List[PriceData]: ...
+
+    @overload
+    def fetch_price_data(
+        self, start_date: date, end_date: date, energy_type: str = ..., *, as_series: Literal[True]
+    ) -> PriceSeries: ...
+
+    def fetch_price_data(
+        self,
+        start_date: date,
+        end_date: date,
+        energy_type: str = "electricity",
+        as_series: bool = False,
+    ) -> Union[List[PriceData], PriceSeries]:
+        """Fetch price data for given date range and energy type.
+
+        With ``as_series=True`` the parsed data is returned directly as a columnar
+        PriceSeries instead of a list of PriceData objects.
+        """
         if energy_type not in self.PRICE_ENDPOINTS:
             raise ValueError(f"Unsupported energy type: {energy_type}")
 
@@ -36,13 +87,22 @@ class UREPriceScraper:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, "html.parser")
+            key = (url, start_date, end_date, energy_type)
+            validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            parsed = self._parsed.get(key)
+            if validator and parsed is not None and parsed[0] == validator:
+                self._parsed.move_to_end(key)
+                series = parsed[1]
+            else:
+                rows = self.parser.extract_rows(response.content)
 
-            # Implementation placeholder - actual parsing would depend on
-            # URE website structure. This is a simplified example
-            price_data = self._parse_price_data(soup, start_date, end_date, energy_type)
+                # Implementation placeholder - actual parsing would depend on
+                # URE website structure. This is a simplified example
+                series = self._parse_price_series(rows, start_date, end_date, energy_type)
+                if validator:
+                    self._remember_parsed(key, validator, series)
 
-            return price_data
+            return series if as_series else series.to_price_data()
 
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch data from URE: {str(e)}")
@@ -60,16 +120,23 @@ class UREPriceScraper:
             "valid_from": date.today(),
         }
 
-    def _parse_price_data(
-        self, soup: BeautifulSoup, start_date: date, end_date: date, energy_type: str
-    ) -> List[PriceData]:
-        """Parse price data from HTML soup."""
+    def _parse_price_series(
+        self, rows: List[List[str]], start_date: date, end_date: date, energy_type: str
+    ) -> PriceSeries:
+        """Parse price data from HTML table rows into a columnar series."""
         # Implementation placeholder
         # Actual implementation would parse the specific HTML structure of URE website
         # and extract price data for the given date range
 
-        # For now, return empty list
-        return []
+        # For now, return empty series
+        return PriceSeries.empty(energy_type)
+
+    def _remember_parsed(self, key: Tuple[str, date, date, str], validator: str, series: PriceSeries) -> None:
+        """Keep parsed series for a page version so unchanged pages are not parsed again."""
+        self._parsed[key] = (validator, series)
+        self._parsed.move_to_end(key)
+        while len(self._parsed) > self.PARSED_CACHE_SIZE:
+            self._parsed.popitem(last=False)
 
     def get_available_tariffs(self, energy_type: str = "electricity") -> List[Dict[str, Any]]:
         """Get list of available tariffs for given energy type."""
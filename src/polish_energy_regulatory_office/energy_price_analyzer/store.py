@@ -0,0 +1,173 @@
+"""Indexed in-memory store for price range queries and period rollups."""
+
+from datetime import date
+from typing import Dict, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .models import PriceData, PriceSeries
+
+PERIODS = ("month", "quarter", "year")
+
+
+def period_codes(dates: np.ndarray, period: str) -> np.ndarray:
+    """Return integer period codes (months, quarters or years since 1970) for datetime64 values."""
+    if period == "month":
+        return dates.astype("datetime64[M]").astype(np.int64)
+    if period == "quarter":
+        return dates.astype("datetime64[M]").astype(np.int64) // 3
+    if period == "year":
+        return dates.astype("datetime64[Y]").astype(np.int64)
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class PeriodAggregates:
+    """Dense per-period sum, count, min and max arrays, extended as new periods arrive."""
+
+    def __init__(self, period: str):
+        """Initialize empty aggregates for period granularity."""
+        self.period = period
+        self.offset = 0
+        self.sums = np.zeros(0)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.minima = np.zeros(0)
+        self.maxima = np.zeros(0)
+
+    def add(self, dates: np.ndarray, prices: np.ndarray) -> None:
+        """Fold sorted observations into the aggregates."""
+        if len(prices) == 0:
+            return
+        codes = period_codes(dates, self.period)
+        self._cover(int(codes[0]), int(codes[-1]))
+
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+        slots = codes[starts] - self.offset
+        self.sums[slots] += np.add.reduceat(prices, starts)
+        self.counts[slots] += np.diff(np.append(starts, len(prices)))
+        self.minima[slots] = np.minimum(self.minima[slots], np.minimum.reduceat(prices, starts))
+        self.maxima[slots] = np.maximum(self.maxima[slots], np.maximum.reduceat(prices, starts))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return aggregates of non-empty periods indexed by pandas periods."""
+        slots = np.flatnonzero(self.counts)
+        codes = slots + self.offset
+        if self.period == "month":
+            starts = codes.astype("datetime64[M]")
+        elif self.period == "quarter":
+            starts = (codes * 3).astype("datetime64[M]")
+        else:
+            starts = codes.astype("datetime64[Y]")
+        index = pd.DatetimeIndex(starts.astype("datetime64[s]")).to_period(self.period[0].upper())
+        frame: pd.DataFrame = pd.DataFrame(
+            {
+                "sum": self.sums[slots],
+                "count": self.counts[slots],
+                "mean": self.sums[slots] / self.counts[slots],
+                "min": self.minima[slots],
+                "max": self.maxima[slots],
+            },
+            index=index,
+        )
+        return frame
+
+    def _cover(self, first: int, last: int) -> None:
+        """Grow arrays so that codes from first to last have slots."""
+        if len(self.counts) == 0:
+            self.offset = first
+        lower = min(first, self.offset)
+        upper = max(last, self.offset + len(self.counts) - 1)
+        before = self.offset - lower
+        after = upper - (self.offset + len(self.counts) - 1)
+        if before or after:
+            self.sums = np.pad(self.sums, (before, after))
+            self.counts = np.pad(self.counts, (before, after))
+            self.minima = np.pad(self.minima, (before, after), constant_values=np.inf)
+            self.maxima = np.pad(self.maxima, (before, after), constant_values=-np.inf)
+            self.offset = lower
+
+
+class PriceStore:
+    """Price observations kept sorted on a pre-parsed datetime64 index.
+
+    Range queries use binary search and return views sharing the store's arrays.
+    Month, quarter and year aggregates are maintained on every append. Data appended
+    after the latest observation is copied into amortized growth buffers; older data
+    is merged into place.
+    """
+
+    def __init__(self, energy_type: str = "electricity", unit: str = "PLN/MWh", initial_capacity: int = 1024):
+        """Initialize an empty store."""
+        self.energy_type = energy_type
+        self.unit = unit
+        self._dates = np.empty(initial_capacity, dtype="datetime64[s]")
+        self._prices = np.empty(initial_capacity, dtype=np.float64)
+        self._size = 0
+        self._aggregates: Dict[str, PeriodAggregates] = {period: PeriodAggregates(period) for period in PERIODS}
+
+    def __len__(self) -> int:
+        """Return number of stored observations."""
+        return self._size
+
+    @classmethod
+    def from_series(cls, series: PriceSeries) -> "PriceStore":
+        """Create store holding a price series."""
+        store = cls(energy_type=series.energy_type, unit=series.unit, initial_capacity=max(len(series), 1))
+        store.append(series)
+        return store
+
+    @property
+    def series(self) -> PriceSeries:
+        """Return all stored observations as a series view sharing the store's buffers."""
+        view = PriceSeries.empty(self.energy_type, self.unit)
+        view.dates = self._dates[: self._size]
+        view.prices = self._prices[: self._size]
+        return view
+
+    def append(self, data: Union[PriceSeries, Sequence[PriceData]]) -> None:
+        """Add observations, keeping the index sorted and the period aggregates current."""
+        batch = PriceSeries.coerce(data, self.energy_type)
+        count = len(batch)
+        if count == 0:
+            return
+
+        if self._size == 0 or batch.dates[0] >= self._dates[self._size - 1]:
+            self._reserve(self._size + count)
+            self._dates[self._size : self._size + count] = batch.dates
+            self._prices[self._size : self._size + count] = batch.prices
+            self._size += count
+        else:
+            dates = np.concatenate([self._dates[: self._size], batch.dates])
+            prices = np.concatenate([self._prices[: self._size], batch.prices])
+            # Merged data goes to fresh buffers so views handed out earlier stay valid
+            order = np.argsort(dates, kind="stable")
+            capacity = max(len(order), len(self._prices))
+            self._dates = np.empty(capacity, dtype="datetime64[s]")
+            self._prices = np.empty(capacity, dtype=np.float64)
+            self._dates[: len(order)] = dates[order]
+            self._prices[: len(order)] = prices[order]
+            self._size = len(order)
+
+        for aggregates in self._aggregates.values():
+            aggregates.add(batch.dates, batch.prices)
+
+    def range(self, start_date: date, end_date: date) -> PriceSeries:
+        """Return observations between two dates (inclusive) as a zero-copy view."""
+        return self.series.between(start_date, end_date)
+
+    def aggregate(self, period: str) -> pd.DataFrame:
+        """Return precomputed sum, count, mean, min and max per month, quarter or year."""
+        if period not in self._aggregates:
+            raise ValueError(f"Unsupported period: {period}")
+        return self._aggregates[period].to_frame()
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow buffers geometrically to hold at least capacity observations."""
+        if capacity <= len(self._prices):
+            return
+        new_capacity = max(capacity, 2 * len(self._prices))
+        dates = np.empty(new_capacity, dtype="datetime64[s]")
+        prices = np.empty(new_capacity, dtype=np.float64)
+        dates[: self._size] = self._dates[: self._size]
+        prices[: self._size] = self._prices[: self._size]
+        self._dates, self._prices = dates, prices
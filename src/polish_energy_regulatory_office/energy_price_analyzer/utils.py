@@ -1,10 +1,21 @@
 """Utility functions for energy price analyzer."""
 
 from decimal import Decimal
-from typing import List, Union
+from typing import Any, Dict, List, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
+from .models import TariffStructure
+
+TREND_THRESHOLD = 0.05
+
+# Fixed-point scales used by the vectorized tariff cost engine
+PRICE_SCALE = 10**6  # energy prices in micro-PLN per kWh
+CONSUMPTION_SCALE = 10**3  # consumption in Wh
+COST_SCALE = PRICE_SCALE * CONSUMPTION_SCALE  # intermediate costs in nano-PLN
+GROSZE_SCALE = 100
+
 
 def calculate_average_price(prices: List[float]) -> float:
     """Calculate average price from list of prices."""
@@ -13,11 +24,91 @@ def calculate_average_price(prices: List[float]) -> float:
     return sum(prices) / len(prices)
 
 
+def classify_trend(first_half_avg: float, second_half_avg: float) -> str:
+    """Classify price trend by comparing averages of the two halves of a period."""
+    if second_half_avg > first_half_avg * (1 + TREND_THRESHOLD):
+        return "increasing"
+    if second_half_avg < first_half_avg * (1 - TREND_THRESHOLD):
+        return "decreasing"
+    return "stable"
+
+
+def calculate_price_statistics(prices: np.ndarray) -> Dict[str, Any]:
+    """Calculate average, volatility, extremes and trend of a price array in one vectorized pass."""
+    values = np.asarray(prices, dtype=np.float64)
+    count = len(values)
+    if count == 0:
+        return {"average_price": 0.0, "volatility": 0.0, "min_price": None, "max_price": None, "price_trend": "stable"}
+
+    half = count // 2
+    first_half_sum = float(values[:half].sum())
+    second_half_sum = float(values[half:].sum())
+    average = (first_half_sum + second_half_sum) / count
+    volatility = float(np.sqrt(np.square(values - average).sum() / (count - 1))) if count > 1 else 0.0
+    trend = classify_trend(first_half_sum / half, second_half_sum / (count - half)) if count >= 2 else "stable"
+
+    return {
+        "average_price": average,
+        "volatility": volatility,
+        "min_price": float(values.min()),
+        "max_price": float(values.max()),
+        "price_trend": trend,
+    }
+
+
 def format_currency(amount: Union[float, Decimal], currency: str = "PLN") -> str:
     """Format amount as currency string."""
     return f"{float(amount):.2f} {currency}"
 
 
+def _to_fixed_point(value: Decimal, scale: int) -> int:
+    """Convert Decimal to an exact integer multiple of 1/scale."""
+    scaled = value * scale
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Value {value} cannot be represented with 1/{scale} resolution")
+    return int(scaled)
+
+
+def calculate_cost_matrix(tariffs: Sequence[TariffStructure], consumption_kwh: Any) -> np.ndarray:
+    """Calculate total costs in grosze for every tariff and consumption value or profile.
+
+    ``consumption_kwh`` is either a 1-D array of M consumption values or a 2-D array of
+    M profiles with K periods each, in which case the cost of a profile is the sum of
+    ``calculate_total_cost`` over its periods. Costs are computed in int64 fixed point
+    and rounded half-even to grosze, so they equal the Decimal path quantized to 0.01 PLN.
+    Returns an int64 array of shape (N, M).
+    """
+    consumption = np.asarray(consumption_kwh, dtype=np.float64)
+    if consumption.ndim == 1:
+        consumption = consumption[:, np.newaxis]
+    if consumption.ndim != 2:
+        raise ValueError("Consumption must be a 1-D array of values or a 2-D array of profiles")
+
+    scaled = consumption * CONSUMPTION_SCALE
+    consumption_wh = np.rint(scaled)
+    if not np.allclose(scaled, consumption_wh, rtol=1e-12, atol=1e-6):
+        raise ValueError("Consumption resolution finer than 1 Wh is not supported")
+    total_wh = consumption_wh.astype(np.int64).sum(axis=1)
+    periods = consumption.shape[1]
+
+    energy_prices = np.array([_to_fixed_point(t.energy_price, PRICE_SCALE) for t in tariffs], dtype=np.int64)
+    fixed_fees = np.array(
+        [_to_fixed_point(t.base_price + t.network_fee, COST_SCALE) * periods for t in tariffs], dtype=np.int64
+    )
+
+    largest = int(np.abs(energy_prices).max(initial=0)) * int(np.abs(total_wh).max(initial=0))
+    if largest + int(np.abs(fixed_fees).max(initial=0)) >= 2**63:
+        raise OverflowError("Costs exceed int64 fixed-point range")
+
+    costs = fixed_fees[:, np.newaxis] + energy_prices[:, np.newaxis] * total_wh[np.newaxis, :]
+
+    step = COST_SCALE // GROSZE_SCALE
+    quotient, remainder = np.divmod(costs, step)
+    round_up = (remainder * 2 > step) | ((remainder * 2 == step) & (quotient % 2 == 1))
+    grosze: np.ndarray = quotient + round_up
+    return grosze
+
+
 def convert_units(value: float, from_unit: str, to_unit: str) -> float:
     """Convert between energy units."""
     conversions = {
@@ -35,9 +126,8 @@ def convert_units(value: float, from_unit: str, to_unit: str) -> float:
 
 def filter_by_date_range(data: pd.DataFrame, start_date: str, end_date: str, date_column: str = "date") -> pd.DataFrame:
     """Filter dataframe by date range."""
-    mask = (pd.to_datetime(data[date_column]) >= pd.to_datetime(start_date)) & (
-        pd.to_datetime(data[date_column]) <= pd.to_datetime(end_date)
-    )
+    dates = pd.to_datetime(data[date_column])
+    mask = (dates >= pd.to_datetime(start_date)) & (dates <= pd.to_datetime(end_date))
     data_filtered: pd.DataFrame = data[mask]
     return data_filtered
 
@@ -7,17 +7,33 @@ It includes tools for tracking prosumer adoption, analyzing distributed generati
 and mapping small-scale renewable energy deployment.
 """
 
+from .aggregates import MicroinstallationAggregates
+from .chunks import MicroinstallationChunk, iter_chunks
+from .cohorts import ProsumerCohorts
+from .grid import HOURLY_PV_PROFILE, coincidence_factor, hourly_indicators
 from .mapper import MicroinstallationMapper
 from .models import GridConnection, Microinstallation, ProsumerData
 from .scrapers import MicroinstallationScraper
+from .simulation import GenerationSimulation, hourly_yield_profiles, installation_yield, simulate_generation
 from .utils import analyze_grid_impact, calculate_prosumer_growth
 
 __all__ = [
     "MicroinstallationMapper",
     "Microinstallation",
+    "MicroinstallationChunk",
+    "MicroinstallationAggregates",
+    "ProsumerCohorts",
     "ProsumerData",
     "GridConnection",
     "MicroinstallationScraper",
+    "iter_chunks",
     "calculate_prosumer_growth",
     "analyze_grid_impact",
+    "hourly_indicators",
+    "coincidence_factor",
+    "HOURLY_PV_PROFILE",
+    "GenerationSimulation",
+    "simulate_generation",
+    "installation_yield",
+    "hourly_yield_profiles",
 ]
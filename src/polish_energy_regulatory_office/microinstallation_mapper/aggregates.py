@@ -0,0 +1,88 @@
+"""Microinstallation aggregates accumulated chunk by chunk."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..columns import extend_categories
+from .chunks import MicroinstallationChunk
+
+
+@dataclass(eq=False)
+class MicroinstallationAggregates:
+    """Microinstallation counts and capacity sums by municipality and voivodeship and by grid connection.
+
+    Each chunk is reduced with bincounts and added to a dense municipality ×
+    voivodeship matrix and per-connection vectors that grow as new categories
+    appear, so the registry is aggregated without ever being held in memory as a
+    whole. Installations without a connection ID are not counted per connection.
+    """
+
+    municipalities: List[str] = field(default_factory=list)
+    voivodeships: List[str] = field(default_factory=list)
+    counts: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int64))
+    capacities: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+    connection_ids: List[str] = field(default_factory=list)
+    connection_counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    connection_capacities: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    def add(self, chunk: MicroinstallationChunk) -> None:
+        """Add the microinstallations of a chunk."""
+        if len(chunk) == 0:
+            return
+        municipalities = extend_categories(chunk.municipality, self.municipalities)
+        voivodeships = extend_categories(chunk.voivodeship, self.voivodeships)
+        grow = (len(self.municipalities) - self.counts.shape[0], len(self.voivodeships) - self.counts.shape[1])
+        if any(grow):
+            padding = ((0, grow[0]), (0, grow[1]))
+            self.counts = np.pad(self.counts, padding)
+            self.capacities = np.pad(self.capacities, padding)
+
+        shape = self.counts.shape
+        cells = np.ravel_multi_index((municipalities, voivodeships), shape)
+        size = int(np.prod(shape))
+        self.counts += np.bincount(cells, minlength=size).reshape(shape)
+        self.capacities += np.bincount(cells, weights=chunk.capacity_kw, minlength=size).reshape(shape)
+
+        connected = np.flatnonzero(chunk.connection_id.codes >= 0)
+        connections = extend_categories(chunk.connection_id.take(connected), self.connection_ids)
+        grow_connections = len(self.connection_ids) - len(self.connection_counts)
+        if grow_connections:
+            self.connection_counts = np.pad(self.connection_counts, (0, grow_connections))
+            self.connection_capacities = np.pad(self.connection_capacities, (0, grow_connections))
+        size = len(self.connection_ids)
+        self.connection_counts += np.bincount(connections, minlength=size)
+        self.connection_capacities += np.bincount(connections, weights=chunk.capacity_kw[connected], minlength=size)
+
+    @property
+    def installation_count(self) -> int:
+        """Return total number of microinstallations."""
+        return int(self.counts.sum())
+
+    @property
+    def total_capacity_kw(self) -> float:
+        """Return total installed capacity."""
+        return float(self.capacities.sum())
+
+    def regional_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Return installation count and capacity of every voivodeship."""
+        counts = self.counts.sum(axis=0)
+        capacities = self.capacities.sum(axis=0)
+        return {
+            voivodeship: {"installation_count": int(count), "total_capacity_kw": float(capacity)}
+            for voivodeship, count, capacity in zip(self.voivodeships, counts, capacities)
+        }
+
+    def municipal_statistics(self, voivodeship: str) -> Dict[str, Dict[str, Any]]:
+        """Return installation count and capacity of every municipality of a voivodeship."""
+        if voivodeship not in self.voivodeships:
+            return {}
+        code = self.voivodeships.index(voivodeship)
+        return {
+            municipality: {"installation_count": int(count), "total_capacity_kw": float(capacity)}
+            for municipality, count, capacity in zip(
+                self.municipalities, self.counts[:, code], self.capacities[:, code]
+            )
+            if count
+        }
@@ -0,0 +1,182 @@
+"""Columnar chunks of microinstallation registry rows and export row readers."""
+
+import csv
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import IO, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..columns import CategoricalColumn, TextColumn
+from .models import Microinstallation, plausible_microinstallation_date
+
+Row = Tuple[str, float, date, str, str, Optional[str]]
+
+
+@dataclass(eq=False)
+class MicroinstallationChunk:
+    """Batch of microinstallations stored as struct-of-arrays.
+
+    Voivodeship, municipality and grid connection are dictionary encoded per
+    chunk (connection -1 when unknown); consumers merge chunks by category
+    string, not by code.
+    """
+
+    installation_id: TextColumn
+    capacity_kw: np.ndarray
+    commissioning_date: np.ndarray
+    voivodeship: CategoricalColumn
+    municipality: CategoricalColumn
+    connection_id: CategoricalColumn
+
+    def __len__(self) -> int:
+        """Return number of microinstallations."""
+        return len(self.capacity_kw)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Row]) -> "MicroinstallationChunk":
+        """Build chunk from parsed rows."""
+        count = len(rows)
+        return cls(
+            installation_id=TextColumn.encode([row[0] for row in rows]),
+            capacity_kw=np.fromiter((row[1] for row in rows), dtype=np.float64, count=count),
+            commissioning_date=np.array([row[2] for row in rows], dtype="datetime64[D]"),
+            voivodeship=CategoricalColumn.encode([row[3] for row in rows]),
+            municipality=CategoricalColumn.encode([row[4] for row in rows]),
+            connection_id=CategoricalColumn.encode([row[5] for row in rows]),
+        )
+
+    @classmethod
+    def from_microinstallations(cls, installations: Sequence[Microinstallation]) -> "MicroinstallationChunk":
+        """Build chunk from Microinstallation objects."""
+        return cls.from_rows(
+            [
+                (
+                    inst.installation_id,
+                    inst.capacity_kw,
+                    inst.commissioning_date,
+                    inst.voivodeship,
+                    inst.municipality,
+                    inst.connection_id,
+                )
+                for inst in installations
+            ]
+        )
+
+    def take(self, index: Any) -> "MicroinstallationChunk":
+        """Return chunk restricted to selected rows (boolean mask or positions)."""
+        return MicroinstallationChunk(
+            installation_id=self.installation_id.take(index),
+            capacity_kw=self.capacity_kw[index],
+            commissioning_date=self.commissioning_date[index],
+            voivodeship=self.voivodeship.take(index),
+            municipality=self.municipality.take(index),
+            connection_id=self.connection_id.take(index),
+        )
+
+    def to_microinstallations(self, index: Any = slice(None)) -> List[Microinstallation]:
+        """Materialize selected rows as Microinstallation objects."""
+        return [
+            Microinstallation(
+                installation_id=installation_id,
+                capacity_kw=capacity_kw,
+                commissioning_date=commissioning_date,
+                voivodeship=voivodeship or "",
+                municipality=municipality or "",
+                connection_id=connection_id,
+            )
+            for installation_id, capacity_kw, commissioning_date, voivodeship, municipality, connection_id in zip(
+                self.installation_id.decode(index),
+                self.capacity_kw[index].tolist(),
+                self.commissioning_date[index].astype(object).tolist(),
+                self.voivodeship.decode(index),
+                self.municipality.decode(index),
+                self.connection_id.decode(index),
+            )
+        ]
+
+
+def parse_row(cells: Sequence[Any]) -> Optional[Row]:
+    """Parse an export row, returning None if it cannot be parsed.
+
+    Columns are ID, capacity, commissioning date, voivodeship, municipality and
+    an optional grid connection ID. Cells may be text (HTML, CSV) or typed
+    spreadsheet values (XLSX), so header and malformed rows are rejected by the
+    same parse, as are commissioning dates before ``EARLIEST_COMMISSIONING_DATE``
+    or more than a year ahead.
+    """
+    if len(cells) < 5 or not cells[0]:
+        return None
+    installation_id, capacity, commissioned, voivodeship, municipality = cells[:5]
+    try:
+        capacity_kw = float(capacity.replace(",", ".")) if isinstance(capacity, str) else float(capacity)
+        if isinstance(commissioned, datetime):
+            commissioning_date = commissioned.date()
+        elif isinstance(commissioned, date):
+            commissioning_date = commissioned
+        else:
+            commissioning_date = datetime.strptime(str(commissioned).strip(), "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+    if capacity_kw < 0 or not voivodeship or not plausible_microinstallation_date(commissioning_date):
+        return None
+    connection_id = str(cells[5]).strip() if len(cells) > 5 and cells[5] not in (None, "") else None
+    return (
+        str(installation_id).strip(),
+        capacity_kw,
+        commissioning_date,
+        str(voivodeship),
+        str(municipality or ""),
+        connection_id,
+    )
+
+
+def iter_chunks(rows: Iterable[Sequence[Any]], chunk_size: int = 50_000) -> Iterator[MicroinstallationChunk]:
+    """Parse rows and yield them as chunks of at most chunk_size microinstallations, skipping unparseable rows."""
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    batch: List[Row] = []
+    for cells in rows:
+        row = parse_row(cells)
+        if row is None:
+            continue
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield MicroinstallationChunk.from_rows(batch)
+            batch = []
+    if batch:
+        yield MicroinstallationChunk.from_rows(batch)
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield newline-terminated lines of text arriving in arbitrary chunks."""
+    pending = ""
+    for chunk in chunks:
+        *lines, pending = (pending + chunk).split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def read_csv_rows(chunks: Iterable[str], delimiter: str = ";") -> Iterator[List[str]]:
+    """Yield stripped cells of every CSV row of text arriving in chunks."""
+    for row in csv.reader(iter_lines(chunks), delimiter=delimiter):
+        yield [cell.strip() for cell in row]
+
+
+def read_xlsx_rows(handle: IO[bytes]) -> Iterator[Sequence[Any]]:
+    """Yield cell values of every row of the first worksheet, reading the workbook in streaming mode.
+
+    Requires the optional ``openpyxl`` dependency.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("Reading XLSX exports requires openpyxl (pip install openpyxl)") from e
+
+    workbook = load_workbook(handle, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
@@ -0,0 +1,180 @@
+"""Daily cumulative prosumer counts and capacity for constant-time adoption queries."""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..columns import extend_categories
+from .chunks import MicroinstallationChunk
+
+
+def _day(day: date) -> int:
+    """Return days since 1970-01-01 of a date."""
+    return int(np.datetime64(day, "D").astype(np.int64))
+
+
+def _change_percent(current: float, previous: float) -> float:
+    """Return change of current over previous in percent, 0 when previous is 0."""
+    return (current - previous) / previous * 100 if previous > 0 else 0.0
+
+
+@dataclass(eq=False)
+class ProsumerCohorts:
+    """Cumulative microinstallation counts and capacity by commissioning day and voivodeship.
+
+    Row ``i`` of ``counts`` and ``capacities`` holds the totals of installations
+    commissioned before day ``start_day + i``, so the prosumers in operation on
+    any day are one row and the additions of any window the difference of two
+    rows. Chunks are folded in place with ``add`` as they arrive, extending the
+    day range and voivodeships as needed.
+    """
+
+    start_day: int = 0
+    voivodeships: List[str] = field(default_factory=list)
+    counts: np.ndarray = field(default_factory=lambda: np.zeros((1, 0), dtype=np.int64))
+    capacities: np.ndarray = field(default_factory=lambda: np.zeros((1, 0)))
+
+    @property
+    def days(self) -> int:
+        """Return number of days covered."""
+        return len(self.counts) - 1
+
+    @property
+    def first_day(self) -> Optional[date]:
+        """Return the earliest commissioning date, or None when empty."""
+        return self._date(self.start_day) if self.days else None
+
+    @property
+    def last_day(self) -> Optional[date]:
+        """Return the latest commissioning date, or None when empty."""
+        return self._date(self.start_day + self.days - 1) if self.days else None
+
+    def add(self, chunk: MicroinstallationChunk) -> None:
+        """Add the microinstallations of a chunk, skipping rows without commissioning date."""
+        dated = np.flatnonzero(~np.isnat(chunk.commissioning_date))
+        if len(dated) == 0:
+            return
+        chunk = chunk.take(dated)
+        days = chunk.commissioning_date.astype(np.int64)
+        first, last = int(days.min()), int(days.max())
+        if not self.days:
+            self.start_day = first
+        voivodeships = extend_categories(chunk.voivodeship, self.voivodeships)
+
+        before = max(self.start_day - first, 0)
+        after = max(last - (self.start_day + self.days - 1), 0)
+        grow = len(self.voivodeships) - self.counts.shape[1]
+        if before or after or grow:
+            # Earlier days start from zero, later days carry the final totals forward
+            self.counts = np.pad(self.counts, ((before, 0), (0, grow)))
+            self.capacities = np.pad(self.capacities, ((before, 0), (0, grow)))
+            self.counts = np.concatenate([self.counts, np.repeat(self.counts[-1:], after, axis=0)])
+            self.capacities = np.concatenate([self.capacities, np.repeat(self.capacities[-1:], after, axis=0)])
+            self.start_day -= before
+
+        # Only rows from the chunk's first day on change
+        offset = first - self.start_day
+        shape = (self.days - offset, len(self.voivodeships))
+        cells = np.ravel_multi_index((days - first, voivodeships), shape)
+        size = int(np.prod(shape))
+        self.counts[offset + 1 :] += np.cumsum(np.bincount(cells, minlength=size).reshape(shape), axis=0)
+        self.capacities[offset + 1 :] += np.cumsum(
+            np.bincount(cells, weights=chunk.capacity_kw, minlength=size).reshape(shape), axis=0
+        )
+
+    def trailing_year(self, period_end: Optional[date] = None) -> Tuple[date, date]:
+        """Return first and last day of the year up to period_end (the latest commissioning date by default)."""
+        if period_end is None:
+            period_end = self.last_day or date.today()
+        return _year_earlier(period_end) + timedelta(days=1), period_end
+
+    def totals_at(self, day: date, voivodeship: Optional[str] = None) -> Tuple[int, float]:
+        """Return count and capacity of installations commissioned up to and including day."""
+        return self._select(self._row(_day(day) + 1), voivodeship)
+
+    def period_totals(
+        self, period_start: date, period_end: date, voivodeship: Optional[str] = None
+    ) -> Tuple[int, float]:
+        """Return count and capacity of installations commissioned from period_start to period_end inclusive."""
+        start = self._row(_day(period_start))
+        end = self._row(_day(period_end) + 1)
+        if end < start:
+            raise ValueError("Period end must not precede period start")
+        end_count, end_capacity = self._select(end, voivodeship)
+        start_count, start_capacity = self._select(start, voivodeship)
+        return end_count - start_count, end_capacity - start_capacity
+
+    def growth(self, period_start: date, period_end: date, voivodeship: Optional[str] = None) -> Dict[str, float]:
+        """Return prosumers and capacity added in a period and their growth over the period's starting base."""
+        added_count, added_capacity = self.period_totals(period_start, period_end, voivodeship)
+        base_count, base_capacity = self._select(self._row(_day(period_start)), voivodeship)
+        return {
+            "growth_rate": added_count / base_count * 100 if base_count else 0.0,
+            "capacity_growth_rate": added_capacity / base_capacity * 100 if base_capacity > 0 else 0.0,
+            "installations_added": added_count,
+            "capacity_added_kw": added_capacity,
+            "installation_count": base_count + added_count,
+            "total_capacity_kw": base_capacity + added_capacity,
+        }
+
+    def year_over_year(
+        self, period_start: date, period_end: date, voivodeship: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Compare additions in a period with the same period one year earlier."""
+        count, capacity = self.period_totals(period_start, period_end, voivodeship)
+        previous_count, previous_capacity = self.period_totals(
+            _year_earlier(period_start), _year_earlier(period_end), voivodeship
+        )
+        return {
+            "installations_added": count,
+            "previous_installations_added": previous_count,
+            "installations_change_percent": _change_percent(count, previous_count),
+            "capacity_added_kw": capacity,
+            "previous_capacity_added_kw": previous_capacity,
+            "capacity_change_percent": _change_percent(capacity, previous_capacity),
+        }
+
+    def monthly_cohorts(
+        self, period_start: date, period_end: date, voivodeship: Optional[str] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Return count and capacity of installations commissioned in each month of a period, keyed YYYY-MM."""
+        if period_end < period_start:
+            raise ValueError("Period end must not precede period start")
+        months = np.arange(np.datetime64(period_start, "M"), np.datetime64(period_end, "M") + 1)
+        bounds = months.astype("datetime64[D]").astype(np.int64)
+        bounds[0] = _day(period_start)
+        rows = [self._row(day) for day in bounds.tolist()] + [self._row(_day(period_end) + 1)]
+        totals = [self._select(row, voivodeship) for row in rows]
+        return {
+            str(month): {
+                "installations_added": end[0] - start[0],
+                "capacity_added_kw": end[1] - start[1],
+            }
+            for month, start, end in zip(months, totals, totals[1:])
+        }
+
+    def _select(self, row: int, voivodeship: Optional[str]) -> Tuple[int, float]:
+        """Return count and capacity of a cumulative row, nationally or in one voivodeship."""
+        if voivodeship is None:
+            return int(self.counts[row].sum()), float(self.capacities[row].sum())
+        if voivodeship not in self.voivodeships:
+            return 0, 0.0
+        code = self.voivodeships.index(voivodeship)
+        return int(self.counts[row, code]), float(self.capacities[row, code])
+
+    def _row(self, day: int) -> int:
+        """Return cumulative row of installations commissioned before day, clamped to the covered range."""
+        return min(max(day - self.start_day, 0), self.days)
+
+    @staticmethod
+    def _date(day: int) -> date:
+        """Return the date of a day counted since 1970-01-01."""
+        value: date = np.datetime64(day, "D").astype(object)
+        return value
+
+
+def _year_earlier(day: date) -> date:
+    """Return the same day one year earlier, February 29th mapping to February 28th."""
+    return day.replace(year=day.year - 1, day=28) if (day.month, day.day) == (2, 29) else day.replace(year=day.year - 1)
@@ -0,0 +1,157 @@
+"""Grid impact indicators of aggregated microinstallation capacity."""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .aggregates import MicroinstallationAggregates
+from .models import GridConnection
+
+# Per-unit output of a south-facing PV microinstallation on a clear summer day in Poland, hours 0-23
+HOURLY_PV_PROFILE = np.array(
+    [0.0, 0.0, 0.0, 0.0, 0.02, 0.08, 0.2, 0.35, 0.5, 0.62, 0.7, 0.74]
+    + [0.75, 0.72, 0.65, 0.54, 0.4, 0.25, 0.12, 0.04, 0.01, 0.0, 0.0, 0.0]
+)
+
+# Coincidence of many dispersed PV systems: weather is shared, orientation and shading are not
+COINCIDENCE_FLOOR = 0.8
+
+UNASSIGNED_VOLTAGE_LEVEL = "unassigned"
+
+
+def coincidence_factor(counts: np.ndarray, floor: float = COINCIDENCE_FLOOR) -> np.ndarray:
+    """Return simultaneity of peak output of groups of installations: 1 for one, approaching floor for many."""
+    factor: np.ndarray = floor + (1.0 - floor) / np.sqrt(np.maximum(counts, 1))
+    return factor
+
+
+def hourly_indicators(
+    capacities: np.ndarray,
+    counts: np.ndarray,
+    hosting_capacities: np.ndarray,
+    profile: np.ndarray = HOURLY_PV_PROFILE,
+) -> Dict[str, np.ndarray]:
+    """Compute simultaneous generation of groups over an hourly horizon against their hosting capacity.
+
+    Generation of each group is its installed capacity times its coincidence
+    factor times the per-unit ``profile`` (any number of hours). As every group
+    shares the profile, hours over hosting capacity are the profile values above
+    each group's hosting/generation ratio: one search in the sorted profile per
+    group instead of a groups × hours matrix. Groups with NaN hosting capacity
+    have NaN utilisation and no hours over hosting capacity.
+    """
+    profile = np.sort(np.asarray(profile, dtype=np.float64))
+    tail_sums = np.append(np.cumsum(profile[::-1])[::-1], 0.0)
+    simultaneous = np.asarray(capacities, dtype=np.float64) * coincidence_factor(np.asarray(counts))
+    hosting_capacities = np.asarray(hosting_capacities, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        thresholds = hosting_capacities / simultaneous
+        first_over = np.searchsorted(profile, thresholds, side="right")
+        first_over[np.isnan(thresholds)] = len(profile)
+        peak = simultaneous * (profile[-1] if len(profile) else 0.0)
+        utilisation = np.where(hosting_capacities > 0, peak / hosting_capacities, np.nan)
+    hours_over = len(profile) - first_over
+    return {
+        "peak_generation_kw": peak,
+        "energy_kwh": simultaneous * tail_sums[0],
+        "utilisation": utilisation,
+        "hours_over_hosting_capacity": hours_over,
+        "energy_over_hosting_capacity_kwh": np.where(
+            hours_over > 0, simultaneous * tail_sums[first_over] - hosting_capacities * hours_over, 0.0
+        ),
+    }
+
+
+def grid_impact(
+    aggregates: MicroinstallationAggregates,
+    connections: Optional[Sequence[GridConnection]] = None,
+    profile: np.ndarray = HOURLY_PV_PROFILE,
+) -> Dict[str, Any]:
+    """Compute grid impact per voltage level and per municipality from aggregated capacity.
+
+    Connection-level indicators are evaluated for every connection and rolled up
+    to voltage levels; installations whose connection is missing or unknown are
+    reported under ``UNASSIGNED_VOLTAGE_LEVEL``.
+    """
+    connection_lookup = {connection.connection_id: connection for connection in connections or []}
+    levels: List[str] = sorted({connection.voltage_level for connection in connection_lookup.values()})
+    levels.append(UNASSIGNED_VOLTAGE_LEVEL)
+    level_codes = {level: code for code, level in enumerate(levels)}
+
+    linked = [connection_lookup.get(connection_id) for connection_id in aggregates.connection_ids]
+    connection_levels = np.array(
+        [level_codes[connection.voltage_level if connection else UNASSIGNED_VOLTAGE_LEVEL] for connection in linked],
+        dtype=np.intp,
+    )
+    connection_hosting = np.array(
+        [
+            np.nan if connection is None or connection.hosting_capacity_kw is None else connection.hosting_capacity_kw
+            for connection in linked
+        ],
+        dtype=np.float64,
+    )
+    per_connection = hourly_indicators(
+        aggregates.connection_capacities, aggregates.connection_counts, connection_hosting, profile
+    )
+
+    size = len(levels)
+    level_counts = _roll_up(connection_levels, aggregates.connection_counts, size)
+    level_capacities = _roll_up(connection_levels, aggregates.connection_capacities, size)
+    # Installations without a connection ID belong to no connection
+    level_counts[-1] += aggregates.installation_count - aggregates.connection_counts.sum()
+    level_capacities[-1] += aggregates.total_capacity_kw - aggregates.connection_capacities.sum()
+    known_hosting = ~np.isnan(connection_hosting)
+    level_hosting = _roll_up(connection_levels[known_hosting], connection_hosting[known_hosting], size)
+    level_hosting[level_hosting == 0] = np.nan
+    per_level = hourly_indicators(level_capacities, level_counts, level_hosting, profile)
+    overloaded = _roll_up(connection_levels, per_connection["hours_over_hosting_capacity"] > 0, size)
+    energy_over = _roll_up(connection_levels, per_connection["energy_over_hosting_capacity_kwh"], size)
+
+    municipality_codes, voivodeship_codes = np.nonzero(aggregates.counts)
+    municipality_counts = aggregates.counts[municipality_codes, voivodeship_codes]
+    municipality_capacities = aggregates.capacities[municipality_codes, voivodeship_codes]
+    per_municipality = hourly_indicators(
+        municipality_capacities,
+        municipality_counts,
+        np.full(len(municipality_counts), np.nan),
+        profile,
+    )
+    by_municipality: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for position, (municipality_code, voivodeship_code) in enumerate(zip(municipality_codes, voivodeship_codes)):
+        by_municipality.setdefault(aggregates.voivodeships[voivodeship_code], {})[
+            aggregates.municipalities[municipality_code]
+        ] = {
+            "installation_count": int(municipality_counts[position]),
+            "installed_capacity_kw": float(municipality_capacities[position]),
+            "peak_generation_kw": float(per_municipality["peak_generation_kw"][position]),
+            "energy_kwh": float(per_municipality["energy_kwh"][position]),
+        }
+
+    national = hourly_indicators(
+        np.array([aggregates.total_capacity_kw]), np.array([aggregates.installation_count]), np.array([np.nan]), profile
+    )
+    return {
+        "grid_impact": float(national["peak_generation_kw"][0]),
+        "total_capacity_kw": aggregates.total_capacity_kw,
+        "installation_count": aggregates.installation_count,
+        "by_voltage_level": {
+            level: {
+                "installation_count": int(level_counts[code]),
+                "installed_capacity_kw": float(level_capacities[code]),
+                "peak_generation_kw": float(per_level["peak_generation_kw"][code]),
+                "hosting_capacity_kw": float(level_hosting[code]),
+                "utilisation": float(per_level["utilisation"][code]),
+                "overloaded_connections": int(overloaded[code]),
+                "energy_over_hosting_capacity_kwh": float(energy_over[code]),
+            }
+            for code, level in enumerate(levels)
+            if level_counts[code]
+        },
+        "by_municipality": by_municipality,
+    }
+
+
+def _roll_up(codes: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    """Return float sums of weights per code."""
+    return np.bincount(codes, weights=weights, minlength=size).astype(np.float64)
@@ -1,14 +1,106 @@
 """Main mapper class for microinstallation analysis."""
 
-from typing import List
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aggregates import MicroinstallationAggregates
+from .chunks import MicroinstallationChunk
+from .cohorts import ProsumerCohorts
+from .grid import HOURLY_PV_PROFILE
+from .models import GridConnection, Microinstallation
+from .scrapers import MicroinstallationScraper
+from .simulation import GenerationSimulation, simulate_generation
+from .utils import analyze_grid_impact, calculate_prosumer_growth
 
 
 class MicroinstallationMapper:
-    """Main class for mapping and analyzing microinstallations."""
+    """Main class for mapping and analyzing microinstallations.
+
+    The registry is never loaded whole: it is streamed from the export as
+    columnar chunks, and aggregates and prosumer cohorts are accumulated in one
+    pass, one chunk at a time, and cached until ``refresh`` is called.
+    """
+
+    def __init__(self, timeout: int = 30, export_format: str = "html", chunk_size: int = 50_000) -> None:
+        """Initialize the mapper with a registry scraper and export settings."""
+        self.scraper = MicroinstallationScraper(timeout=timeout, export_format=export_format)
+        self.chunk_size = chunk_size
+        self._aggregates: Optional[MicroinstallationAggregates] = None
+        self._cohorts: Optional[ProsumerCohorts] = None
+
+    def iter_chunks(self) -> Iterator[MicroinstallationChunk]:
+        """Stream the registry as columnar chunks."""
+        return self.scraper.iter_chunks(chunk_size=self.chunk_size)
+
+    @property
+    def aggregates(self) -> MicroinstallationAggregates:
+        """Return registry aggregates, streaming the registry on first use."""
+        if self._aggregates is None:
+            self._aggregates, self._cohorts = self._load()
+        return self._aggregates
+
+    @property
+    def cohorts(self) -> ProsumerCohorts:
+        """Return daily cumulative prosumer cohorts, streaming the registry on first use."""
+        if self._cohorts is None:
+            self._aggregates, self._cohorts = self._load()
+        return self._cohorts
+
+    def add_chunks(self, chunks: Iterable[MicroinstallationChunk]) -> None:
+        """Fold newly arrived registry chunks into the cached aggregates and cohorts in place."""
+        for chunk in chunks:
+            self.aggregates.add(chunk)
+            self.cohorts.add(chunk)
+
+    def refresh(self) -> MicroinstallationAggregates:
+        """Stream the registry again and return the new aggregates."""
+        self._aggregates = None
+        self._cohorts = None
+        return self.aggregates
+
+    def _load(self) -> Tuple[MicroinstallationAggregates, ProsumerCohorts]:
+        """Stream the registry once into aggregates and cohorts."""
+        aggregates = MicroinstallationAggregates()
+        cohorts = ProsumerCohorts()
+        for chunk in self.iter_chunks():
+            aggregates.add(chunk)
+            cohorts.add(chunk)
+        return aggregates, cohorts
+
+    def get_microinstallations_by_region(self, voivodeship: str) -> List[Microinstallation]:
+        """Get microinstallations by region, keeping only matching rows of each streamed chunk."""
+        installations: List[Microinstallation] = []
+        for chunk in self.iter_chunks():
+            code = chunk.voivodeship.code_of(voivodeship)
+            if code >= 0:
+                installations.extend(chunk.to_microinstallations(chunk.voivodeship.codes == code))
+        return installations
+
+    def generate_regional_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Generate installation count and capacity for each voivodeship."""
+        return self.aggregates.regional_statistics()
+
+    def generate_municipal_statistics(self, voivodeship: str) -> Dict[str, Dict[str, Any]]:
+        """Generate installation count and capacity for each municipality of a voivodeship."""
+        return self.aggregates.municipal_statistics(voivodeship)
+
+    def calculate_prosumer_growth(
+        self,
+        period_start: Optional[date] = None,
+        period_end: Optional[date] = None,
+        voivodeship: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """Calculate prosumer growth in a period from the cached cohorts."""
+        return calculate_prosumer_growth(self.cohorts, period_start, period_end, voivodeship)
 
-    def __init__(self) -> None:
-        pass
+    def analyze_grid_impact(
+        self, connections: Optional[Sequence[GridConnection]] = None, profile: np.ndarray = HOURLY_PV_PROFILE
+    ) -> Dict[str, Any]:
+        """Analyze grid impact per voltage level and municipality from the cached aggregates."""
+        return analyze_grid_impact(self.aggregates, connections, profile)
 
-    def get_microinstallations_by_region(self, voivodeship: str) -> List:
-        """Get microinstallations by region."""
-        return []
+    def simulate_generation(self, year: int, max_workers: Optional[int] = None) -> GenerationSimulation:
+        """Stream the registry into an hourly PV generation simulation of a year."""
+        return simulate_generation(self.iter_chunks(), year, max_workers)
@@ -2,7 +2,17 @@
 
 from dataclasses import dataclass
 from datetime import date
-from typing import List
+from typing import List, Optional
+
+from ..renewable_energy_sources_mapper.models import plausible_commissioning_date
+
+# No grid-connected microinstallations predate this; earlier dates are data entry errors
+EARLIEST_COMMISSIONING_DATE = date(1990, 1, 1)
+
+
+def plausible_microinstallation_date(day: date) -> bool:
+    """Return whether a microinstallation commissioning date lies between 1990 and one year from today."""
+    return plausible_commissioning_date(day, EARLIEST_COMMISSIONING_DATE)
 
 
 @dataclass
@@ -14,6 +24,7 @@ class Microinstallation:
     commissioning_date: date
     voivodeship: str
     municipality: str
+    connection_id: Optional[str] = None
 
 
 @dataclass
@@ -30,3 +41,4 @@ class GridConnection:
 
     connection_id: str
     voltage_level: str
+    hosting_capacity_kw: Optional[float] = None
@@ -1,14 +1,148 @@
 """Web scrapers for microinstallation data."""
 
-from typing import List
+import codecs
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+import requests
+
+from ..parsers import declared_charset, stream_rows
+from .chunks import MicroinstallationChunk, iter_chunks, parse_row, read_csv_rows, read_xlsx_rows
+from .models import Microinstallation
 
 
 class MicroinstallationScraper:
-    """Scraper for microinstallation data."""
+    """Scraper for microinstallation data.
+
+    Registry exports (HTML tables, CSV or XLSX) are streamed page by page and
+    parsed into fixed-size columnar chunks, so memory use depends on the chunk
+    size and not on the size of the registry.
+    """
+
+    BASE_URL = "https://www.ure.gov.pl"
+    EXPORT_ENDPOINT = "/pl/oze/rejestry-i-bazy-danych-oze/5678,Rejestr-wytworcow-energii-w-mikroinstalacjach.html"
+    EXPORT_FORMATS = ("html", "csv", "xlsx")
+
+    def __init__(
+        self, timeout: int = 30, export_format: str = "html", csv_delimiter: str = ";", max_pages: int = 10_000
+    ) -> None:
+        """Initialize scraper with configuration; export_format is one of EXPORT_FORMATS."""
+        if export_format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        self.timeout = timeout
+        self.export_format = export_format
+        self.csv_delimiter = csv_delimiter
+        self.max_pages = max_pages
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "User-Agent": (
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/91.0.4472.124 Safari/537.36"
+                ),
+                "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+            }
+        )
+
+    def fetch_microinstallations(self, voivodeship: Optional[str] = None) -> List[Microinstallation]:
+        """Fetch microinstallations, optionally of one voivodeship, as a list.
+
+        Prefer ``iter_chunks`` for the whole registry.
+        """
+        installations: List[Microinstallation] = []
+        for chunk in self.iter_chunks():
+            if voivodeship is None:
+                installations.extend(chunk.to_microinstallations())
+                continue
+            code = chunk.voivodeship.code_of(voivodeship)
+            if code >= 0:
+                installations.extend(chunk.to_microinstallations(chunk.voivodeship.codes == code))
+        return installations
+
+    def iter_chunks(
+        self,
+        url: Optional[str] = None,
+        export_format: Optional[str] = None,
+        chunk_size: int = 50_000,
+        paged: bool = True,
+    ) -> Iterator[MicroinstallationChunk]:
+        """Stream a registry export (the microinstallation registry by default) as columnar chunks."""
+        yield from iter_chunks(self.iter_rows(url, export_format, paged), chunk_size)
+
+    def iter_rows(
+        self, url: Optional[str] = None, export_format: Optional[str] = None, paged: bool = True
+    ) -> Iterator[Sequence[Any]]:
+        """Yield raw export rows, following ``page`` parameters.
+
+        Registry rows whose installation ID was already yielded are dropped, so
+        overlapping pages, or pages shifted by records inserted while the export
+        downloads, are not counted twice. Paging stops at a page without registry
+        rows or one whose first registry row repeats the previous page's (an
+        export that ignores the parameter).
+        """
+        export_format = export_format or self.export_format
+        if export_format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        url = url or f"{self.BASE_URL}{self.EXPORT_ENDPOINT}"
+        rows = self._paged_rows(url, export_format) if paged else self._page_rows(url, {}, export_format)
+        seen: Set[str] = set()
+        for row in rows:
+            parsed = parse_row(row)
+            if parsed is not None:
+                if parsed[0] in seen:
+                    continue
+                seen.add(parsed[0])
+            yield row
+
+    def _paged_rows(self, url: str, export_format: str) -> Iterator[Sequence[Any]]:
+        """Yield rows of consecutive export pages until a page is empty or repeats the previous one."""
+        previous_first: Optional[Sequence[Any]] = None
+        for page in range(1, self.max_pages + 1):
+            first: Optional[Sequence[Any]] = None
+            for row in self._page_rows(url, {"page": page}, export_format):
+                if first is None and parse_row(row) is not None:
+                    if row == previous_first:
+                        return
+                    first = row
+                yield row
+            if first is None:
+                return
+            previous_first = first
+
+    def _page_rows(self, url: str, params: Dict[str, Any], export_format: str) -> Iterator[Sequence[Any]]:
+        """Yield rows of one export page while it downloads, skipping empty rows."""
+        with self.session.get(url, params=params, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for row in self._read(response, export_format):
+                if any(cell not in (None, "") for cell in row):
+                    yield row
+
+    def _read(self, response: requests.Response, export_format: str) -> Iterator[Sequence[Any]]:
+        """Yield rows of a streamed response in the given export format.
+
+        Text exports are decoded with the charset of the Content-Type header if it
+        declares one; otherwise HTML is decoded as the page itself declares and
+        CSV as UTF-8, skipping a byte order mark.
+        """
+        charset = declared_charset(response.headers.get("content-type"))
+        if export_format == "html":
+            yield from stream_rows(response.iter_content(64 * 1024), encoding=charset)
+        elif export_format == "csv":
+            text = codecs.iterdecode(response.iter_content(64 * 1024), charset or "utf-8-sig")
+            yield from read_csv_rows(text, self.csv_delimiter)
+        else:
+            # XLSX is a zip archive read from its central directory, so it is spooled to disk first
+            with tempfile.TemporaryFile() as handle:
+                for block in response.iter_content(64 * 1024):
+                    handle.write(block)
+                handle.seek(0)
+                yield from read_xlsx_rows(handle)
 
-    def __init__(self) -> None:
-        pass
+    def __enter__(self) -> "MicroinstallationScraper":
+        """Context manager entry."""
+        return self
 
-    def fetch_microinstallations(self) -> List:
-        """Fetch microinstallation data."""
-        return []
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit."""
+        self.session.close()
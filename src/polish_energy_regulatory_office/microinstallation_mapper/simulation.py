@@ -0,0 +1,249 @@
+"""Hourly PV generation of microinstallations aggregated to voivodeship and municipality curves."""
+
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .chunks import MicroinstallationChunk
+
+# Approximate centroid latitude (degrees) and annual yield (kWh per kWp) of a south-facing PV system per voivodeship
+VOIVODESHIP_PV_SITES: Dict[str, Tuple[float, float]] = {
+    "dolnoslaskie": (51.1, 1000.0),
+    "kujawsko-pomorskie": (53.1, 990.0),
+    "lubelskie": (51.2, 1040.0),
+    "lubuskie": (52.2, 990.0),
+    "lodzkie": (51.6, 1000.0),
+    "malopolskie": (49.9, 1000.0),
+    "mazowieckie": (52.4, 1010.0),
+    "opolskie": (50.6, 1010.0),
+    "podkarpackie": (49.9, 1030.0),
+    "podlaskie": (53.3, 990.0),
+    "pomorskie": (54.2, 970.0),
+    "slaskie": (50.3, 990.0),
+    "swietokrzyskie": (50.8, 1020.0),
+    "warminsko-mazurskie": (53.8, 970.0),
+    "wielkopolskie": (52.3, 1000.0),
+    "zachodniopomorskie": (53.6, 980.0),
+}
+
+# Share of the annual yield produced in each month, January to December
+MONTHLY_YIELD_SHARE = np.array([0.025, 0.042, 0.08, 0.115, 0.137, 0.138, 0.142, 0.125, 0.09, 0.058, 0.028, 0.02])
+
+# Solar declination (degrees) on the 15th of each month
+_MONTHLY_DECLINATION = np.array([-21.3, -13.3, -2.8, 9.4, 18.8, 23.3, 21.5, 14.0, 3.2, -8.5, -18.4, -23.3])
+
+
+def hourly_yield_profiles(year: int) -> Tuple[List[str], np.ndarray]:
+    """Return voivodeship names and their per-kWp generation (kWh) for every hour of a year.
+
+    Each voivodeship's monthly yield is spread over the days of the month and
+    over the hours of each day in proportion to the sine of the solar elevation
+    at its centroid (local solar time). The last row, a national mean, serves
+    installations in voivodeships not in ``VOIVODESHIP_PV_SITES``; names are
+    matched ignoring case and diacritics.
+    """
+    regions = list(VOIVODESHIP_PV_SITES)
+    latitudes = np.radians([VOIVODESHIP_PV_SITES[region][0] for region in regions])
+    annual = np.array([VOIVODESHIP_PV_SITES[region][1] for region in regions])
+
+    hour_angles = np.radians(15.0 * (np.arange(24) + 0.5 - 12.0))
+    declinations = np.radians(_MONTHLY_DECLINATION)
+    elevation = (
+        np.sin(latitudes)[:, None, None] * np.sin(declinations)[None, :, None]
+        + np.cos(latitudes)[:, None, None] * np.cos(declinations)[None, :, None] * np.cos(hour_angles)[None, None, :]
+    )
+    shape = np.clip(elevation, 0.0, None)
+    shape /= shape.sum(axis=2, keepdims=True)
+
+    hours = year_hours(year)
+    months = (hours.astype("datetime64[M]").astype(np.int64) % 12).astype(np.intp)
+    days_in_month = np.bincount(months, minlength=12) / 24
+    daily = annual[:, None] * MONTHLY_YIELD_SHARE[None, :] / days_in_month[None, :]
+    profiles = (daily[:, :, None] * shape)[:, months, np.arange(len(hours)) % 24]
+    return regions, np.vstack([profiles, profiles.mean(axis=0)])
+
+
+def year_hours(year: int) -> np.ndarray:
+    """Return the hours of a year as datetime64[h]."""
+    return np.arange(np.datetime64(f"{year}-01-01T00", "h"), np.datetime64(f"{year + 1}-01-01T00", "h"))
+
+
+@dataclass(eq=False)
+class GenerationSimulation:
+    """Capacity in operation per day for every municipality, expanded on demand to hourly PV generation curves.
+
+    Chunks are reduced to capacity commissioned per municipality and day of the
+    simulated year (earlier installations count from January 1st); the
+    generation of a group in an hour is its capacity in operation that day times
+    the per-kWp yield of its voivodeship in that hour. Curves are therefore
+    sums over installations without ever forming an installations × hours
+    matrix, and municipal curves are produced in blocks.
+    """
+
+    year: int
+    cells: List[Tuple[str, str]] = field(default_factory=list)
+    commissioned: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+
+    def __post_init__(self) -> None:
+        """Index cells and size the daily capacity matrix."""
+        self._lookup = {cell: position for position, cell in enumerate(self.cells)}
+        days = len(year_hours(self.year)) // 24
+        if self.commissioned.shape != (len(self.cells), days):
+            self.commissioned = np.zeros((len(self.cells), days))
+
+    @property
+    def hours(self) -> np.ndarray:
+        """Return the simulated hours."""
+        return year_hours(self.year)
+
+    def add(self, chunk: MicroinstallationChunk) -> None:
+        """Add the capacity of a chunk's installations commissioned up to the end of the year."""
+        self._add_reduced(*_reduce_chunk(chunk, self.year))
+
+    def merge(self, other: "GenerationSimulation") -> None:
+        """Add the capacity of another simulation of the same year."""
+        if other.year != self.year:
+            raise ValueError("Simulations of different years cannot be merged")
+        cells, days = np.nonzero(other.commissioned)
+        self._add_reduced(other.cells, cells, days, other.commissioned[cells, days])
+
+    def _add_reduced(
+        self, cells: List[Tuple[str, str]], positions: np.ndarray, days: np.ndarray, capacities: np.ndarray
+    ) -> None:
+        """Add capacity commissioned in cells (positions in ``cells``) on days of the year."""
+        translation = np.empty(len(cells), dtype=np.intp)
+        for index, cell in enumerate(cells):
+            if cell not in self._lookup:
+                self._lookup[cell] = len(self.cells)
+                self.cells.append(cell)
+            translation[index] = self._lookup[cell]
+        if len(self.cells) > len(self.commissioned):
+            self.commissioned = np.pad(self.commissioned, ((0, len(self.cells) - len(self.commissioned)), (0, 0)))
+        np.add.at(self.commissioned, (translation[positions], days), capacities)
+
+    def capacity_in_operation(self) -> np.ndarray:
+        """Return capacity in operation per cell and day."""
+        active: np.ndarray = np.cumsum(self.commissioned, axis=1)
+        return active
+
+    def voivodeship_curves(self) -> Dict[str, np.ndarray]:
+        """Return hourly generation (kWh) of every voivodeship."""
+        voivodeships = sorted({voivodeship for voivodeship, _ in self.cells})
+        codes = {voivodeship: code for code, voivodeship in enumerate(voivodeships)}
+        cell_codes = np.array([codes[voivodeship] for voivodeship, _ in self.cells], dtype=np.intp)
+        active = np.zeros((len(voivodeships), self.commissioned.shape[1]))
+        np.add.at(active, cell_codes, self.capacity_in_operation())
+        curves = self._expand(active, voivodeships)
+        return dict(zip(voivodeships, curves))
+
+    def municipality_curves(self, block_size: int = 256) -> Iterator[Tuple[List[Tuple[str, str]], np.ndarray]]:
+        """Yield (voivodeship, municipality) cells and their hourly generation (kWh) in blocks of block_size."""
+        active = self.capacity_in_operation()
+        for start in range(0, len(self.cells), block_size):
+            cells = self.cells[start : start + block_size]
+            yield cells, self._expand(active[start : start + block_size], [voivodeship for voivodeship, _ in cells])
+
+    def total_curve(self) -> np.ndarray:
+        """Return national hourly generation (kWh)."""
+        curves = self.voivodeship_curves()
+        total: np.ndarray = np.sum(list(curves.values()), axis=0) if curves else np.zeros(len(self.hours))
+        return total
+
+    def _expand(self, active: np.ndarray, voivodeships: List[str]) -> np.ndarray:
+        """Return hourly generation of groups from their daily capacity in operation and voivodeship."""
+        profiles = _profiles(self.year)
+        day_of_hour = np.arange(profiles.shape[1]) // 24
+        generation: np.ndarray = active[:, day_of_hour] * profiles[_profile_rows(voivodeships)]
+        return generation
+
+
+def installation_yield(chunk: MicroinstallationChunk, year: int) -> np.ndarray:
+    """Return the generation (kWh) of every installation of a chunk over a year, from its commissioning day on."""
+    profiles = _profiles(year)
+    daily = profiles.reshape(len(profiles), -1, 24).sum(axis=2)
+    remaining = np.hstack([np.cumsum(daily[:, ::-1], axis=1)[:, ::-1], np.zeros((len(daily), 1))])
+    days = (chunk.commissioning_date - np.datetime64(f"{year}-01-01", "D")).astype(np.int64)
+    first_day = np.clip(days, 0, daily.shape[1])
+    rows = _profile_rows(chunk.voivodeship.categories)[chunk.voivodeship.codes]
+    energy: np.ndarray = chunk.capacity_kw * remaining[rows, first_day]
+    return energy
+
+
+_PROFILE_CACHE: Dict[int, np.ndarray] = {}
+
+
+def _profiles(year: int) -> np.ndarray:
+    """Return hourly yield profiles of a year, computed once per process."""
+    if year not in _PROFILE_CACHE:
+        _PROFILE_CACHE[year] = hourly_yield_profiles(year)[1]
+    return _PROFILE_CACHE[year]
+
+
+def _profile_rows(voivodeships: List[str]) -> np.ndarray:
+    """Return profile rows of voivodeships, the national mean row for unknown ones."""
+    lookup = {region: row for row, region in enumerate(VOIVODESHIP_PV_SITES)}
+    return np.array([lookup.get(_ascii_name(voivodeship), len(lookup)) for voivodeship in voivodeships], dtype=np.intp)
+
+
+def _ascii_name(name: str) -> str:
+    """Return a voivodeship name casefolded and stripped of diacritics, e.g. ``Śląskie`` -> ``slaskie``."""
+    decomposed = unicodedata.normalize("NFKD", name.strip().casefold().replace("ł", "l"))
+    return "".join(character for character in decomposed if not unicodedata.combining(character))
+
+
+_Reduced = Tuple[List[Tuple[str, str]], np.ndarray, np.ndarray, np.ndarray]
+
+
+def _reduce_chunk(chunk: MicroinstallationChunk, year: int) -> _Reduced:
+    """Return a chunk's (voivodeship, municipality) cells and capacity commissioned per cell and day of a year.
+
+    Installations commissioned before the year count from its first day, later
+    ones are left out. The result is sparse (one entry per cell and day
+    present), which keeps it small to send back from a worker process.
+    """
+    start = np.datetime64(f"{year}-01-01", "D")
+    days = (chunk.commissioning_date - start).astype(np.int64)
+    width = len(year_hours(year)) // 24
+    in_year = days < width
+    municipality_count = len(chunk.municipality.categories)
+    pairs = chunk.voivodeship.codes[in_year].astype(np.int64) * municipality_count + chunk.municipality.codes[in_year]
+    unique_pairs, local = np.unique(pairs, return_inverse=True)
+    cells = [
+        (chunk.voivodeship.categories[voivodeship], chunk.municipality.categories[municipality])
+        for voivodeship, municipality in (divmod(pair, municipality_count) for pair in unique_pairs.tolist())
+    ]
+
+    slots, inverse = np.unique(local * width + np.clip(days[in_year], 0, None), return_inverse=True)
+    capacities = np.bincount(inverse, weights=chunk.capacity_kw[in_year], minlength=len(slots))
+    positions, slot_days = np.divmod(slots, width)
+    return cells, positions.astype(np.intp), slot_days.astype(np.intp), capacities.astype(np.float64)
+
+
+def simulate_generation(
+    chunks: Iterable[MicroinstallationChunk], year: int, max_workers: Optional[int] = None
+) -> GenerationSimulation:
+    """Simulate hourly PV generation of a stream of chunks over a year.
+
+    With ``max_workers`` chunks are reduced in a process pool, at most two
+    per worker in flight, so the stream is never buffered whole.
+    """
+    simulation = GenerationSimulation(year)
+    if not max_workers:
+        for chunk in chunks:
+            simulation.add(chunk)
+        return simulation
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: Set[Future[_Reduced]] = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    simulation._add_reduced(*future.result())
+            pending.add(executor.submit(_reduce_chunk, chunk, year))
+        for future in pending:
+            simulation._add_reduced(*future.result())
+    return simulation
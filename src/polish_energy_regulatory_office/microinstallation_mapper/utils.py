@@ -1,13 +1,86 @@
 """Utility functions for microinstallation mapping."""
 
-from typing import Dict, List
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 
+import numpy as np
 
-def calculate_prosumer_growth(data: List) -> Dict[str, float]:
-    """Calculate prosumer growth metrics."""
-    return {"growth_rate": 0.0}
+from .aggregates import MicroinstallationAggregates
+from .chunks import MicroinstallationChunk
+from .cohorts import ProsumerCohorts
+from .grid import HOURLY_PV_PROFILE, grid_impact
+from .models import GridConnection, Microinstallation, ProsumerData
 
 
-def analyze_grid_impact(installations: List) -> Dict[str, float]:
-    """Analyze grid impact of microinstallations."""
-    return {"grid_impact": 0.0}
+def calculate_prosumer_growth(
+    data: Union[ProsumerCohorts, Iterable[Union[MicroinstallationChunk, Microinstallation, ProsumerData]]],
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+    voivodeship: Optional[str] = None,
+) -> Dict[str, float]:
+    """Calculate prosumers and capacity added in a period and their growth rates in percent.
+
+    The period defaults to the year up to the latest commissioning date. Pass
+    prebuilt ``ProsumerCohorts`` to answer many periods without rescanning.
+    """
+    cohorts = _cohorts(data)
+    default_start, period_end = cohorts.trailing_year(period_end)
+    if period_start is None:
+        period_start = default_start
+    growth = cohorts.growth(period_start, period_end, voivodeship)
+    growth["year_over_year_change_percent"] = cohorts.year_over_year(period_start, period_end, voivodeship)[
+        "installations_change_percent"
+    ]
+    return growth
+
+
+def analyze_grid_impact(
+    installations: Union[MicroinstallationAggregates, Iterable[Union[MicroinstallationChunk, Microinstallation]]],
+    connections: Optional[Sequence[GridConnection]] = None,
+    profile: np.ndarray = HOURLY_PV_PROFILE,
+) -> Dict[str, Any]:
+    """Analyze grid impact of microinstallations per voltage level and municipality.
+
+    ``installations`` may be prebuilt aggregates, a stream of chunks or
+    Microinstallation objects; ``grid_impact`` is the national peak of
+    simultaneous generation in kW over the hourly ``profile``.
+    """
+    return grid_impact(_aggregate(installations), connections, profile)
+
+
+def _aggregate(
+    installations: Union[MicroinstallationAggregates, Iterable[Union[MicroinstallationChunk, Microinstallation]]],
+) -> MicroinstallationAggregates:
+    """Return installations as aggregates, adding chunks as they arrive."""
+    if isinstance(installations, MicroinstallationAggregates):
+        return installations
+    aggregates = MicroinstallationAggregates()
+    batch: List[Microinstallation] = []
+    for item in installations:
+        if isinstance(item, MicroinstallationChunk):
+            aggregates.add(item)
+        else:
+            batch.append(item)
+    if batch:
+        aggregates.add(MicroinstallationChunk.from_microinstallations(batch))
+    return aggregates
+
+
+def _cohorts(
+    data: Union[ProsumerCohorts, Iterable[Union[MicroinstallationChunk, Microinstallation, ProsumerData]]],
+) -> ProsumerCohorts:
+    """Return data as prosumer cohorts, adding chunks as they arrive."""
+    if isinstance(data, ProsumerCohorts):
+        return data
+    cohorts = ProsumerCohorts()
+    batch: List[Microinstallation] = []
+    for item in data:
+        if isinstance(item, MicroinstallationChunk):
+            cohorts.add(item)
+        elif isinstance(item, ProsumerData):
+            batch.extend(item.installations)
+        else:
+            batch.append(item)
+    if batch:
+        cohorts.add(MicroinstallationChunk.from_microinstallations(batch))
+    return cohorts
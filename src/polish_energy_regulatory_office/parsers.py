@@ -0,0 +1,143 @@
+"""Pluggable HTML table parsing backends shared by URE scrapers."""
+
+import codecs
+import itertools
+from email.message import Message
+from typing import Iterable, Iterator, List, Optional, Protocol, Union
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+Content = Union[str, bytes]
+
+
+class TableParser(Protocol):
+    """Backend extracting the text of table cells from an HTML page."""
+
+    name: str
+
+    def extract_rows(self, content: Content) -> List[List[str]]:
+        """Return text of the ``td`` cells of every ``tr`` row in document order."""
+
+
+def _cell_text(cell: lxml.html.HtmlElement) -> str:
+    """Return cell text joined from stripped fragments, as BeautifulSoup's get_text(strip=True)."""
+    if len(cell) == 0:
+        return cell.text.strip() if cell.text else ""
+    return "".join(fragment.strip() for fragment in cell.itertext())
+
+
+class LxmlTableParser:
+    """Fast table parser built on the lxml C tree."""
+
+    name = "lxml"
+
+    def extract_rows(self, content: Content) -> List[List[str]]:
+        """Return text of the ``td`` cells of every ``tr`` row in document order."""
+        document = lxml.html.fromstring(content)
+        return [[_cell_text(cell) for cell in row.iter("td")] for row in document.iter("tr")]
+
+
+class BeautifulSoupTableParser:
+    """Tolerant table parser built on BeautifulSoup and the standard library parser."""
+
+    name = "html.parser"
+
+    def extract_rows(self, content: Content) -> List[List[str]]:
+        """Return text of the ``td`` cells of every ``tr`` row in document order."""
+        soup = BeautifulSoup(content, "html.parser")
+        return [[cell.get_text(strip=True) for cell in row.find_all("td")] for row in soup.find_all("tr")]
+
+
+class FallbackTableParser:
+    """Parser trying a fast backend first and a tolerant one for pages it cannot handle."""
+
+    def __init__(self, primary: TableParser, fallback: TableParser):
+        """Initialize with primary and fallback backends."""
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+
+    def extract_rows(self, content: Content) -> List[List[str]]:
+        """Return rows from the primary backend, falling back on errors or when no rows were found."""
+        try:
+            rows = self.primary.extract_rows(content)
+        except (etree.ParserError, ValueError):
+            return self.fallback.extract_rows(content)
+        if not rows and _contains_rows(content):
+            return self.fallback.extract_rows(content)
+        return rows
+
+
+def _contains_rows(content: Content) -> bool:
+    """Check whether raw markup contains table rows."""
+    if isinstance(content, bytes):
+        return b"<tr" in content.lower()
+    return "<tr" in content.lower()
+
+
+def declared_charset(content_type: Optional[str]) -> Optional[str]:
+    """Return the charset a Content-Type header declares, or None when it declares none.
+
+    Unlike ``requests.Response.encoding`` this does not default ``text/*`` to
+    ISO-8859-1, so pages without a declared charset can be decoded from their
+    ``<meta charset>`` or byte order mark instead.
+    """
+    if not content_type:
+        return None
+    header = Message()
+    header["content-type"] = content_type
+    return header.get_content_charset()
+
+
+def stream_rows(chunks: Iterable[Content], encoding: Optional[str] = None) -> Iterator[List[str]]:
+    """Yield text of the ``td`` cells of every ``tr`` row while HTML is fed chunk by chunk.
+
+    Rows are parsed incrementally with lxml's pull parser and removed from the
+    tree once yielded, so memory stays bounded by the chunk size and a single row
+    however large the table is. Without ``encoding`` bytes are decoded as the
+    document's byte order mark or ``<meta>`` charset says, or as UTF-8 when the
+    first chunk declares neither. Rows of tables nested in a cell are yielded too, and are kept in
+    the tree until their enclosing row is complete so its cell text includes them.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, b"")
+    if encoding is None and isinstance(first, bytes) and not _declares_encoding(first):
+        encoding = "utf-8"
+    parser = etree.HTMLPullParser(events=("end",), tag="tr", encoding=encoding)
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+    for chunk in itertools.chain([first], chunks):
+        parser.feed(chunk)
+        yield from _drain_rows(parser)
+    parser.close()
+    yield from _drain_rows(parser)
+
+
+def _declares_encoding(head: bytes) -> bool:
+    """Check whether the start of an HTML document has a byte order mark or a charset declaration."""
+    return head.startswith((codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) or b"charset" in head.lower()
+
+
+def _drain_rows(parser: etree.HTMLPullParser) -> Iterator[List[str]]:
+    """Yield completed rows from a pull parser and drop outermost ones from the tree."""
+    for _, row in parser.read_events():
+        if not isinstance(row, lxml.html.HtmlElement):
+            continue
+        yield [_cell_text(cell) for cell in row.iter("td")]
+        if next(row.iterancestors("tr"), None) is not None:
+            continue
+        row.clear()
+        parent = row.getparent()
+        if parent is not None:
+            while row.getprevious() is not None:
+                del parent[0]
+
+
+def get_table_parser(name: str = "lxml") -> TableParser:
+    """Return table parser backend by name; ``lxml`` falls back to BeautifulSoup for malformed pages."""
+    if name == "lxml":
+        return FallbackTableParser(LxmlTableParser(), BeautifulSoupTableParser())
+    if name == "html.parser":
+        return BeautifulSoupTableParser()
+    raise ValueError(f"Unsupported parser backend: {name}")
@@ -7,17 +7,53 @@ renewable installations, tracking capacity growth, and analyzing regional
 distribution.
 """
 
+from .aggregates import RegistryAggregates
+from .crawl import CrawlResult, IncompleteCrawlError, RegistryCrawler
+from .cube import CapacityCube
+from .geospatial import ClusterPyramid, iter_geojson, iter_geojson_features, write_geojson
 from .mapper import RenewableEnergyMapper
-from .models import InstallationType, RegionalData, RenewableInstallation
+from .models import CompactInstallation, InstallationType, RegionalData, RenewableInstallation
+from .query import InstallationCursor, InstallationQuery, TableIndex
 from .scrapers import RESRegistryScraper
-from .utils import calculate_capacity_growth, generate_geospatial_data
+from .snapshot import SnapshotStore
+from .spatial import SpatialIndex, haversine_km
+from .sync import InstallationChange, RegistryDiff, diff_tables
+from .table import InstallationTable
+from .utils import (
+    analyze_installation_trends,
+    calculate_capacity_growth,
+    find_optimal_locations,
+    generate_geospatial_data,
+)
 
 __all__ = [
     "RenewableEnergyMapper",
     "RenewableInstallation",
+    "CompactInstallation",
     "InstallationType",
     "RegionalData",
     "RESRegistryScraper",
+    "RegistryCrawler",
+    "CrawlResult",
+    "IncompleteCrawlError",
+    "InstallationTable",
+    "InstallationQuery",
+    "InstallationCursor",
+    "TableIndex",
+    "RegistryAggregates",
+    "CapacityCube",
+    "SnapshotStore",
+    "RegistryDiff",
+    "InstallationChange",
+    "diff_tables",
+    "SpatialIndex",
+    "haversine_km",
+    "ClusterPyramid",
+    "iter_geojson",
+    "iter_geojson_features",
+    "write_geojson",
     "calculate_capacity_growth",
+    "analyze_installation_trends",
     "generate_geospatial_data",
+    "find_optimal_locations",
 ]
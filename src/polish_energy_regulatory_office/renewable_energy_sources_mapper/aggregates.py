@@ -0,0 +1,121 @@
+"""
+Registry aggregates shared by the mapper's report methods.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..columns import extend_categories
+from .models import RegionalData
+from .sync import RegistryDiff
+from .table import InstallationTable
+
+
+@dataclass(eq=False)
+class RegistryAggregates:
+    """Installation counts and capacity sums of a registry snapshot.
+
+    A single bincount over the table fills a dense municipality × voivodeship ×
+    installation type cube; regional, municipal, per-type and overall totals are
+    reductions of that cube, so reports never rescan the installations. Registry
+    changes are folded in with ``apply_diff`` without recomputing the cube.
+    """
+
+    municipalities: List[str]
+    voivodeships: List[str]
+    installation_types: List[str]
+    counts: np.ndarray
+    capacities: np.ndarray
+
+    @classmethod
+    def from_table(cls, table: InstallationTable) -> "RegistryAggregates":
+        """Compute aggregates of an installation table in one pass."""
+        counts, capacities = table.group_totals(table.municipality, table.voivodeship, table.installation_type)
+        return cls(
+            municipalities=list(table.municipality.categories),
+            voivodeships=list(table.voivodeship.categories),
+            installation_types=list(table.installation_type.categories),
+            counts=counts,
+            capacities=capacities,
+        )
+
+    def apply_diff(self, diff: RegistryDiff) -> None:
+        """Update aggregates in place by retracting removed and changed rows and adding their new versions."""
+        for table, sign in ((diff.removed, -1), (diff.previous, -1), (diff.added, 1), (diff.current, 1)):
+            self._accumulate(table, sign)
+
+    @property
+    def installation_count(self) -> int:
+        """Return total number of installations."""
+        return int(self.counts.sum())
+
+    @property
+    def total_capacity_kw(self) -> float:
+        """Return total installed capacity."""
+        return float(self.capacities.sum())
+
+    def by_type(self) -> Dict[str, Dict[str, Any]]:
+        """Return installation count and capacity per installation type."""
+        counts = self.counts.sum(axis=(0, 1))
+        capacities = self.capacities.sum(axis=(0, 1))
+        return {
+            value: {"count": int(count), "capacity_kw": float(capacity)}
+            for value, count, capacity in zip(self.installation_types, counts, capacities)
+        }
+
+    def regional_statistics(self) -> Dict[str, RegionalData]:
+        """Return statistics of every voivodeship with installations."""
+        counts = self.counts.sum(axis=0)
+        capacities = self.capacities.sum(axis=0)
+
+        regional_stats = {}
+        for code, voivodeship in enumerate(self.voivodeships):
+            installation_count = int(counts[code].sum())
+            if installation_count == 0:
+                continue
+            regional_stats[voivodeship] = RegionalData(
+                voivodeship=voivodeship,
+                total_capacity_kw=float(capacities[code].sum()),
+                installation_count=installation_count,
+                type_distribution={value: int(count) for value, count in zip(self.installation_types, counts[code])},
+            )
+        return regional_stats
+
+    def top_municipalities(self, limit: int = 10, sort_by: str = "capacity") -> List[Dict[str, Any]]:
+        """Return municipalities ranked by capacity or, otherwise, by installation count."""
+        counts = self.counts.sum(axis=2)
+        capacities = self.capacities.sum(axis=2)
+        municipality_codes, voivodeship_codes = np.nonzero(counts)
+        group_counts = counts[municipality_codes, voivodeship_codes]
+        group_capacities = capacities[municipality_codes, voivodeship_codes]
+
+        sort_key = group_capacities if sort_by == "capacity" else group_counts
+        top = np.argsort(-sort_key, kind="stable")[:limit]
+
+        return [
+            {
+                "municipality": self.municipalities[municipality_codes[index]],
+                "voivodeship": self.voivodeships[voivodeship_codes[index]],
+                "total_capacity_kw": float(group_capacities[index]),
+                "installation_count": int(group_counts[index]),
+            }
+            for index in top
+        ]
+
+    def _accumulate(self, table: InstallationTable, sign: int) -> None:
+        """Add (sign 1) or retract (sign -1) the rows of a table."""
+        if len(table) == 0:
+            return
+        municipalities = extend_categories(table.municipality, self.municipalities)
+        voivodeships = extend_categories(table.voivodeship, self.voivodeships)
+        grow = (len(self.municipalities) - self.counts.shape[0], len(self.voivodeships) - self.counts.shape[1])
+        if any(grow):
+            padding = ((0, grow[0]), (0, grow[1]), (0, 0))
+            self.counts = np.pad(self.counts, padding)
+            self.capacities = np.pad(self.capacities, padding)
+
+        cells = (municipalities, voivodeships, table.installation_type.codes)
+        np.add.at(self.counts, cells, sign)
+        np.add.at(self.capacities, cells, sign * table.capacity_kw)
@@ -0,0 +1,316 @@
+"""
+Concurrent, rate-limited crawl of the paginated RES registries.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from .models import RenewableInstallation
+
+if TYPE_CHECKING:
+    from .scrapers import RESRegistryScraper
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+CHECKPOINT_FORMAT_VERSION = 1
+
+Rows = List[List[str]]
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second with bursts up to ``capacity``.
+
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    threads are released in arrival order at the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize a full bucket."""
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; return seconds waited."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate) - 1
+            self._updated = now
+            delay = max(0.0, -self._tokens / self.rate)
+        if delay:
+            self._sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """Token buckets keyed by URL host."""
+
+    def __init__(self, requests_per_second: float = 2.0, burst: int = 4):
+        """Initialize limiter allowing requests_per_second per host with bursts of burst requests."""
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait for the URL's host to accept another request; return seconds waited."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        return bucket.acquire()
+
+
+@dataclass(frozen=True)
+class CrawlTask:
+    """Single registry page: endpoint name, voivodeship and 1-based page number."""
+
+    endpoint: str
+    voivodeship: str
+    page: int
+
+    @property
+    def label(self) -> str:
+        """Return human-readable task identifier."""
+        return f"{self.endpoint}/{self.voivodeship}/{self.page}"
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of a registry crawl."""
+
+    installations: List[RenewableInstallation] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    pages_fetched: int = 0
+    pages_resumed: int = 0
+
+    @property
+    def is_complete(self) -> bool:
+        """Check whether every page was fetched."""
+        return not self.errors
+
+
+class IncompleteCrawlError(RuntimeError):
+    """Raised when a crawl missed pages and its installations are not the whole registry."""
+
+    def __init__(self, result: CrawlResult):
+        """Initialize with the partial crawl result."""
+        super().__init__(f"Registry crawl incomplete, {len(result.errors)} page(s) failed: {sorted(result.errors)}")
+        self.result = result
+
+
+class CrawlCheckpoint:
+    """Append-only JSONL log of crawled pages and their table rows, used to resume a crawl.
+
+    The first line records the format version and when the crawl started. A
+    checkpoint older than ``max_age`` seconds (or of another format) is deleted
+    instead of resumed, so stale pages never end up in a new crawl's result.
+    """
+
+    def __init__(self, path: Union[str, Path], max_age: Optional[float] = 24 * 3600.0):
+        """Initialize checkpoint stored at path; max_age None resumes checkpoints of any age."""
+        self.path = Path(path)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[CrawlTask, Tuple[Rows, bool]]:
+        """Return rows and end-of-pages flag of every recorded page, skipping a torn last line."""
+        completed: Dict[CrawlTask, Tuple[Rows, bool]] = {}
+        if not self.path.exists():
+            return completed
+        with self.path.open(encoding="utf-8") as handle:
+            if not self._is_current(handle.readline()):
+                handle.close()
+                self.clear()
+                return completed
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                task = CrawlTask(entry["endpoint"], entry["voivodeship"], entry["page"])
+                completed[task] = (entry["rows"], entry["last"])
+        return completed
+
+    def _is_current(self, header: str) -> bool:
+        """Check whether a header line belongs to a resumable crawl of this format and age."""
+        try:
+            meta = json.loads(header)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(meta, dict) or meta.get("format_version") != CHECKPOINT_FORMAT_VERSION:
+            return False
+        return self.max_age is None or time.time() - float(meta["started_at"]) <= self.max_age
+
+    def record(self, task: CrawlTask, rows: Rows, last: bool) -> None:
+        """Append a crawled page."""
+        entry = {
+            "endpoint": task.endpoint,
+            "voivodeship": task.voivodeship,
+            "page": task.page,
+            "rows": rows,
+            "last": last,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                if handle.tell() == 0:
+                    header = {"format_version": CHECKPOINT_FORMAT_VERSION, "started_at": time.time()}
+                    handle.write(json.dumps(header) + "\n")
+                handle.write(line)
+                handle.flush()
+
+    def clear(self) -> None:
+        """Delete the checkpoint."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+
+class RegistryCrawler:
+    """Crawl registry endpoints split into (endpoint, voivodeship, page) tasks on a bounded thread pool.
+
+    Each endpoint/voivodeship pair is paged until a page without data rows (or a
+    repeat of the previous page) is returned. Requests are throttled per host by
+    a token bucket and retried with exponential backoff on connection errors and
+    429/5xx replies. With a checkpoint, finished pages are logged as they arrive
+    and an interrupted crawl resumes from the first missing page of every stream,
+    unless it started more than ``checkpoint_max_age`` seconds ago.
+    """
+
+    def __init__(
+        self,
+        scraper: RESRegistryScraper,
+        max_workers: int = 8,
+        requests_per_second: float = 2.0,
+        burst: int = 4,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_pages: int = 1000,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        checkpoint_max_age: Optional[float] = 24 * 3600.0,
+    ):
+        """Initialize crawler fetching through the scraper's session and parser."""
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_pages = max_pages
+        self.checkpoint = CrawlCheckpoint(checkpoint_path, checkpoint_max_age) if checkpoint_path else None
+
+    def crawl(
+        self, voivodeships: Optional[Sequence[str]] = None, endpoints: Optional[Sequence[str]] = None
+    ) -> CrawlResult:
+        """Crawl all pages of the given voivodeships (all by default) and registry endpoints."""
+        voivodeships = list(voivodeships or self.scraper.get_available_voivodeships())
+        endpoints = list(endpoints or self.scraper.REGISTRY_ENDPOINTS)
+        completed = self.checkpoint.load() if self.checkpoint else {}
+        result = CrawlResult()
+        pages: Dict[CrawlTask, Rows] = {}
+        futures: Dict[Future[Rows], CrawlTask] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def schedule(task: CrawlTask) -> None:
+                """Submit the first page of a stream, starting after pages restored from the checkpoint."""
+                while task in completed:
+                    rows, last = completed[task]
+                    pages[task] = rows
+                    result.pages_resumed += 1
+                    if last:
+                        return
+                    task = CrawlTask(task.endpoint, task.voivodeship, task.page + 1)
+                futures[executor.submit(self._fetch_page, task)] = task
+
+            for endpoint in endpoints:
+                for voivodeship in voivodeships:
+                    schedule(CrawlTask(endpoint, voivodeship, 1))
+
+            while futures:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = futures.pop(future)
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        result.errors[task.label] = str(e)
+                        continue
+                    previous = pages.get(CrawlTask(task.endpoint, task.voivodeship, task.page - 1))
+                    last = not rows or rows == previous or task.page >= self.max_pages
+                    pages[task] = rows
+                    result.pages_fetched += 1
+                    if self.checkpoint:
+                        self.checkpoint.record(task, rows, last)
+                    if not last:
+                        schedule(CrawlTask(task.endpoint, task.voivodeship, task.page + 1))
+
+        result.installations = self._collect(pages, endpoints, voivodeships)
+        if self.checkpoint and result.is_complete:
+            self.checkpoint.clear()
+        return result
+
+    def _fetch_page(self, task: CrawlTask) -> Rows:
+        """Fetch data rows of one page, retrying transient failures."""
+        url = f"{self.scraper.BASE_URL}{self.scraper.REGISTRY_ENDPOINTS[task.endpoint]}"
+        params: Dict[str, Union[str, int]] = {"wojewodztwo": task.voivodeship, "page": task.page}
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(url)
+            try:
+                response = self.scraper.session.get(url, params=params, timeout=self.scraper.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return self.scraper._extract_data_rows(response.content)
+                time.sleep(self._backoff_delay(attempt, response.headers.get("Retry-After")))
+            attempt += 1
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Return delay before the next attempt, honouring a numeric Retry-After header."""
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return float(self.backoff * 2**attempt + random.uniform(0, self.backoff))
+
+    def _collect(
+        self, pages: Dict[CrawlTask, Rows], endpoints: List[str], voivodeships: List[str]
+    ) -> List[RenewableInstallation]:
+        """Parse rows in endpoint, voivodeship and page order, keeping the first record of every ID."""
+        endpoint_order = {endpoint: position for position, endpoint in enumerate(endpoints)}
+        voivodeship_order = {voivodeship: position for position, voivodeship in enumerate(voivodeships)}
+        installations: Dict[str, RenewableInstallation] = {}
+        for task in sorted(
+            pages, key=lambda task: (endpoint_order[task.endpoint], voivodeship_order[task.voivodeship], task.page)
+        ):
+            for cells in pages[task]:
+                installation = self.scraper._parse_installation_row(cells)
+                if installation is not None:
+                    installations.setdefault(installation.installation_id, installation)
+        return list(installations.values())
@@ -0,0 +1,151 @@
+"""
+Cumulative capacity cube for constant-time growth queries over commissioning periods.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..columns import extend_categories
+from .models import CapacityGrowthAnalysis, InstallationType
+from .sync import RegistryDiff
+from .table import INSTALLATION_TYPES, InstallationTable
+
+
+def _month(day: date) -> int:
+    """Return months since 1970-01 of a date."""
+    return int(np.datetime64(day, "M").astype(np.int64))
+
+
+@dataclass(eq=False)
+class CapacityCube:
+    """Cumulative installation counts and capacity by commissioning month, voivodeship and installation type.
+
+    Row ``i`` of ``counts`` and ``capacities`` holds the totals of installations
+    commissioned before month ``start_month + i``, so the registry as of any month
+    is one row and the additions of any period the difference of two rows, however
+    many installations the registry holds. Periods are resolved to whole months.
+    New installations are folded in with ``add`` or ``apply_diff``, which extend
+    the month range and voivodeships as needed.
+    """
+
+    start_month: int = 0
+    voivodeships: List[str] = field(default_factory=list)
+    counts: np.ndarray = field(default_factory=lambda: np.zeros((1, 0, len(INSTALLATION_TYPES)), dtype=np.int64))
+    capacities: np.ndarray = field(default_factory=lambda: np.zeros((1, 0, len(INSTALLATION_TYPES))))
+
+    @classmethod
+    def from_table(cls, table: InstallationTable) -> "CapacityCube":
+        """Build cube of an installation table."""
+        cube = cls()
+        cube.add(table)
+        return cube
+
+    @property
+    def months(self) -> int:
+        """Return number of months covered."""
+        return len(self.counts) - 1
+
+    @property
+    def first_month(self) -> Optional[date]:
+        """Return first day of the earliest commissioning month, or None when empty."""
+        return self._month_date(self.start_month) if self.months else None
+
+    @property
+    def last_month(self) -> Optional[date]:
+        """Return first day of the latest commissioning month, or None when empty."""
+        return self._month_date(self.start_month + self.months - 1) if self.months else None
+
+    def add(self, table: InstallationTable) -> None:
+        """Add installations of a table."""
+        self._accumulate(table, 1)
+
+    def apply_diff(self, diff: RegistryDiff) -> None:
+        """Update cube in place by retracting removed and changed rows and adding their new versions."""
+        for table, sign in ((diff.removed, -1), (diff.previous, -1), (diff.added, 1), (diff.current, 1)):
+            self._accumulate(table, sign)
+
+    def totals_at(self, day: date) -> Tuple[np.ndarray, np.ndarray]:
+        """Return voivodeship × type counts and capacities of installations commissioned up to day's month."""
+        row = self._row(_month(day) + 1)
+        return self.counts[row], self.capacities[row]
+
+    def period_totals(self, period_start: date, period_end: date) -> Tuple[np.ndarray, np.ndarray]:
+        """Return voivodeship × type counts and capacities added from period_start's to period_end's month."""
+        start = self._row(_month(period_start))
+        end = self._row(_month(period_end) + 1)
+        if end < start:
+            raise ValueError("Period end must not precede period start")
+        return self.counts[end] - self.counts[start], self.capacities[end] - self.capacities[start]
+
+    def growth(self, period_start: date, period_end: date, voivodeship: Optional[str] = None) -> CapacityGrowthAnalysis:
+        """Analyze installations added in a period, optionally within one voivodeship."""
+        added_counts, added_capacities = self.period_totals(period_start, period_end)
+        base = self.capacities[self._row(_month(period_start))]
+        if voivodeship is not None:
+            selected = [self.voivodeships.index(voivodeship)] if voivodeship in self.voivodeships else []
+            added_counts, added_capacities, base = added_counts[selected], added_capacities[selected], base[selected]
+
+        added_kw = float(added_capacities.sum())
+        base_kw = float(base.sum())
+        by_type = added_capacities.sum(axis=0)
+        by_region = added_capacities.sum(axis=1)
+        regions = self.voivodeships if voivodeship is None else [voivodeship] * len(by_region)
+        dominant = INSTALLATION_TYPES[int(np.argmax(by_type))] if added_kw > 0 else InstallationType.SOLAR_PV
+        return CapacityGrowthAnalysis(
+            period_start=period_start,
+            period_end=period_end,
+            total_capacity_added_kw=added_kw,
+            installations_added=int(added_counts.sum()),
+            growth_rate_percent=added_kw / base_kw * 100 if base_kw > 0 else 0.0,
+            dominant_technology=dominant,
+            regional_breakdown={
+                region: float(capacity)
+                for region, capacity, count in zip(regions, by_region, added_counts.sum(axis=1))
+                if count
+            },
+        )
+
+    def _row(self, month: int) -> int:
+        """Return cumulative row of installations commissioned before month, clamped to the covered range."""
+        return min(max(month - self.start_month, 0), self.months)
+
+    @staticmethod
+    def _month_date(month: int) -> date:
+        """Return first day of a month counted since 1970-01."""
+        day: date = np.datetime64(month, "M").astype("datetime64[D]").astype(object)
+        return day
+
+    def _accumulate(self, table: InstallationTable, sign: int) -> None:
+        """Add (sign 1) or retract (sign -1) the rows of a table, skipping rows without commissioning date."""
+        dated = np.flatnonzero(~np.isnat(table.commissioning_date))
+        if len(dated) == 0:
+            return
+        table = table.take(dated)
+        months = table.commissioning_date.astype("datetime64[M]").astype(np.int64)
+        first, last = int(months.min()), int(months.max())
+        if not self.months:
+            self.start_month = first
+        voivodeships = extend_categories(table.voivodeship, self.voivodeships)
+
+        before = max(self.start_month - first, 0)
+        after = max(last - (self.start_month + self.months - 1), 0)
+        grow = len(self.voivodeships) - self.counts.shape[1]
+        if before or after or grow:
+            # Earlier months start from zero, later months carry the final totals forward
+            padding = ((before, 0), (0, grow), (0, 0))
+            self.counts = np.pad(self.counts, padding)
+            self.capacities = np.pad(self.capacities, padding)
+            self.counts = np.concatenate([self.counts, np.repeat(self.counts[-1:], after, axis=0)])
+            self.capacities = np.concatenate([self.capacities, np.repeat(self.capacities[-1:], after, axis=0)])
+            self.start_month -= before
+
+        shape = (self.months, len(self.voivodeships), len(INSTALLATION_TYPES))
+        cells = np.ravel_multi_index((months - self.start_month, voivodeships, table.installation_type.codes), shape)
+        size = int(np.prod(shape))
+        counts = np.bincount(cells, minlength=size).reshape(shape)
+        capacities = np.bincount(cells, weights=table.capacity_kw, minlength=size).reshape(shape)
+        self.counts[1:] += sign * np.cumsum(counts, axis=0)
+        self.capacities[1:] += sign * np.cumsum(capacities, axis=0)
@@ -0,0 +1,222 @@
+"""
+GeoJSON export and multi-zoom clustering of installation locations.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+import numpy as np
+
+from .table import InstallationTable
+
+MAX_LATITUDE = 85.05112878
+
+
+def _located(table: InstallationTable) -> np.ndarray:
+    """Return positions of installations with both coordinates."""
+    return np.flatnonzero(~(np.isnan(table.latitude) | np.isnan(table.longitude)))
+
+
+def iter_geojson_features(table: InstallationTable) -> Iterator[Dict[str, Any]]:
+    """Yield a GeoJSON point feature for every installation with coordinates."""
+    located = _located(table)
+    columns = zip(
+        table.installation_id.decode(located),
+        table.name.decode(located),
+        table.installation_type.decode(located),
+        table.capacity_kw[located].tolist(),
+        table.commissioning_date[located].astype(str).tolist(),
+        table.voivodeship.decode(located),
+        table.municipality.decode(located),
+        table.status.decode(located),
+        table.latitude[located].tolist(),
+        table.longitude[located].tolist(),
+    )
+    for (
+        installation_id,
+        name,
+        installation_type,
+        capacity_kw,
+        commissioned,
+        voivodeship,
+        municipality,
+        status,
+        lat,
+        lon,
+    ) in columns:
+        yield {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "installation_id": installation_id,
+                "name": name,
+                "installation_type": installation_type,
+                "capacity_kw": capacity_kw,
+                "commissioning_date": commissioned,
+                "voivodeship": voivodeship,
+                "municipality": municipality,
+                "status": status,
+            },
+        }
+
+
+_COLLECTION_START = '{"type": "FeatureCollection", "features": ['
+_COLLECTION_END = "]}"
+
+
+def iter_geojson(features: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield a GeoJSON FeatureCollection as text fragments, one feature at a time."""
+    yield _COLLECTION_START
+    separator = ""
+    for feature in features:
+        yield separator + json.dumps(feature, ensure_ascii=False)
+        separator = ", "
+    yield _COLLECTION_END
+
+
+def write_geojson(features: Iterable[Dict[str, Any]], handle: TextIO) -> int:
+    """Stream features as a GeoJSON FeatureCollection to a text handle; return number of features written."""
+    fragments = 0
+    for fragment in iter_geojson(features):
+        handle.write(fragment)
+        fragments += 1
+    return fragments - 2  # Collection start and end
+
+
+def mercator(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Project coordinates onto the unit Web Mercator square as an (N, 2) array of x, y in [0, 1)."""
+    lat = np.radians(np.clip(latitudes, -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(longitudes, dtype=np.float64) + 180.0) / 360.0
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0
+    projected: np.ndarray = np.clip(np.column_stack([x, y]), 0.0, np.nextafter(1.0, 0.0))
+    return projected
+
+
+@dataclass(eq=False)
+class ClusterLevel:
+    """Grid clusters of one zoom level with installation count, capacity and centroid per cell."""
+
+    zoom: int
+    cell_x: np.ndarray
+    cell_y: np.ndarray
+    count: np.ndarray
+    capacity_kw: np.ndarray
+    latitude_sum: np.ndarray
+    longitude_sum: np.ndarray
+
+    def __len__(self) -> int:
+        """Return number of clusters."""
+        return len(self.count)
+
+    @property
+    def latitude(self) -> np.ndarray:
+        """Return cluster centroid latitudes."""
+        centroid: np.ndarray = self.latitude_sum / self.count
+        return centroid
+
+    @property
+    def longitude(self) -> np.ndarray:
+        """Return cluster centroid longitudes."""
+        centroid: np.ndarray = self.longitude_sum / self.count
+        return centroid
+
+    def coarsen(self) -> "ClusterLevel":
+        """Merge 2×2 blocks of cells into the clusters of the next lower zoom level."""
+        cell_x = self.cell_x >> 1
+        cell_y = self.cell_y >> 1
+        keys, inverse = np.unique((cell_x << 32) | cell_y, return_inverse=True)
+        size = len(keys)
+        return ClusterLevel(
+            zoom=self.zoom - 1,
+            cell_x=keys >> 32,
+            cell_y=keys & 0xFFFFFFFF,
+            count=np.bincount(inverse, weights=self.count, minlength=size).astype(np.int64),
+            capacity_kw=np.bincount(inverse, weights=self.capacity_kw, minlength=size),
+            latitude_sum=np.bincount(inverse, weights=self.latitude_sum, minlength=size),
+            longitude_sum=np.bincount(inverse, weights=self.longitude_sum, minlength=size),
+        )
+
+    def features(self, bbox: Optional[List[float]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield clusters as GeoJSON point features, optionally within [min_lon, min_lat, max_lon, max_lat]."""
+        latitudes = self.latitude
+        longitudes = self.longitude
+        selected = np.ones(len(self), dtype=bool)
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            selected = (
+                (latitudes >= min_lat) & (latitudes <= max_lat) & (longitudes >= min_lon) & (longitudes <= max_lon)
+            )
+        positions = np.flatnonzero(selected)
+        for lat, lon, count, capacity in zip(
+            latitudes[positions].tolist(),
+            longitudes[positions].tolist(),
+            self.count[positions].tolist(),
+            self.capacity_kw[positions].tolist(),
+        ):
+            yield {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"zoom": self.zoom, "count": count, "capacity_kw": capacity},
+            }
+
+
+class ClusterPyramid:
+    """Grid clusters of installations precomputed for every zoom level.
+
+    Clusters at ``max_zoom`` are cells of ``cells_per_tile`` × ``cells_per_tile``
+    per Web Mercator tile; every lower level merges 2×2 cells of the level above,
+    so the whole pyramid costs one pass over the points plus one pass per level
+    over the (much fewer) clusters.
+    """
+
+    def __init__(self, levels: Dict[int, ClusterLevel]):
+        """Initialize pyramid from levels keyed by zoom."""
+        self.levels = levels
+        self.min_zoom = min(levels)
+        self.max_zoom = max(levels)
+
+    @classmethod
+    def build(
+        cls, table: InstallationTable, min_zoom: int = 0, max_zoom: int = 16, cells_per_tile: int = 8
+    ) -> "ClusterPyramid":
+        """Cluster installations with coordinates at zoom levels from min_zoom to max_zoom.
+
+        Cell x and y are packed into one int64 key, so ``(1 << max_zoom) * cells_per_tile``
+        may not exceed ``2**31`` cells per axis.
+        """
+        if (
+            not 0 <= min_zoom <= max_zoom
+            or cells_per_tile < 1
+            or cells_per_tile & (cells_per_tile - 1)
+            or (1 << max_zoom) * cells_per_tile > 1 << 31
+        ):
+            raise ValueError(
+                "Zoom levels must satisfy 0 <= min_zoom <= max_zoom, cells_per_tile a power of two"
+                " and (1 << max_zoom) * cells_per_tile <= 2**31"
+            )
+        located = _located(table)
+        latitudes = table.latitude[located]
+        longitudes = table.longitude[located]
+        cells = np.floor(mercator(latitudes, longitudes) * ((1 << max_zoom) * cells_per_tile)).astype(np.int64)
+        keys, inverse = np.unique((cells[:, 0] << 32) | cells[:, 1], return_inverse=True)
+        size = len(keys)
+
+        level = ClusterLevel(
+            zoom=max_zoom,
+            cell_x=keys >> 32,
+            cell_y=keys & 0xFFFFFFFF,
+            count=np.bincount(inverse, minlength=size),
+            capacity_kw=np.bincount(inverse, weights=table.capacity_kw[located], minlength=size),
+            latitude_sum=np.bincount(inverse, weights=latitudes, minlength=size),
+            longitude_sum=np.bincount(inverse, weights=longitudes, minlength=size),
+        )
+        levels = {max_zoom: level}
+        for _ in range(max_zoom - min_zoom):
+            level = level.coarsen()
+            levels[level.zoom] = level
+        return cls(levels)
+
+    def level(self, zoom: int) -> ClusterLevel:
+        """Return clusters of a zoom level, clamped to the precomputed range."""
+        return self.levels[min(max(zoom, self.min_zoom), self.max_zoom)]
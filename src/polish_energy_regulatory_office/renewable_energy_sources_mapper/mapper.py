@@ -3,19 +3,196 @@ Main mapper class for renewable energy sources analysis.
 """
 
 from datetime import date
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
 
-from .models import InstallationType, RegionalData, RenewableInstallation
+from .aggregates import RegistryAggregates
+from .cube import CapacityCube
+from .geospatial import ClusterPyramid, iter_geojson_features, write_geojson
+from .models import CapacityGrowthAnalysis, InstallationType, RegionalData, RenewableInstallation
+from .query import InstallationCursor, InstallationQuery, TableIndex
 from .scrapers import RESRegistryScraper
-from .utils import calculate_capacity_growth, generate_geospatial_data
+from .snapshot import SnapshotStore
+from .spatial import SpatialIndex
+from .sync import RegistryDiff, diff_tables
+from .table import InstallationTable
+from .utils import (
+    analyze_installation_trends,
+    calculate_capacity_growth,
+    find_optimal_locations,
+    generate_geospatial_data,
+)
 
 
 class RenewableEnergyMapper:
-    """Main class for mapping and analyzing renewable energy sources."""
+    """Main class for mapping and analyzing renewable energy sources.
 
-    def __init__(self, timeout: int = 30):
-        """Initialize the mapper with a registry scraper."""
+    The registry is fetched once into a columnar ``InstallationTable``; queries run
+    as vectorized masks over it and reports read from ``RegistryAggregates``
+    computed in a single pass, until ``refresh`` is called.
+
+    With a ``snapshot_store`` the table is memory-mapped from the newest local
+    snapshot (or the newest one taken on or before ``snapshot_date``) instead of
+    being scraped; an empty store is seeded with a live scrape.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        snapshot_store: Optional[SnapshotStore] = None,
+        snapshot_date: Optional[date] = None,
+    ):
+        """Initialize the mapper with a registry scraper and optional snapshot store."""
         self.scraper = RESRegistryScraper(timeout=timeout)
+        self.snapshot_store = snapshot_store
+        self.snapshot_date = snapshot_date
+        self._table: Optional[InstallationTable] = None
+        self._aggregates: Optional[RegistryAggregates] = None
+        self._capacity_cube: Optional[CapacityCube] = None
+        self._table_index: Optional[TableIndex] = None
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._pyramids: Dict[Optional[InstallationType], ClusterPyramid] = {}
+
+    @property
+    def table(self) -> InstallationTable:
+        """Return the registry as a columnar table, loading it on first use."""
+        if self._table is None:
+            self._table = self._load_table()
+        return self._table
+
+    @property
+    def table_index(self) -> TableIndex:
+        """Return predicate indexes over the registry table, built on first use."""
+        if self._table_index is None:
+            self._table_index = TableIndex(self.table)
+        return self._table_index
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Return spatial index over installation coordinates, built on first use."""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.table.latitude, self.table.longitude)
+        return self._spatial_index
+
+    def save_snapshot(self, snapshot_date: Optional[date] = None) -> Path:
+        """Scrape the registry, store it as a snapshot and use it as the current table.
+
+        An incomplete crawl raises ``IncompleteCrawlError`` and leaves the store and table untouched.
+        """
+        if self.snapshot_store is None:
+            raise ValueError("Mapper has no snapshot store")
+        table = self._scrape_table()
+        path = self.snapshot_store.save(table, snapshot_date)
+        self._table = table
+        self._aggregates = None
+        self._capacity_cube = None
+        self._clear_indexes()
+        return path
+
+    @property
+    def aggregates(self) -> RegistryAggregates:
+        """Return report aggregates of the registry table, computed on first use."""
+        if self._aggregates is None:
+            self._aggregates = RegistryAggregates.from_table(self.table)
+        return self._aggregates
+
+    @property
+    def capacity_cube(self) -> CapacityCube:
+        """Return cumulative capacity cube of the registry table, computed on first use."""
+        if self._capacity_cube is None:
+            self._capacity_cube = CapacityCube.from_table(self.table)
+        return self._capacity_cube
+
+    def sync(self) -> RegistryDiff:
+        """Scrape the registry and diff it against the current table by installation_id.
+
+        The changes are applied to the cached aggregates and capacity cube instead
+        of recomputing them, and the scraped table becomes current (and the snapshot of today
+        when a snapshot store is configured). An incomplete crawl raises
+        ``IncompleteCrawlError`` before anything is diffed or applied.
+
+        The baseline is the current table, or the snapshot it would be loaded
+        from; without either the scrape is the initial load and every
+        installation is reported as added.
+        """
+        previous = self._baseline_table()
+        current = self._scrape_table()
+        diff = diff_tables(previous, current)
+        if self._aggregates is not None:
+            self._aggregates.apply_diff(diff)
+        if self._capacity_cube is not None:
+            self._capacity_cube.apply_diff(diff)
+        self._table = current
+        self._clear_indexes()
+        if self.snapshot_store is not None:
+            self.snapshot_store.save(current)
+        return diff
+
+    def refresh(self) -> InstallationTable:
+        """Reload the registry (scraping it, or reading the newest matching snapshot) and return the table.
+
+        The current table and caches are kept if loading fails, e.g. on an incomplete crawl.
+        """
+        table = self._load_table()
+        self._table = table
+        self._aggregates = None
+        self._capacity_cube = None
+        self._clear_indexes()
+        return table
+
+    def _clear_indexes(self) -> None:
+        """Drop predicate and spatial indexes and cluster pyramids built over a replaced table."""
+        self._table_index = None
+        self._spatial_index = None
+        self._pyramids.clear()
+
+    def _load_table(self) -> InstallationTable:
+        """Load registry table from the snapshot store or, without one, from a live scrape."""
+        if self.snapshot_store is None:
+            return self._scrape_table()
+        if self.snapshot_date is None and self.snapshot_store.latest() is None:
+            table = self._scrape_table()
+            self.snapshot_store.save(table)
+            return table
+        return self.snapshot_store.load(self.snapshot_date)
+
+    def _baseline_table(self) -> InstallationTable:
+        """Return the table to sync against without scraping: loaded, from a snapshot, or empty."""
+        if self._table is not None:
+            return self._table
+        if self.snapshot_store is not None and (
+            self.snapshot_date is not None or self.snapshot_store.latest() is not None
+        ):
+            return self.table
+        return InstallationTable.from_installations([])
+
+    def _scrape_table(self) -> InstallationTable:
+        """Fetch the live registry into a columnar table, raising ``IncompleteCrawlError`` for a partial crawl."""
+        return InstallationTable.from_installations(self.scraper.fetch_installations())
+
+    def query(
+        self,
+        voivodeship: Optional[str] = None,
+        municipality: Optional[str] = None,
+        installation_type: Optional[InstallationType] = None,
+        status: Optional[str] = None,
+        min_capacity_kw: Optional[float] = None,
+        max_capacity_kw: Optional[float] = None,
+        page_size: int = 100,
+    ) -> InstallationCursor:
+        """Find installations matching all given predicates, returning a paginated cursor.
+
+        Predicates are answered from indexes over the table; municipality matches ignoring case.
+        """
+        query = InstallationQuery(
+            voivodeship=voivodeship,
+            municipality=municipality,
+            installation_type=installation_type,
+            status=status,
+            min_capacity_kw=min_capacity_kw,
+            max_capacity_kw=max_capacity_kw,
+        )
+        return InstallationCursor(self.table, query.positions(self.table_index), page_size)
 
     def get_installations_by_region(
         self,
@@ -23,107 +200,103 @@ class RenewableEnergyMapper:
         installation_type: Optional[InstallationType] = None,
     ) -> List[RenewableInstallation]:
         """Get installations filtered by region and/or type."""
-        installations = self.scraper.fetch_installations(voivodeship=voivodeship)
-
-        if installation_type:
-            installations = [inst for inst in installations if inst.installation_type == installation_type]
-
-        return installations
+        return list(self.query(voivodeship=voivodeship, installation_type=installation_type))
 
     def get_installations_by_municipality(self, municipality: str, voivodeship: str) -> List[RenewableInstallation]:
         """Get installations for a specific municipality."""
-        installations = self.get_installations_by_region(voivodeship=voivodeship)
-        return [inst for inst in installations if inst.municipality.lower() == municipality.lower()]
+        return list(self.query(voivodeship=voivodeship, municipality=municipality))
+
+    def find_installations_near(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> List[RenewableInstallation]:
+        """Get installations within radius_km of a point, nearest first."""
+        positions, _ = self.spatial_index.query_radius(latitude, longitude, radius_km)
+        return self.table.to_installations(positions)
 
-    def analyze_capacity_trends(self) -> Dict[str, float]:
-        """Analyze capacity growth trends across all installations."""
-        installations = self.scraper.fetch_installations()
-        return calculate_capacity_growth(installations)
+    def find_nearest_installations(self, latitude: float, longitude: float, k: int = 1) -> List[RenewableInstallation]:
+        """Get the k installations nearest to a point, nearest first."""
+        positions, _ = self.spatial_index.nearest(latitude, longitude, k)
+        return self.table.to_installations(positions)
+
+    def find_installations_in_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> List[RenewableInstallation]:
+        """Get installations inside a latitude/longitude bounding box."""
+        return self.table.to_installations(self.spatial_index.query_bbox(min_lat, min_lon, max_lat, max_lon))
+
+    def find_optimal_locations(self, candidate_locations: List[Any], min_distance_km: float = 5.0) -> List[Any]:
+        """Get candidate locations at least min_distance_km away from every registered installation."""
+        return find_optimal_locations(self.table, candidate_locations, min_distance_km)
+
+    def analyze_capacity_trends(
+        self, period_start: Optional[date] = None, period_end: Optional[date] = None
+    ) -> Dict[str, float]:
+        """Analyze installed capacity and its growth over a period (by default the registry's last twelve months)."""
+        return calculate_capacity_growth(self.capacity_cube, period_start, period_end)
+
+    def analyze_installation_trends(
+        self,
+        period_start: Optional[date] = None,
+        period_end: Optional[date] = None,
+        voivodeship: Optional[str] = None,
+    ) -> CapacityGrowthAnalysis:
+        """Analyze installations commissioned in a period, optionally within one voivodeship."""
+        return analyze_installation_trends(self.capacity_cube, period_start, period_end, voivodeship)
 
     def generate_regional_statistics(self) -> Dict[str, RegionalData]:
         """Generate statistics for each voivodeship."""
-        installations = self.scraper.fetch_installations()
-        regional_stats = {}
-
-        by_voivodeship: Dict[str, List[RenewableInstallation]] = {}
-        for inst in installations:
-            if inst.voivodeship not in by_voivodeship:
-                by_voivodeship[inst.voivodeship] = []
-            by_voivodeship[inst.voivodeship].append(inst)
-
-        for voivodeship, inst_list in by_voivodeship.items():
-            total_capacity = sum(inst.capacity_kw for inst in inst_list)
-            installation_count = len(inst_list)
-
-            type_distribution = {}
-            for inst_type in InstallationType:
-                type_count = len([inst for inst in inst_list if inst.installation_type == inst_type])
-                type_distribution[inst_type.value] = type_count
-
-            regional_stats[voivodeship] = RegionalData(
-                voivodeship=voivodeship,
-                total_capacity_kw=total_capacity,
-                installation_count=installation_count,
-                type_distribution=type_distribution,
-            )
-
-        return regional_stats
-
-    def create_geospatial_map(self, installation_type: Optional[InstallationType] = None) -> Dict[str, Any]:
-        """Create geospatial data for mapping installations."""
-        installations = self.get_installations_by_region(installation_type=installation_type)
-        geospatial_data = generate_geospatial_data(installations)
-        return {"geospatial_points": geospatial_data}
+        return self.aggregates.regional_statistics()
+
+    def cluster_pyramid(self, installation_type: Optional[InstallationType] = None) -> ClusterPyramid:
+        """Return per-zoom clusters of installations of a type (all by default), built once per type."""
+        pyramid = self._pyramids.get(installation_type)
+        if pyramid is None:
+            table = self.table
+            if installation_type is not None:
+                table = table.take(table.mask(installation_type=installation_type))
+            pyramid = self._pyramids[installation_type] = ClusterPyramid.build(table)
+        return pyramid
+
+    def create_geospatial_map(
+        self,
+        installation_type: Optional[InstallationType] = None,
+        zoom: Optional[int] = None,
+        bbox: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """Create geospatial data for mapping installations.
+
+        Without ``zoom`` every located installation is returned as a point. With
+        ``zoom`` the precomputed clusters of that level are returned as GeoJSON
+        features, optionally limited to ``bbox`` (min_lon, min_lat, max_lon, max_lat).
+        """
+        if zoom is None:
+            table = self.table
+            geospatial_data = generate_geospatial_data(table.take(table.mask(installation_type=installation_type)))
+            return {"geospatial_points": geospatial_data}
+        level = self.cluster_pyramid(installation_type).level(zoom)
+        return {"zoom": level.zoom, "clusters": list(level.features(bbox))}
+
+    def export_geojson(self, handle: TextIO, installation_type: Optional[InstallationType] = None) -> int:
+        """Stream located installations to a text handle as GeoJSON; return number of features written."""
+        table = self.table
+        if installation_type is not None:
+            table = table.take(table.mask(installation_type=installation_type))
+        return write_geojson(iter_geojson_features(table), handle)
 
     def get_top_municipalities(self, limit: int = 10, sort_by: str = "capacity") -> List[Dict[str, Any]]:
         """Get top municipalities by capacity or installation count."""
-        installations = self.scraper.fetch_installations()
-
-        by_municipality: Dict[Tuple[str, str], List[RenewableInstallation]] = {}
-        for inst in installations:
-            key = (inst.municipality, inst.voivodeship)
-            if key not in by_municipality:
-                by_municipality[key] = []
-            by_municipality[key].append(inst)
-
-        municipality_stats = []
-        for (municipality, voivodeship), inst_list in by_municipality.items():
-            total_capacity = sum(inst.capacity_kw for inst in inst_list)
-            municipality_stats.append(
-                {
-                    "municipality": municipality,
-                    "voivodeship": voivodeship,
-                    "total_capacity_kw": total_capacity,
-                    "installation_count": len(inst_list),
-                }
-            )
-
-        if sort_by == "capacity":
-            municipality_stats.sort(key=lambda x: x["total_capacity_kw"], reverse=True)
-        else:
-            municipality_stats.sort(key=lambda x: x["installation_count"], reverse=True)
-
-        return municipality_stats[:limit]
+        return self.aggregates.top_municipalities(limit=limit, sort_by=sort_by)
 
     def generate_summary_report(self) -> Dict[str, Any]:
         """Generate a comprehensive summary report."""
-        installations = self.scraper.fetch_installations()
-
-        total_capacity = sum(inst.capacity_kw for inst in installations)
-        total_count = len(installations)
-
-        by_type = {}
-        for inst_type in InstallationType:
-            type_installations = [inst for inst in installations if inst.installation_type == inst_type]
-            by_type[inst_type.value] = {
-                "count": len(type_installations),
-                "capacity_kw": sum(inst.capacity_kw for inst in type_installations),
-            }
+        aggregates = self.aggregates
+        total_capacity = aggregates.total_capacity_kw
+        total_count = aggregates.installation_count
 
         return {
             "total_installations": total_count,
             "total_capacity_kw": total_capacity,
             "average_capacity_per_installation": (total_capacity / total_count if total_count > 0 else 0),
-            "by_type": by_type,
+            "by_type": aggregates.by_type(),
             "report_date": date.today().isoformat(),
         }
@@ -2,10 +2,24 @@
 Data models for renewable energy sources mapping.
 """
 
-from dataclasses import dataclass
-from datetime import date
+import sys
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+# The registry lists hydro plants commissioned long before the RES support schemes
+EARLIEST_COMMISSIONING_DATE = date(1900, 1, 1)
+
+
+def plausible_commissioning_date(day: date, earliest: date = EARLIEST_COMMISSIONING_DATE) -> bool:
+    """Return whether a commissioning date lies between earliest and one year from today.
+
+    Cohorts and capacity cubes keep one row per day or month of the registry's
+    date range, so a mistyped year such as ``0001-01-01`` would otherwise
+    allocate centuries of rows.
+    """
+    return earliest <= day <= date.today() + timedelta(days=366)
 
 
 class InstallationType(Enum):
@@ -43,6 +57,12 @@ class RenewableInstallation:
         if not self.installation_id:
             raise ValueError("Installation ID is required")
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return fields as a dictionary accepted by ``from_dict``."""
+        values = {field.name: getattr(self, field.name) for field in fields(self)}
+        values["installation_type"] = self.installation_type.value
+        return values
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "RenewableInstallation":
         """Create RenewableInstallation from dictionary data."""
@@ -62,6 +82,158 @@ class RenewableInstallation:
         )
 
 
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a categorical string so equal values share one object."""
+    return None if value is None else sys.intern(value)
+
+
+class CompactInstallation:
+    """Memory-compact RenewableInstallation.
+
+    Attributes live in ``__slots__`` instead of a per-instance ``__dict__`` and the
+    categorical strings (voivodeship, municipality, operator, technology, status)
+    are interned, so repeated values are stored once. ``from_records`` validates a
+    whole batch up front and then builds objects without per-row checks.
+    """
+
+    __slots__ = tuple(field.name for field in fields(RenewableInstallation))
+
+    installation_id: str
+    name: str
+    installation_type: InstallationType
+    capacity_kw: float
+    commissioning_date: date
+    voivodeship: str
+    municipality: str
+    operator: str
+    technology: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    status: str
+
+    def __init__(
+        self,
+        installation_id: str,
+        name: str,
+        installation_type: InstallationType,
+        capacity_kw: float,
+        commissioning_date: date,
+        voivodeship: str,
+        municipality: str,
+        operator: str,
+        technology: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        status: str = "active",
+    ):
+        """Initialize and validate a single installation."""
+        if capacity_kw < 0:
+            raise ValueError("Capacity cannot be negative")
+        if not installation_id:
+            raise ValueError("Installation ID is required")
+        self.installation_id = installation_id
+        self.name = name
+        self.installation_type = installation_type
+        self.capacity_kw = capacity_kw
+        self.commissioning_date = commissioning_date
+        self.voivodeship = sys.intern(voivodeship)
+        self.municipality = sys.intern(municipality)
+        self.operator = sys.intern(operator)
+        self.technology = _intern(technology)
+        self.latitude = latitude
+        self.longitude = longitude
+        self.status = sys.intern(status)
+
+    def __repr__(self) -> str:
+        """Return representation listing all fields."""
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"CompactInstallation({values})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field with another compact installation."""
+        if not isinstance(other, CompactInstallation):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> List["CompactInstallation"]:
+        """Build installations from ``from_dict``-style records, validating the batch before building any.
+
+        Raises ValueError naming the first invalid row.
+        """
+        types: Dict[Any, InstallationType] = {}
+        for row, record in enumerate(records):
+            if not record["installation_id"]:
+                raise ValueError(f"Installation ID is required (row {row})")
+            if float(record["capacity_kw"]) < 0:
+                raise ValueError(f"Capacity cannot be negative (row {row})")
+            if record["installation_type"] not in types:
+                types[record["installation_type"]] = InstallationType(record["installation_type"])
+
+        new = object.__new__
+        installations = []
+        for record in records:
+            installation = new(cls)
+            installation.installation_id = record["installation_id"]
+            installation.name = record["name"]
+            installation.installation_type = types[record["installation_type"]]
+            installation.capacity_kw = float(record["capacity_kw"])
+            installation.commissioning_date = record["commissioning_date"]
+            installation.voivodeship = sys.intern(record["voivodeship"])
+            installation.municipality = sys.intern(record["municipality"])
+            installation.operator = sys.intern(record["operator"])
+            installation.technology = _intern(record.get("technology"))
+            installation.latitude = record.get("latitude")
+            installation.longitude = record.get("longitude")
+            installation.status = sys.intern(record.get("status", "active"))
+            installations.append(installation)
+        return installations
+
+    @classmethod
+    def from_installations(
+        cls, installations: Iterable[Union[RenewableInstallation, "CompactInstallation"]]
+    ) -> List["CompactInstallation"]:
+        """Convert already validated installations without re-checking them.
+
+        Attributes are copied straight from the objects, so no per-row records or
+        checks are made.
+        """
+        new = object.__new__
+        compact = []
+        for inst in installations:
+            installation = new(cls)
+            installation.installation_id = inst.installation_id
+            installation.name = inst.name
+            installation.installation_type = inst.installation_type
+            installation.capacity_kw = inst.capacity_kw
+            installation.commissioning_date = inst.commissioning_date
+            installation.voivodeship = sys.intern(inst.voivodeship)
+            installation.municipality = sys.intern(inst.municipality)
+            installation.operator = sys.intern(inst.operator)
+            installation.technology = _intern(inst.technology)
+            installation.latitude = inst.latitude
+            installation.longitude = inst.longitude
+            installation.status = sys.intern(inst.status)
+            compact.append(installation)
+        return compact
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return fields as a dictionary accepted by ``from_records`` and ``RenewableInstallation.from_dict``."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values["installation_type"] = self.installation_type.value
+        return values
+
+    def to_installation(self) -> RenewableInstallation:
+        """Return an equivalent regular RenewableInstallation."""
+        return RenewableInstallation(*self._values())
+
+    def _values(self) -> Tuple[Any, ...]:
+        """Return field values in declaration order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
 @dataclass
 class RegionalData:
     """Regional statistics for renewable energy installations."""
@@ -0,0 +1,171 @@
+"""
+Indexed installation queries with paginated results.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ..columns import CategoricalColumn
+from .models import InstallationType, RenewableInstallation
+from .table import InstallationTable
+
+
+class PostingIndex:
+    """Row positions of a categorical column grouped by normalized category.
+
+    Rows are sorted once by group, so the rows of a value are one contiguous,
+    ascending slice found by a dictionary lookup.
+    """
+
+    def __init__(self, column: CategoricalColumn, normalize: Callable[[str], str] = str):
+        """Build index of a column, grouping categories that normalize to the same key."""
+        self.normalize = normalize
+        groups: Dict[str, int] = {}
+        group_of_code = np.array(
+            [groups.setdefault(normalize(category), len(groups)) for category in column.categories] + [len(groups)],
+            dtype=np.int64,
+        )
+        keys = group_of_code[column.codes]  # Missing values (-1) fall into a trailing unnamed group
+        self.positions = np.argsort(keys, kind="stable")
+        bounds = np.searchsorted(keys[self.positions], np.arange(len(groups) + 1))
+        self._slices = {key: (int(bounds[group]), int(bounds[group + 1])) for key, group in groups.items()}
+        self._codes = {
+            key: np.flatnonzero(group_of_code[:-1] == group).astype(np.int32) for key, group in groups.items()
+        }
+
+    def rows(self, value: str) -> np.ndarray:
+        """Return ascending positions of rows matching value."""
+        start, stop = self._slices.get(self.normalize(value), (0, 0))
+        rows: np.ndarray = self.positions[start:stop]
+        return rows
+
+    def codes(self, value: str) -> np.ndarray:
+        """Return category codes matching value."""
+        return self._codes.get(self.normalize(value), np.zeros(0, dtype=np.int32))
+
+
+class TableIndex:
+    """Posting indexes over the filterable columns of an installation table plus a capacity sort order.
+
+    Municipalities are indexed case-insensitively, so lookups never normalize
+    strings per row or per category.
+    """
+
+    def __init__(self, table: InstallationTable):
+        """Build indexes of a table."""
+        self.table = table
+        self.voivodeship = PostingIndex(table.voivodeship)
+        self.municipality = PostingIndex(table.municipality, str.casefold)
+        self.installation_type = PostingIndex(table.installation_type)
+        self.status = PostingIndex(table.status)
+        self._by_capacity = np.argsort(table.capacity_kw, kind="stable")
+        self._sorted_capacity = table.capacity_kw[self._by_capacity]
+
+    def capacity_range(self, min_capacity_kw: Optional[float], max_capacity_kw: Optional[float]) -> np.ndarray:
+        """Return ascending positions of rows with capacity within the inclusive range."""
+        lower = 0 if min_capacity_kw is None else int(np.searchsorted(self._sorted_capacity, min_capacity_kw, "left"))
+        upper = len(self._sorted_capacity)
+        if max_capacity_kw is not None:
+            upper = int(np.searchsorted(self._sorted_capacity, max_capacity_kw, "right"))
+        return np.sort(self._by_capacity[lower:upper])
+
+
+@dataclass(frozen=True)
+class InstallationQuery:
+    """Conjunction of installation predicates; municipality matches ignoring case."""
+
+    voivodeship: Optional[str] = None
+    municipality: Optional[str] = None
+    installation_type: Optional[InstallationType] = None
+    status: Optional[str] = None
+    min_capacity_kw: Optional[float] = None
+    max_capacity_kw: Optional[float] = None
+
+    def positions(self, index: TableIndex) -> np.ndarray:
+        """Return ascending positions of matching rows.
+
+        The most selective indexed predicate yields the candidate rows and the
+        remaining predicates are checked on those candidates only.
+        """
+        table = index.table
+        postings = []
+        checks = []
+        for posting, column, value in (
+            (index.voivodeship, table.voivodeship, self.voivodeship),
+            (index.municipality, table.municipality, self.municipality),
+            (index.installation_type, table.installation_type, self._type_value),
+            (index.status, table.status, self.status),
+        ):
+            if value is not None:
+                postings.append(posting.rows(value))
+                checks.append((column, posting.codes(value)))
+        has_capacity_range = self.min_capacity_kw is not None or self.max_capacity_kw is not None
+
+        if not postings:
+            if has_capacity_range:
+                return index.capacity_range(self.min_capacity_kw, self.max_capacity_kw)
+            return np.arange(len(table))
+
+        best = min(range(len(postings)), key=lambda position: len(postings[position]))
+        candidates = postings[best]
+        selected = np.ones(len(candidates), dtype=bool)
+        for position, (column, codes) in enumerate(checks):
+            if position != best:
+                selected &= np.isin(column.codes[candidates], codes)
+        if has_capacity_range:
+            capacities = table.capacity_kw[candidates]
+            if self.min_capacity_kw is not None:
+                selected &= capacities >= self.min_capacity_kw
+            if self.max_capacity_kw is not None:
+                selected &= capacities <= self.max_capacity_kw
+        matched: np.ndarray = candidates[selected]
+        return matched
+
+    @property
+    def _type_value(self) -> Optional[str]:
+        """Return installation type predicate as its category string."""
+        return None if self.installation_type is None else self.installation_type.value
+
+
+class InstallationCursor:
+    """Query result over a table, materializing installations one page at a time."""
+
+    def __init__(self, table: InstallationTable, positions: np.ndarray, page_size: int = 100):
+        """Initialize cursor over matching row positions."""
+        if page_size < 1:
+            raise ValueError("Page size must be positive")
+        self.table = table
+        self.positions = positions
+        self.page_size = page_size
+
+    def __len__(self) -> int:
+        """Return number of matching installations."""
+        return len(self.positions)
+
+    @property
+    def page_count(self) -> int:
+        """Return number of pages."""
+        return -(-len(self.positions) // self.page_size)
+
+    def fetch(self, offset: int = 0, limit: Optional[int] = None) -> List[RenewableInstallation]:
+        """Return up to limit (by default page_size) installations starting at offset."""
+        limit = self.page_size if limit is None else limit
+        return self.table.to_installations(self.positions[offset : offset + limit])
+
+    def page(self, number: int) -> List[RenewableInstallation]:
+        """Return installations of a 1-based page number."""
+        if number < 1:
+            raise ValueError("Page numbers start at 1")
+        return self.fetch((number - 1) * self.page_size)
+
+    def pages(self) -> Iterator[List[RenewableInstallation]]:
+        """Yield all pages in order."""
+        for offset in range(0, len(self.positions), self.page_size):
+            yield self.fetch(offset)
+
+    def __iter__(self) -> Iterator[RenewableInstallation]:
+        """Yield matching installations, materializing one page at a time."""
+        for page in self.pages():
+            yield from page
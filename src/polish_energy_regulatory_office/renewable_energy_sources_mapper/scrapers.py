@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
-from .models import InstallationType, RenewableInstallation
+from ..parsers import Content, TableParser, declared_charset, get_table_parser, stream_rows
+from .crawl import CrawlResult, IncompleteCrawlError, RegistryCrawler
+from .models import InstallationType, RenewableInstallation, plausible_commissioning_date
+from .sync import RegistryDiff, diff_tables
+from .table import InstallationTable
 
 
 class RESRegistryScraper:
@@ -24,10 +29,28 @@ class RESRegistryScraper:
         ),
     }
 
-    def __init__(self, timeout: int = 30):
-        """Initialize scraper with configuration."""
+    def __init__(
+        self,
+        timeout: int = 30,
+        parser: Optional[TableParser] = None,
+        max_workers: int = 8,
+        requests_per_second: float = 2.0,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        checkpoint_max_age: Optional[float] = 24 * 3600.0,
+    ):
+        """Initialize scraper with configuration and HTML table parser backend.
+
+        ``max_workers`` and ``requests_per_second`` bound the registry crawl's
+        thread pool and per-host request rate; with ``checkpoint_path`` an
+        interrupted crawl resumes where it stopped, if it started at most
+        ``checkpoint_max_age`` seconds ago.
+        """
         self.timeout = timeout
+        self.parser = parser or get_table_parser()
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -41,16 +64,42 @@ class RESRegistryScraper:
                 "Connection": "keep-alive",
             }
         )
+        self.crawler = RegistryCrawler(
+            self,
+            max_workers=max_workers,
+            requests_per_second=requests_per_second,
+            checkpoint_path=checkpoint_path,
+            checkpoint_max_age=checkpoint_max_age,
+        )
 
     def fetch_installations(
         self,
         installation_type: Optional[InstallationType] = None,
         voivodeship: Optional[str] = None,
     ) -> List[RenewableInstallation]:
-        """Fetch renewable energy installations from the registry."""
-        # This is a placeholder implementation
-        # In a real implementation, this would scrape the actual website
-        return []
+        """Fetch renewable energy installations from the registry.
+
+        Raises ``IncompleteCrawlError`` (carrying the partial ``CrawlResult``) when
+        any page failed, so a partial crawl is never taken for the whole registry;
+        resuming from a checkpoint refetches only the failed pages. The registry
+        has no type parameter, so ``installation_type`` filters the crawled
+        installations client-side.
+        """
+        result = self.crawl(voivodeships=[voivodeship] if voivodeship else None)
+        if not result.is_complete:
+            raise IncompleteCrawlError(result)
+        if installation_type is None:
+            return result.installations
+        return [inst for inst in result.installations if inst.installation_type == installation_type]
+
+    def crawl(self, voivodeships: Optional[Sequence[str]] = None) -> CrawlResult:
+        """Crawl every registry page of the given voivodeships (all by default), reporting failed pages."""
+        return self.crawler.crawl(voivodeships)
+
+    def sync(self, previous: InstallationTable) -> Tuple[InstallationTable, RegistryDiff]:
+        """Fetch the registry and diff it against a previous snapshot table by installation_id."""
+        current = InstallationTable.from_installations(self.fetch_installations())
+        return current, diff_tables(previous, current)
 
     def fetch_installation_details(self, installation_id: str) -> Dict[str, Any]:
         """Fetch detailed information for a specific installation."""
@@ -116,35 +165,81 @@ class RESRegistryScraper:
     def _parse_html_installations(self, html_content: str) -> List[RenewableInstallation]:
         """Parse installations from HTML response."""
         installations = []
-        soup = BeautifulSoup(html_content, "html.parser")
 
-        # Find table rows or other structured data
-        rows = soup.find_all("tr")
-
-        for row in rows[1:]:  # Skip header row
-            cells = row.find_all("td")
-            if len(cells) >= 8:
-                try:
-                    installation_data = {
-                        "installation_id": cells[0].get_text(strip=True),
-                        "name": cells[1].get_text(strip=True),
-                        "installation_type": "solar_pv",
-                        "capacity_kw": float(cells[2].get_text(strip=True).replace(",", ".")),
-                        "commissioning_date": datetime.strptime(cells[3].get_text(strip=True), "%Y-%m-%d").date(),
-                        "voivodeship": cells[4].get_text(strip=True),
-                        "municipality": cells[5].get_text(strip=True),
-                        "operator": cells[6].get_text(strip=True),
-                        "status": cells[7].get_text(strip=True),
-                    }
-
-                    installation = RenewableInstallation.from_dict(installation_data)
-                    installations.append(installation)
-                except (ValueError, IndexError):
-                    # Log parsing error and continue
-                    continue
+        for cells in self._extract_data_rows(html_content):
+            installation = self._parse_installation_row(cells)
+            if installation is not None:
+                installations.append(installation)
 
         return installations
 
+    def iter_installations(
+        self, chunks: Iterable[Content], encoding: Optional[str] = None
+    ) -> Iterator[RenewableInstallation]:
+        """Yield installations parsed incrementally from HTML fed in chunks, skipping the header row."""
+        rows = stream_rows(chunks, encoding=encoding)
+        next(rows, None)  # Skip header row
+        for cells in rows:
+            installation = self._parse_installation_row(cells)
+            if installation is not None:
+                yield installation
+
+    def stream_export(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[RenewableInstallation]:
+        """Download a registry export and yield installations while the response streams in.
+
+        The page is decoded with the charset of its Content-Type header if it
+        declares one, otherwise from the document itself.
+        """
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            encoding = declared_charset(response.headers.get("content-type"))
+            yield from self.iter_installations(response.iter_content(chunk_size), encoding=encoding)
+
+    def stream_export_tables(self, url: str, rows_per_chunk: int = 50_000) -> Iterator[InstallationTable]:
+        """Download a registry export and yield it as columnar chunks of at most rows_per_chunk rows."""
+        batch: List[RenewableInstallation] = []
+        for installation in self.stream_export(url):
+            batch.append(installation)
+            if len(batch) >= rows_per_chunk:
+                yield InstallationTable.from_installations(batch)
+                batch = []
+        if batch:
+            yield InstallationTable.from_installations(batch)
+
+    def _extract_data_rows(self, content: Content) -> List[List[str]]:
+        """Return cell text of the registry table rows below the header row."""
+        rows = self.parser.extract_rows(content)
+        return rows[1:]  # Skip header row
+
+    def _parse_installation_row(self, cells: List[str]) -> Optional[RenewableInstallation]:
+        """Parse a single registry table row, returning None for rows that cannot be parsed.
+
+        Rows commissioned before ``EARLIEST_COMMISSIONING_DATE`` or more than a year
+        ahead are rejected as data entry errors.
+        """
+        if len(cells) < 8:
+            return None
+        try:
+            commissioning_date = datetime.strptime(cells[3], "%Y-%m-%d").date()
+            if not plausible_commissioning_date(commissioning_date):
+                return None
+            installation_data = {
+                "installation_id": cells[0],
+                "name": cells[1],
+                "installation_type": "solar_pv",
+                "capacity_kw": float(cells[2].replace(",", ".")),
+                "commissioning_date": commissioning_date,
+                "voivodeship": cells[4],
+                "municipality": cells[5],
+                "operator": cells[6],
+                "status": cells[7],
+            }
+
+            return RenewableInstallation.from_dict(installation_data)
+        except (ValueError, IndexError):
+            # Log parsing error and continue
+            return None
+
     def get_available_voivodeships(self) -> List[str]:
         """Get list of available voivodeships in the registry."""
         # Placeholder implementation
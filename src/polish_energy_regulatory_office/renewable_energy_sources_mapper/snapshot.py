@@ -0,0 +1,130 @@
+"""
+Local columnar snapshots of the RES registry.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from dataclasses import fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from ..columns import CategoricalColumn, TextColumn
+from .table import InstallationTable
+
+SNAPSHOT_FORMAT_VERSION = 2
+# Version 1 stored identifiers and names as fixed-width unicode arrays, re-encoded on load
+_READABLE_FORMAT_VERSIONS = (1, 2)
+_META_FILE = "meta.json"
+
+
+class SnapshotStore:
+    """Directory of registry snapshots, one per date, stored as memory-mappable columns.
+
+    Every snapshot is a ``YYYY-MM-DD`` directory holding one ``.npy`` file per
+    table column (category codes for dictionary-encoded columns) and a
+    ``meta.json`` file with the category lists. Identifiers and names are stored
+    as UTF-8 bytes plus row offsets, so long names take no space in other rows.
+    Loading maps every array read-only, so nothing is copied or decoded until
+    rows are touched.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """Initialize store rooted at a directory."""
+        self.root = Path(root)
+
+    def dates(self) -> List[date]:
+        """Return dates of stored snapshots in ascending order."""
+        if not self.root.is_dir():
+            return []
+        snapshot_dates = []
+        for path in self.root.iterdir():
+            if not (path / _META_FILE).is_file():
+                continue
+            try:
+                snapshot_dates.append(date.fromisoformat(path.name))
+            except ValueError:
+                continue
+        return sorted(snapshot_dates)
+
+    def latest(self, as_of: Optional[date] = None) -> Optional[date]:
+        """Return date of the newest snapshot, or of the newest taken on or before as_of."""
+        candidates = [snapshot_date for snapshot_date in self.dates() if as_of is None or snapshot_date <= as_of]
+        return candidates[-1] if candidates else None
+
+    def save(self, table: InstallationTable, snapshot_date: Optional[date] = None) -> Path:
+        """Write table as the snapshot of a date (today by default), replacing an existing one atomically."""
+        snapshot_date = snapshot_date or date.today()
+        target = self.root / snapshot_date.isoformat()
+        staging = self.root / f".{snapshot_date.isoformat()}-{uuid.uuid4().hex}"
+        staging.mkdir(parents=True)
+
+        categories: Dict[str, List[str]] = {}
+        text_columns: List[str] = []
+        for field in fields(InstallationTable):
+            column: Any = getattr(table, field.name)
+            if isinstance(column, CategoricalColumn):
+                categories[field.name] = column.categories
+                column = column.codes
+            elif isinstance(column, TextColumn):
+                np.save(staging / f"{field.name}.offsets.npy", np.ascontiguousarray(column.offsets), allow_pickle=False)
+                np.save(staging / f"{field.name}.bytes.npy", np.ascontiguousarray(column.data), allow_pickle=False)
+                text_columns.append(field.name)
+                continue
+            np.save(staging / f"{field.name}.npy", np.ascontiguousarray(column), allow_pickle=False)
+
+        meta = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "snapshot_date": snapshot_date.isoformat(),
+            "created_at": datetime.now().isoformat(),
+            "rows": len(table),
+            "categories": categories,
+            "text_columns": text_columns,
+        }
+        (staging / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        if target.exists():
+            retired = self.root / f".{target.name}-{uuid.uuid4().hex}"
+            os.replace(target, retired)
+            os.replace(staging, target)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, target)
+        return target
+
+    def load(self, snapshot_date: Optional[date] = None) -> InstallationTable:
+        """Memory-map the latest snapshot taken on or before snapshot_date (the newest one by default)."""
+        found = self.latest(as_of=snapshot_date)
+        if found is None:
+            raise FileNotFoundError(
+                f"No registry snapshot in {self.root}" + (f" up to {snapshot_date}" if snapshot_date else "")
+            )
+        path = self.root / found.isoformat()
+        meta = json.loads((path / _META_FILE).read_text(encoding="utf-8"))
+        if meta["format_version"] not in _READABLE_FORMAT_VERSIONS:
+            raise ValueError(f"Unsupported snapshot format version: {meta['format_version']}")
+
+        columns: Dict[str, Any] = {}
+        for field in fields(InstallationTable):
+            if field.name in meta.get("text_columns", []):
+                columns[field.name] = TextColumn(
+                    data=np.load(path / f"{field.name}.bytes.npy", mmap_mode="r", allow_pickle=False),
+                    offsets=np.load(path / f"{field.name}.offsets.npy", mmap_mode="r", allow_pickle=False),
+                )
+                continue
+            values = np.load(path / f"{field.name}.npy", mmap_mode="r", allow_pickle=False)
+            if values.dtype.kind == "U":
+                columns[field.name] = TextColumn.encode(values.tolist())
+            elif field.name in meta["categories"]:
+                columns[field.name] = CategoricalColumn(codes=values, categories=meta["categories"][field.name])
+            else:
+                columns[field.name] = values
+        return InstallationTable(**columns)
+
+    def delete(self, snapshot_date: date) -> None:
+        """Remove the snapshot of a date if it exists."""
+        shutil.rmtree(self.root / snapshot_date.isoformat(), ignore_errors=True)
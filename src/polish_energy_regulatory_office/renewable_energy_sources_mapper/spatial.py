@@ -0,0 +1,183 @@
+"""
+Spatial index for proximity queries over installation coordinates.
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+MIN_CELL_KM = 0.05
+# Largest number of (query, point) pairs checked at once when a query reaches every cell
+MAX_CANDIDATE_PAIRS = 1 << 22
+
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+
+
+def haversine_km(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    """Return great-circle distances in km between coordinates given in degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    distances: np.ndarray = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return distances
+
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Return (N, 3) unit vectors of coordinates given in degrees."""
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def _chord(distance_km: float) -> float:
+    """Return straight-line distance on the unit sphere of a great-circle distance in km."""
+    return float(2 * np.sin(min(distance_km / (2 * EARTH_RADIUS_KM), np.pi / 2)))
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Pack (N, 3) integer cell coordinates into int64 keys."""
+    shifted = cells.astype(np.int64) + _KEY_OFFSET
+    keys: np.ndarray = (shifted[:, 0] << (2 * _KEY_BITS)) | (shifted[:, 1] << _KEY_BITS) | shifted[:, 2]
+    return keys
+
+
+class SpatialIndex:
+    """Uniform grid over 3-D unit vectors answering haversine radius, k-nearest and bbox queries.
+
+    Points are bucketed into cubic cells whose edge equals the chord of ``cell_km``
+    and stored sorted by cell, so a radius query only visits the cells within
+    reach and checks exact haversine distances there. Choosing ``cell_km`` close
+    to the typical query radius keeps the number of visited cells at 27. Query
+    results are positions in the arrays the index was built from; points without
+    coordinates (NaN) are not indexed.
+    """
+
+    def __init__(self, latitudes: Any, longitudes: Any, cell_km: float = 5.0):
+        """Build index over coordinates in degrees."""
+        if cell_km < MIN_CELL_KM:
+            raise ValueError(f"Cell size must be at least {MIN_CELL_KM} km")
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        valid = np.flatnonzero(~(np.isnan(latitudes) | np.isnan(longitudes)))
+
+        self.cell_km = cell_km
+        self._cell = _chord(cell_km)
+        cells = np.floor(_unit_vectors(latitudes[valid], longitudes[valid]) / self._cell).astype(np.int64)
+        keys = _cell_keys(cells)
+        order = np.argsort(keys, kind="stable")
+
+        self.positions = valid[order]
+        self.latitudes = latitudes[self.positions]
+        self.longitudes = longitudes[self.positions]
+        self._keys, self._starts = np.unique(keys[order], return_index=True)
+        self._stops = np.append(self._starts[1:], len(order))
+
+        self._by_latitude = np.argsort(self.latitudes, kind="stable")
+        self._sorted_latitudes = self.latitudes[self._by_latitude]
+
+    def __len__(self) -> int:
+        """Return number of indexed points."""
+        return len(self.positions)
+
+    def query_radius_batch(
+        self, latitudes: Any, longitudes: Any, radius_km: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find indexed points within radius_km of each query point.
+
+        Returns parallel arrays of query indices, point positions and distances in km.
+        When the radius reaches every occupied cell, queries are checked against all
+        points in blocks of at most ``MAX_CANDIDATE_PAIRS`` pairs, so memory stays
+        linear in the number of points and results.
+        """
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+        reach = int(np.ceil(_chord(radius_km) / self._cell))
+        block = max(len(latitudes), 1)
+        if self._visits_all_cells(reach):
+            block = max(1, MAX_CANDIDATE_PAIRS // max(len(self), 1))
+
+        queries, positions, distances = [], [], []
+        for start in range(0, len(latitudes), block):
+            stop = start + block
+            query, slots = self._candidates(latitudes[start:stop], longitudes[start:stop], reach)
+            found = haversine_km(
+                latitudes[start:stop][query],
+                longitudes[start:stop][query],
+                self.latitudes[slots],
+                self.longitudes[slots],
+            )
+            within = found <= radius_km
+            queries.append(query[within] + start)
+            positions.append(self.positions[slots[within]])
+            distances.append(found[within])
+        if not queries:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(queries), np.concatenate(positions), np.concatenate(distances)
+
+    def query_radius(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return positions and distances of points within radius_km, nearest first."""
+        _, positions, distances = self.query_radius_batch(latitude, longitude, radius_km)
+        order = np.argsort(distances, kind="stable")
+        return positions[order], distances[order]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Return positions and distances of the k nearest points, nearest first."""
+        k = min(k, len(self))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        query_lat = np.array([latitude], dtype=np.float64)
+        query_lon = np.array([longitude], dtype=np.float64)
+        reach = 1
+        while True:
+            _, slots = self._candidates(query_lat, query_lon, reach)
+            distances = haversine_km(latitude, longitude, self.latitudes[slots], self.longitudes[slots])
+            # Points outside the searched cells are more than reach cell edges away
+            guaranteed_km = 2 * EARTH_RADIUS_KM * np.arcsin(min(1.0, reach * self._cell / 2))
+            if len(slots) == len(self) or (len(slots) >= k and np.partition(distances, k - 1)[k - 1] <= guaranteed_km):
+                order = np.argsort(distances, kind="stable")[:k]
+                return self.positions[slots[order]], distances[order]
+            reach *= 2
+
+    def query_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """Return positions of points inside a bounding box; min_lon > max_lon crosses the antimeridian."""
+        lower = np.searchsorted(self._sorted_latitudes, min_lat, side="left")
+        upper = np.searchsorted(self._sorted_latitudes, max_lat, side="right")
+        slots = self._by_latitude[lower:upper]
+        longitudes = self.longitudes[slots]
+        if min_lon <= max_lon:
+            inside = (longitudes >= min_lon) & (longitudes <= max_lon)
+        else:
+            inside = (longitudes >= min_lon) | (longitudes <= max_lon)
+        return np.sort(self.positions[slots[inside]])
+
+    def _visits_all_cells(self, reach: int) -> bool:
+        """Check whether enumerating the cells within reach costs more than visiting every occupied cell."""
+        return (2 * reach + 1) ** 3 >= len(self._keys)
+
+    def _candidates(self, latitudes: np.ndarray, longitudes: np.ndarray, reach: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (query index, slot) pairs of points in cells within reach of every query's cell."""
+        if self._visits_all_cells(reach):
+            # Visiting every occupied cell is cheaper than enumerating neighbours
+            query = np.repeat(np.arange(len(latitudes)), len(self))
+            return query, np.tile(np.arange(len(self)), len(latitudes))
+
+        cells = np.floor(_unit_vectors(latitudes, longitudes) / self._cell).astype(np.int64)
+        steps = np.arange(-reach, reach + 1)
+        offsets = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1).reshape(-1, 3)
+        queries = []
+        slots = []
+        for offset in offsets:
+            keys = _cell_keys(cells + offset)
+            found = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            hit = np.flatnonzero(self._keys[found] == keys)
+            if len(hit) == 0:
+                continue
+            starts = self._starts[found[hit]]
+            lengths = self._stops[found[hit]] - starts
+            within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            queries.append(np.repeat(hit, lengths))
+            slots.append(np.repeat(starts, lengths) + within)
+        if not queries:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(queries), np.concatenate(slots)
@@ -0,0 +1,122 @@
+"""
+Incremental registry sync: change feeds between registry snapshots.
+"""
+
+from dataclasses import dataclass, fields
+from typing import List, Optional
+
+import numpy as np
+
+from ..columns import CategoricalColumn, TextColumn
+from .models import RenewableInstallation
+from .table import InstallationTable
+
+COMPARED_FIELDS = [field.name for field in fields(InstallationTable) if field.name != "installation_id"]
+
+
+@dataclass
+class InstallationChange:
+    """Change of a single installation between two registry snapshots."""
+
+    installation_id: str
+    change_type: str
+    changed_fields: List[str]
+    previous: Optional[RenewableInstallation] = None
+    current: Optional[RenewableInstallation] = None
+
+
+@dataclass(eq=False)
+class RegistryDiff:
+    """Added, removed and changed installations keyed by ``installation_id``.
+
+    ``previous`` and ``current`` hold the changed rows before and after the
+    change in the same order, with the names of the differing fields in
+    ``changed_fields``.
+    """
+
+    added: InstallationTable
+    removed: InstallationTable
+    previous: InstallationTable
+    current: InstallationTable
+    changed_fields: List[List[str]]
+
+    def __len__(self) -> int:
+        """Return number of changed installations."""
+        return len(self.added) + len(self.removed) + len(self.current)
+
+    @property
+    def is_empty(self) -> bool:
+        """Check whether the snapshots hold the same installations."""
+        return len(self) == 0
+
+    def changes(self) -> List[InstallationChange]:
+        """Return the change feed as one record per installation."""
+        feed = [
+            InstallationChange(inst.installation_id, "added", list(COMPARED_FIELDS), current=inst)
+            for inst in self.added.to_installations()
+        ]
+        feed.extend(
+            InstallationChange(inst.installation_id, "removed", list(COMPARED_FIELDS), previous=inst)
+            for inst in self.removed.to_installations()
+        )
+        feed.extend(
+            InstallationChange(after.installation_id, "changed", changed, previous=before, current=after)
+            for before, after, changed in zip(
+                self.previous.to_installations(), self.current.to_installations(), self.changed_fields
+            )
+        )
+        return feed
+
+
+def _column_differs(previous: InstallationTable, current: InstallationTable, name: str) -> np.ndarray:
+    """Return row mask of values differing between two aligned tables."""
+    before = getattr(previous, name)
+    after = getattr(current, name)
+    if isinstance(before, CategoricalColumn):
+        differs: np.ndarray = before.recode(after) != after.codes
+        return differs
+    if isinstance(before, TextColumn):
+        differs = before.to_numpy() != after.to_numpy()
+        return differs
+    if before.dtype.kind == "f":
+        differs = (before != after) & ~(np.isnan(before) & np.isnan(after))
+    else:
+        differs = before != after
+    return differs
+
+
+def _check_unique_ids(installation_ids: np.ndarray, label: str) -> None:
+    """Raise ValueError when a table's installation_id values repeat."""
+    ids, counts = np.unique(installation_ids, return_counts=True)
+    duplicates = ids[counts > 1]
+    if len(duplicates):
+        raise ValueError(f"Duplicate installation_id in {label} table: {', '.join(map(str, duplicates[:5]))}")
+
+
+def diff_tables(previous: InstallationTable, current: InstallationTable) -> RegistryDiff:
+    """Diff two registry snapshots by installation_id with vectorized column comparisons.
+
+    Raises ValueError when either table repeats an installation_id, as rows are matched one to one.
+    """
+    previous_ids = previous.installation_id.to_numpy()
+    current_ids = current.installation_id.to_numpy()
+    _check_unique_ids(previous_ids, "previous")
+    _check_unique_ids(current_ids, "current")
+    _, previous_index, current_index = np.intersect1d(
+        previous_ids, current_ids, assume_unique=True, return_indices=True
+    )
+    added = ~np.isin(current_ids, previous_ids, assume_unique=True)
+    removed = ~np.isin(previous_ids, current_ids, assume_unique=True)
+
+    before = previous.take(previous_index)
+    after = current.take(current_index)
+    differences = np.column_stack([_column_differs(before, after, name) for name in COMPARED_FIELDS])
+    changed = np.flatnonzero(differences.any(axis=1))
+
+    return RegistryDiff(
+        added=current.take(added),
+        removed=previous.take(removed),
+        previous=before.take(changed),
+        current=after.take(changed),
+        changed_fields=[[COMPARED_FIELDS[column] for column in np.flatnonzero(differences[row])] for row in changed],
+    )
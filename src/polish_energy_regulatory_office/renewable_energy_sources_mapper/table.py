@@ -0,0 +1,179 @@
+"""
+Columnar storage of renewable installations for vectorized queries.
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..columns import CategoricalColumn, TextColumn
+from .models import InstallationType, RenewableInstallation
+
+INSTALLATION_TYPES = list(InstallationType)
+
+
+@dataclass(eq=False)
+class InstallationTable:
+    """Renewable installations stored as struct-of-arrays.
+
+    Voivodeship, municipality, operator, type, status and technology are dictionary
+    encoded; identifiers and names are ``TextColumn`` bytes decoded only when rows
+    are read; capacity, coordinates (NaN when unknown) and commissioning dates are
+    NumPy arrays, so filters and group-bys run as vectorized masks and bincounts.
+    Installation types are encoded in ``InstallationType`` declaration order.
+    """
+
+    installation_id: TextColumn
+    name: TextColumn
+    installation_type: CategoricalColumn
+    capacity_kw: np.ndarray
+    commissioning_date: np.ndarray
+    voivodeship: CategoricalColumn
+    municipality: CategoricalColumn
+    operator: CategoricalColumn
+    technology: CategoricalColumn
+    latitude: np.ndarray
+    longitude: np.ndarray
+    status: CategoricalColumn
+
+    def __len__(self) -> int:
+        """Return number of installations."""
+        return len(self.capacity_kw)
+
+    @classmethod
+    def from_installations(cls, installations: Sequence[Any]) -> "InstallationTable":
+        """Build table from RenewableInstallation objects (or objects with the same attributes)."""
+        count = len(installations)
+        return cls(
+            installation_id=TextColumn.encode([inst.installation_id for inst in installations]),
+            name=TextColumn.encode([inst.name for inst in installations]),
+            installation_type=CategoricalColumn.encode(
+                [inst.installation_type.value for inst in installations],
+                categories=[inst_type.value for inst_type in INSTALLATION_TYPES],
+            ),
+            capacity_kw=np.fromiter((inst.capacity_kw for inst in installations), dtype=np.float64, count=count),
+            commissioning_date=np.array([inst.commissioning_date for inst in installations], dtype="datetime64[D]"),
+            voivodeship=CategoricalColumn.encode([inst.voivodeship for inst in installations]),
+            municipality=CategoricalColumn.encode([inst.municipality for inst in installations]),
+            operator=CategoricalColumn.encode([inst.operator for inst in installations]),
+            technology=CategoricalColumn.encode([inst.technology for inst in installations]),
+            latitude=np.array([inst.latitude for inst in installations], dtype=np.float64),
+            longitude=np.array([inst.longitude for inst in installations], dtype=np.float64),
+            status=CategoricalColumn.encode([inst.status for inst in installations]),
+        )
+
+    @classmethod
+    def coerce(cls, installations: Union["InstallationTable", Sequence[Any]]) -> "InstallationTable":
+        """Return installations as a table, converting object sequences if needed."""
+        if isinstance(installations, InstallationTable):
+            return installations
+        return cls.from_installations(installations)
+
+    def mask(
+        self,
+        voivodeship: Optional[str] = None,
+        municipality: Optional[str] = None,
+        installation_type: Optional[InstallationType] = None,
+        status: Optional[str] = None,
+        min_capacity_kw: Optional[float] = None,
+        max_capacity_kw: Optional[float] = None,
+    ) -> np.ndarray:
+        """Return boolean row mask for the given predicates; municipality matches ignoring case."""
+        selected = np.ones(len(self), dtype=bool)
+        if voivodeship is not None:
+            selected &= self.voivodeship.codes == self.voivodeship.code_of(voivodeship)
+        if municipality is not None:
+            selected &= np.isin(self.municipality.codes, self.municipality.codes_matching(municipality))
+        if installation_type is not None:
+            selected &= self.installation_type.codes == self.installation_type.code_of(installation_type.value)
+        if status is not None:
+            selected &= self.status.codes == self.status.code_of(status)
+        if min_capacity_kw is not None:
+            selected &= self.capacity_kw >= min_capacity_kw
+        if max_capacity_kw is not None:
+            selected &= self.capacity_kw <= max_capacity_kw
+        return selected
+
+    def take(self, index: Any) -> "InstallationTable":
+        """Return table restricted to selected rows (boolean mask or positions)."""
+        return InstallationTable(
+            installation_id=self.installation_id.take(index),
+            name=self.name.take(index),
+            installation_type=self.installation_type.take(index),
+            capacity_kw=self.capacity_kw[index],
+            commissioning_date=self.commissioning_date[index],
+            voivodeship=self.voivodeship.take(index),
+            municipality=self.municipality.take(index),
+            operator=self.operator.take(index),
+            technology=self.technology.take(index),
+            latitude=self.latitude[index],
+            longitude=self.longitude[index],
+            status=self.status.take(index),
+        )
+
+    def group_totals(self, *columns: CategoricalColumn) -> Tuple[np.ndarray, np.ndarray]:
+        """Return dense installation counts and capacity sums grouped by categorical columns.
+
+        Both arrays have one axis per column, indexed by category code, and are
+        computed with a single bincount over the combined codes. Grouping columns
+        must not contain missing values.
+        """
+        shape = tuple(len(column.categories) for column in columns)
+        combined = np.zeros(len(self), dtype=np.int64)
+        for column, size in zip(columns, shape):
+            combined = combined * size + column.codes
+        groups = int(np.prod(shape))
+        counts = np.bincount(combined, minlength=groups).reshape(shape)
+        capacities = np.bincount(combined, weights=self.capacity_kw, minlength=groups).reshape(shape)
+        return counts, capacities
+
+    def to_installations(self, index: Any = slice(None)) -> List[RenewableInstallation]:
+        """Materialize selected rows as RenewableInstallation objects."""
+        ids = self.installation_id.decode(index)
+        dates = self.commissioning_date[index].astype(object).tolist()
+        latitudes = self.latitude[index]
+        longitudes = self.longitude[index]
+        return [
+            RenewableInstallation(
+                installation_id=installation_id,
+                name=name,
+                installation_type=InstallationType(installation_type),
+                capacity_kw=capacity_kw,
+                commissioning_date=commissioning_date,
+                voivodeship=voivodeship,
+                municipality=municipality,
+                operator=operator,
+                technology=technology,
+                latitude=None if np.isnan(latitude) else latitude,
+                longitude=None if np.isnan(longitude) else longitude,
+                status=status,
+            )
+            for (
+                installation_id,
+                name,
+                installation_type,
+                capacity_kw,
+                commissioning_date,
+                voivodeship,
+                municipality,
+                operator,
+                technology,
+                latitude,
+                longitude,
+                status,
+            ) in zip(
+                ids,
+                self.name.decode(index),
+                self.installation_type.decode(index),
+                self.capacity_kw[index].tolist(),
+                dates,
+                self.voivodeship.decode(index),
+                self.municipality.decode(index),
+                self.operator.decode(index),
+                self.technology.decode(index),
+                latitudes.tolist(),
+                longitudes.tolist(),
+                self.status.decode(index),
+            )
+        ]
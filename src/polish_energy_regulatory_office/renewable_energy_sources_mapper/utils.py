@@ -3,37 +3,67 @@ Utility functions for renewable energy sources mapping.
 """
 
 from datetime import date
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from .models import CapacityGrowthAnalysis, InstallationType
+import numpy as np
 
+from .cube import CapacityCube
+from .models import CapacityGrowthAnalysis, GeospatialPoint, InstallationType
+from .spatial import MIN_CELL_KM, SpatialIndex
+from .table import InstallationTable
 
-def calculate_capacity_growth(installations: List[Any]) -> Dict[str, float]:
-    """Calculate capacity growth metrics from installation data."""
-    if not installations:
-        return {"total_capacity": 0.0, "growth_rate": 0.0, "installations_count": 0}
 
-    total_capacity = sum(inst.capacity_kw for inst in installations)
-    total_count = len(installations)
+def calculate_capacity_growth(
+    installations: Union[CapacityCube, InstallationTable, Sequence[Any]],
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+) -> Dict[str, float]:
+    """Calculate installed capacity at period end and its growth over the period.
+
+    The period defaults to the twelve months up to the latest commissioning month.
+    Pass a prebuilt ``CapacityCube`` to answer many periods without rescanning.
+    """
+    cube = _capacity_cube(installations)
+    if cube.months == 0:
+        return {"total_capacity": 0.0, "growth_rate": 0.0, "installations_count": 0}
+    period_start, period_end = _default_period(cube, period_start, period_end)
 
+    counts, capacities = cube.totals_at(period_end)
+    analysis = cube.growth(period_start, period_end)
     return {
-        "total_capacity": total_capacity,
-        "growth_rate": 0.0,
-        "installations_count": total_count,
+        "total_capacity": float(capacities.sum()),
+        "growth_rate": analysis.growth_rate_percent,
+        "installations_count": int(counts.sum()),
     }
 
 
-def analyze_installation_trends(installations: List[Any]) -> CapacityGrowthAnalysis:
-    """Analyze installation trends and growth patterns."""
-    return CapacityGrowthAnalysis(
-        period_start=date.today(),
-        period_end=date.today(),
-        total_capacity_added_kw=0.0,
-        installations_added=0,
-        growth_rate_percent=0.0,
-        dominant_technology=InstallationType.SOLAR_PV,
-        regional_breakdown={},
-    )
+def analyze_installation_trends(
+    installations: Union[CapacityCube, InstallationTable, Sequence[Any]],
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+    voivodeship: Optional[str] = None,
+) -> CapacityGrowthAnalysis:
+    """Analyze installations commissioned in a period (by default the last twelve months of the registry)."""
+    cube = _capacity_cube(installations)
+    period_start, period_end = _default_period(cube, period_start, period_end)
+    return cube.growth(period_start, period_end, voivodeship)
+
+
+def _capacity_cube(installations: Union[CapacityCube, InstallationTable, Sequence[Any]]) -> CapacityCube:
+    """Return installations as a capacity cube, building it if needed."""
+    if isinstance(installations, CapacityCube):
+        return installations
+    return CapacityCube.from_table(InstallationTable.coerce(installations))
+
+
+def _default_period(cube: CapacityCube, period_start: Optional[date], period_end: Optional[date]) -> Tuple[date, date]:
+    """Default a missing period end to the cube's last month and a missing start to the twelve months up to it."""
+    if period_end is None:
+        period_end = cube.last_month or date.today()
+    if period_start is None:
+        months = period_end.year * 12 + period_end.month - 12
+        period_start = date(months // 12, months % 12 + 1, 1)
+    return period_start, period_end
 
 
 def calculate_geographic_distribution(installations: List[Any]) -> Dict[str, Any]:
@@ -54,14 +84,57 @@ def calculate_installation_density(
 
 
 def find_optimal_locations(
-    existing_installations: List[Any],
+    existing_installations: Union[InstallationTable, Sequence[Any]],
     candidate_locations: List[Any],
     min_distance_km: float = 5.0,
 ) -> List[Any]:
-    """Find optimal locations for new installations."""
-    return candidate_locations
-
-
-def generate_geospatial_data(installations: List[Any]) -> List[Any]:
-    """Generate geospatial data from installations."""
-    return []
+    """Find candidate locations at least min_distance_km away from every existing installation.
+
+    Candidates are objects with ``latitude``/``longitude`` attributes or ``(latitude, longitude)``
+    pairs; candidates without coordinates are dropped and installations without them ignored.
+    """
+    if not candidate_locations:
+        return []
+    table = InstallationTable.coerce(existing_installations)
+    index = SpatialIndex(table.latitude, table.longitude, cell_km=max(min_distance_km, MIN_CELL_KM))
+
+    coordinates = np.array(
+        [
+            (location.latitude, location.longitude) if hasattr(location, "latitude") else tuple(location)
+            for location in candidate_locations
+        ],
+        dtype=np.float64,
+    )
+    query, _, distances = index.query_radius_batch(coordinates[:, 0], coordinates[:, 1], min_distance_km)
+    accepted = ~(np.isnan(coordinates[:, 0]) | np.isnan(coordinates[:, 1]))
+    accepted[query[distances < min_distance_km]] = False
+    return [location for location, keep in zip(candidate_locations, accepted) if keep]
+
+
+def generate_geospatial_data(installations: Union[InstallationTable, Sequence[Any]]) -> List[GeospatialPoint]:
+    """Generate map points for installations with known coordinates."""
+    table = InstallationTable.coerce(installations)
+    located = np.flatnonzero(~(np.isnan(table.latitude) | np.isnan(table.longitude)))
+    columns = zip(
+        table.latitude[located].tolist(),
+        table.longitude[located].tolist(),
+        table.installation_id.decode(located),
+        table.capacity_kw[located].tolist(),
+        table.installation_type.decode(located),
+        table.name.decode(located),
+        table.municipality.decode(located),
+        table.voivodeship.decode(located),
+    )
+    return [
+        GeospatialPoint(
+            latitude=latitude,
+            longitude=longitude,
+            installation_id=installation_id,
+            capacity_kw=capacity_kw,
+            installation_type=InstallationType(type_value),
+            name=name,
+            municipality=municipality,
+            voivodeship=voivodeship,
+        )
+        for latitude, longitude, installation_id, capacity_kw, type_value, name, municipality, voivodeship in columns
+    ]
@@ -0,0 +1,32 @@
+"""
+Unit tests for shared categorical and text columns.
+"""
+
+import numpy as np
+
+from polish_energy_regulatory_office.columns import CategoricalColumn, TextColumn, extend_categories
+
+
+class TestColumns:
+    """Test cases for column encodings."""
+
+    def test_text_column_take_and_decode(self):
+        """Test that rows are gathered as bytes and decoded back unchanged."""
+        column = TextColumn.encode(["Łódź", "", "Sępólno Krajeńskie", "Żywiec"])
+
+        taken = column.take(np.array([3, 1, 0]))
+
+        assert len(taken) == 3
+        assert taken.decode() == ["Żywiec", "", "Łódź"]
+        assert column.decode(np.array([False, False, True, False])) == ["Sępólno Krajeńskie"]
+        assert column.to_numpy().tolist() == column.decode()
+
+    def test_extend_categories(self):
+        """Test that codes are translated into a shared, growing category list."""
+        categories = ["opolskie"]
+        column = CategoricalColumn.encode(["śląskie", None, "opolskie", "śląskie"])
+
+        codes = extend_categories(column, categories)
+
+        assert categories == ["opolskie", "śląskie"]
+        assert codes[[0, 2, 3]].tolist() == [1, 0, 1]
@@ -2,14 +2,29 @@
 Unit tests for energy price analyzer module.
 """
 
-from datetime import date
-from decimal import Decimal
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import ROUND_HALF_EVEN, Decimal
 
+import numpy as np
+import pandas as pd
 import pytest
+import responses
+from requests import Response
 
-from polish_energy_regulatory_office.energy_price_analyzer import EnergyPriceAnalyzer
-from polish_energy_regulatory_office.energy_price_analyzer.models import PriceData, TariffStructure
-from polish_energy_regulatory_office.energy_price_analyzer.utils import format_currency
+from polish_energy_regulatory_office.energy_price_analyzer import (
+    BatchForecaster,
+    EnergyPriceAnalyzer,
+    PriceAccumulator,
+    PriceStore,
+    ResponseCache,
+    UREPriceScraper,
+    rolling_statistics,
+)
+from polish_energy_regulatory_office.energy_price_analyzer.cache import PriceRangeCache
+from polish_energy_regulatory_office.energy_price_analyzer.models import PriceData, PriceSeries, TariffStructure
+from polish_energy_regulatory_office.energy_price_analyzer.utils import calculate_cost_matrix, format_currency
 
 
 class TestEnergyPriceAnalyzer:
@@ -33,6 +48,24 @@ class TestEnergyPriceAnalyzer:
         assert hasattr(result, "period_end")
         assert hasattr(result, "average_price")
 
+    def test_analyze_price_trends_metrics(self, mock_ure_scraper):
+        """Test vectorized metrics for price trend analysis."""
+        prices = [100.0, 100.0, 120.0, 130.0]
+        mock_ure_scraper.fetch_price_data.return_value = PriceSeries(
+            dates=np.arange("2023-01-01", "2023-01-05", dtype="datetime64[D]"),
+            prices=prices,
+            energy_type="electricity",
+        )
+
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+        result = analyzer.analyze_price_trends(start_date=date(2023, 1, 1), end_date=date(2023, 1, 4))
+
+        assert result.average_price == pytest.approx(112.5)
+        assert result.volatility == pytest.approx(float(np.std(prices, ddof=1)))
+        assert result.min_price == 100.0
+        assert result.max_price == 130.0
+        assert result.price_trend == "increasing"
+
     def test_compare_tariffs(self, mock_ure_scraper):
         """Test tariff comparison functionality."""
         mock_tariff_data = {
@@ -78,6 +111,440 @@ class TestPriceData:
             PriceData(date=date(2023, 1, 1), price=Decimal("250.50"), energy_type="")
 
 
+class TestConcurrentTariffs:
+    """Test cases for concurrent batch tariff fetching."""
+
+    @staticmethod
+    def _tariff_data(tariff_id):
+        """Return scraper tariff payload for given ID."""
+        return {
+            "tariff_id": tariff_id,
+            "name": tariff_id,
+            "base_price": 45.0,
+            "energy_price": 0.65,
+            "network_fee": 25.0,
+            "valid_from": date(2023, 1, 1),
+        }
+
+    def test_duplicates_are_fetched_once_and_errors_reported(self, mock_ure_scraper):
+        """Test deduplication and per-ID error reporting."""
+
+        def fetch(tariff_id):
+            if tariff_id == "X99":
+                raise KeyError("unknown tariff")
+            return self._tariff_data(tariff_id)
+
+        mock_ure_scraper.fetch_tariff_data.side_effect = fetch
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        result = analyzer.fetch_tariffs(["G11", "G12", "G11", "X99", "C11"], max_workers=4)
+
+        assert list(result.tariffs) == ["G11", "G12", "C11"]
+        assert list(result.errors) == ["X99"]
+        assert mock_ure_scraper.fetch_tariff_data.call_count == 4
+        assert not result.is_complete
+
+    def test_deadline_returns_partial_results(self, mock_ure_scraper):
+        """Test that slow tariffs are reported as timed out."""
+        release = threading.Event()
+
+        def fetch(tariff_id):
+            if tariff_id == "G12w":
+                release.wait(5)
+            return self._tariff_data(tariff_id)
+
+        mock_ure_scraper.fetch_tariff_data.side_effect = fetch
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        try:
+            tariffs = analyzer.compare_tariffs(["G11", "G12w", "C21"], max_workers=3, timeout=0.2)
+            result = analyzer.fetch_tariffs(["G12w"], timeout=0.05)
+        finally:
+            release.set()
+
+        assert set(tariffs) == {"G11", "C21"}
+        assert result.timed_out == ["G12w"]
+
+
+class TestForecasting:
+    """Test cases for the batch forecasting engine."""
+
+    WEEKLY = np.array([0.0, 5.0, 10.0, 5.0, 0.0, -10.0, -10.0])
+
+    def _matrix(self, weeks, slopes=(0.0, 1.0)):
+        """Build series with a weekly pattern and linear trends."""
+        t = np.arange(7 * weeks)
+        return np.array([200.0 + slope * t + np.tile(self.WEEKLY, weeks) for slope in slopes])
+
+    def test_seasonal_naive_repeats_last_season(self):
+        """Test seasonal naive forecast of a weekly pattern."""
+        matrix = self._matrix(4, slopes=(0.0,))
+        forecast = BatchForecaster(model="seasonal_naive").fit(matrix, date(2023, 1, 2)).forecast(14)
+
+        assert forecast.shape == (1, 14)
+        np.testing.assert_allclose(forecast[0], 200.0 + np.tile(self.WEEKLY, 2))
+
+    @pytest.mark.parametrize("model", ["holt_winters", "ridge"])
+    def test_models_follow_trend_and_season(self, model):
+        """Test that fitted models track weekly seasonality and trend for every series."""
+        matrix = self._matrix(30)
+        forecaster = BatchForecaster(model=model, ridge_lambda=1e-6).fit(matrix[:, :-7], date(2023, 1, 2))
+
+        np.testing.assert_allclose(forecaster.forecast(7), matrix[:, -7:], atol=2.0)
+
+    @pytest.mark.parametrize("model", ["seasonal_naive", "holt_winters", "ridge"])
+    def test_incremental_update_matches_refit(self, model):
+        """Test that appending days gives the same forecast as refitting."""
+        matrix = self._matrix(10)
+        refit = BatchForecaster(model=model).fit(matrix, date(2023, 1, 2))
+        updated = BatchForecaster(model=model).fit(matrix[:, :-3], date(2023, 1, 2)).update(matrix[:, -3:])
+
+        np.testing.assert_allclose(updated.forecast(10), refit.forecast(10))
+
+    def test_forecast_prices_reuses_fitted_model(self, sample_price_data):
+        """Test analyzer forecasts from PriceData and incremental re-forecasting."""
+        analyzer = EnergyPriceAnalyzer()
+        forecast = analyzer.forecast_prices(sample_price_data, forecast_days=5)
+        forecaster = analyzer._forecasters[("electricity", "holt_winters")][0]
+
+        extended = sample_price_data + [
+            PriceData(date=date(2023, 1, 3), price=Decimal("260.00"), energy_type="electricity")
+        ]
+        analyzer.forecast_prices(extended, forecast_days=5)
+
+        assert [item.date for item in forecast] == [date(2023, 1, day) for day in range(3, 8)]
+        assert all(item.source == "forecast:holt_winters" for item in forecast)
+        assert analyzer._forecasters[("electricity", "holt_winters")][0] is forecaster
+        assert forecaster.n_observations == 3
+
+    def test_forecast_matrix_cache_keeps_last_column(self):
+        """Test that the forecaster cache holds one column per series and refits on a changed history."""
+        analyzer = EnergyPriceAnalyzer()
+        matrix = self._matrix(5)
+
+        analyzer.forecast_matrix(matrix[:, :20], date(2023, 1, 2), cache_key="grid")
+        forecaster, last_column = analyzer._forecasters["grid"]
+        analyzer.forecast_matrix(matrix[:, :30], date(2023, 1, 2), cache_key="grid")
+        revised = matrix.copy()
+        revised[:, 29] += 1.0
+        analyzer.forecast_matrix(revised[:, :31], date(2023, 1, 2), cache_key="grid")
+
+        assert last_column.shape == (matrix.shape[0], 1)
+        assert analyzer._forecasters["grid"][0] is not forecaster
+        assert forecaster.n_observations == 30
+
+
+class TestRollingStatistics:
+    """Test cases for multi-window rolling analytics."""
+
+    def test_matches_pandas_time_based_rolling(self):
+        """Test rolling metrics against pandas time-based windows on an irregular series."""
+        rng = np.random.default_rng(42)
+        dates = np.sort(rng.choice(np.arange("2020-01-01", "2023-01-01", dtype="datetime64[D]"), 600, replace=False))
+        prices = 300.0 + rng.normal(0, 25, size=len(dates)).cumsum()
+        prices -= min(prices.min(), 0.0)
+        series = PriceSeries(dates=dates, prices=prices, energy_type="electricity")
+
+        results = rolling_statistics(series, windows=(7, 30, 365))
+
+        frame = pd.Series(prices, index=pd.DatetimeIndex(dates))
+        for window, stats in results.items():
+            rolling = frame.rolling(f"{window}D")
+            np.testing.assert_allclose(stats.mean, rolling.mean().to_numpy())
+            np.testing.assert_allclose(stats.std, rolling.std().to_numpy(), rtol=1e-6)
+            np.testing.assert_array_equal(stats.min, rolling.min().to_numpy())
+            np.testing.assert_array_equal(stats.max, rolling.max().to_numpy())
+            assert len(stats.count) == len(dates)
+
+    def test_percent_change_against_window_start(self):
+        """Test percent change relative to the last observation before the window."""
+        series = PriceSeries(
+            dates=np.arange("2023-01-01", "2023-01-11", dtype="datetime64[D]"),
+            prices=np.arange(100.0, 110.0),
+            energy_type="electricity",
+        )
+
+        stats = rolling_statistics(series, windows=(7,))[7]
+
+        assert np.isnan(stats.pct_change[:7]).all()
+        assert stats.pct_change[7] == pytest.approx(107.0 / 100.0 - 1)
+
+
+class TestPriceStore:
+    """Test cases for the indexed price store."""
+
+    def _series(self, start, end, offset=0.0):
+        """Build a daily series with increasing prices."""
+        dates = np.arange(start, end, dtype="datetime64[D]")
+        return PriceSeries(dates=dates, prices=np.arange(len(dates)) + offset, energy_type="electricity")
+
+    def test_range_query_returns_view(self):
+        """Test binary search range queries returning zero-copy slices."""
+        store = PriceStore.from_series(self._series("2023-01-01", "2024-01-01"))
+
+        result = store.range(date(2023, 2, 1), date(2023, 2, 28))
+
+        assert len(result) == 28
+        assert result.prices[0] == 31.0
+        assert np.shares_memory(result.prices, store.series.prices)
+
+    def test_aggregates_match_group_by_period(self):
+        """Test that appended data keeps aggregates equal to a full recomputation."""
+        store = PriceStore(initial_capacity=4)
+        store.append(self._series("2023-01-01", "2023-03-15"))
+        store.append(self._series("2023-03-15", "2023-08-01", offset=500.0))
+        store.append(self._series("2022-11-01", "2022-12-01", offset=1000.0))
+
+        frame = pd.DataFrame({"date": store.series.dates, "price": store.series.prices})
+        for period in ("month", "quarter", "year"):
+            aggregates = store.aggregate(period)
+            expected = frame.groupby(frame["date"].dt.to_period(period[0].upper()))["price"]
+            np.testing.assert_allclose(aggregates["sum"], expected.sum())
+            np.testing.assert_array_equal(aggregates["count"], expected.count())
+            np.testing.assert_array_equal(aggregates["min"], expected.min())
+            np.testing.assert_array_equal(aggregates["max"], expected.max())
+            assert list(aggregates.index) == list(expected.sum().index)
+
+        assert np.all(np.diff(store.series.dates) > np.timedelta64(0, "s"))
+
+
+class TestPriceRangeCache:
+    """Test cases for range-aware memoization in EnergyPriceAnalyzer."""
+
+    @staticmethod
+    def _fetch(start_date, end_date, energy_type="electricity", as_series=False):
+        """Return one price per day of the requested range."""
+        dates = np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1, dtype="datetime64[D]")
+        return PriceSeries(dates=dates, prices=np.arange(len(dates), dtype=float), energy_type=energy_type)
+
+    def test_sub_range_is_served_from_cache(self, mock_ure_scraper):
+        """Test that queries within cached coverage do not fetch again."""
+        mock_ure_scraper.fetch_price_data.side_effect = self._fetch
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        analyzer.analyze_price_trends(date(2023, 1, 1), date(2023, 12, 31))
+        result = analyzer.analyze_price_trends(date(2023, 3, 1), date(2023, 3, 31))
+
+        assert mock_ure_scraper.fetch_price_data.call_count == 1
+        assert result.min_price == 59.0
+        assert result.max_price == 89.0
+
+    def test_partial_overlap_fetches_missing_edges(self, mock_ure_scraper):
+        """Test that only uncovered dates are fetched for overlapping queries."""
+        mock_ure_scraper.fetch_price_data.side_effect = self._fetch
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        analyzer.analyze_price_trends(date(2023, 2, 1), date(2023, 2, 28))
+        analyzer.analyze_price_trends(date(2023, 1, 15), date(2023, 3, 10))
+
+        fetched = [call.args[:2] for call in mock_ure_scraper.fetch_price_data.call_args_list]
+        assert fetched == [
+            (date(2023, 2, 1), date(2023, 2, 28)),
+            (date(2023, 1, 15), date(2023, 1, 31)),
+            (date(2023, 3, 1), date(2023, 3, 10)),
+        ]
+        assert analyzer._cache.coverage("electricity") == [(date(2023, 1, 15), date(2023, 3, 10))]
+
+    def test_disjoint_windows_are_kept(self, mock_ure_scraper):
+        """Test that alternating non-adjacent windows are each fetched once and gaps filled later."""
+        mock_ure_scraper.fetch_price_data.side_effect = self._fetch
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        for _ in range(3):
+            analyzer.analyze_price_trends(date(2023, 1, 1), date(2023, 1, 31))
+            analyzer.analyze_price_trends(date(2023, 6, 1), date(2023, 6, 30))
+        assert mock_ure_scraper.fetch_price_data.call_count == 2
+        assert analyzer._cache.coverage("electricity") == [
+            (date(2023, 1, 1), date(2023, 1, 31)),
+            (date(2023, 6, 1), date(2023, 6, 30)),
+        ]
+
+        result = analyzer.analyze_price_trends(date(2023, 1, 15), date(2023, 6, 15))
+        fetched = [call.args[:2] for call in mock_ure_scraper.fetch_price_data.call_args_list]
+        assert fetched[2:] == [(date(2023, 2, 1), date(2023, 5, 31))]
+        assert analyzer._cache.coverage("electricity") == [(date(2023, 1, 1), date(2023, 6, 30))]
+        assert result.min_price == 0.0
+        assert result.max_price == 119.0
+
+    def test_fetch_runs_without_lock(self):
+        """Test that a slow fetch does not block lookups from other threads."""
+        cache = PriceRangeCache()
+        cache.get_or_fetch("gas", date(2023, 1, 1), date(2023, 1, 31), self._fetch)
+        looked_up = []
+
+        def fetch(start_date, end_date):
+            thread = threading.Thread(target=lambda: looked_up.append(cache.coverage("gas")))
+            thread.start()
+            thread.join(timeout=5)
+            return self._fetch(start_date, end_date)
+
+        series = cache.get_or_fetch("electricity", date(2023, 1, 1), date(2023, 1, 10), fetch)
+
+        assert looked_up == [[(date(2023, 1, 1), date(2023, 1, 31))]]
+        assert len(series) == 10
+
+    def test_invalidation_and_memory_cap(self, mock_ure_scraper):
+        """Test explicit invalidation and LRU eviction over the memory cap."""
+        mock_ure_scraper.fetch_price_data.side_effect = self._fetch
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper, cache_max_bytes=16 * 400)
+
+        analyzer.analyze_price_trends(date(2023, 1, 1), date(2023, 12, 31), energy_type="electricity")
+        analyzer.analyze_price_trends(date(2023, 1, 1), date(2023, 12, 31), energy_type="gas")
+        assert analyzer._cache.coverage("electricity") == []
+
+        analyzer.invalidate_cache("gas")
+        assert analyzer._cache.coverage("gas") == []
+
+
+class TestPriceSeries:
+    """Test cases for PriceSeries model."""
+
+    def test_from_price_data_sorts_by_date(self, sample_price_data):
+        """Test building a series from unordered PriceData records."""
+        series = PriceSeries.from_price_data(list(reversed(sample_price_data)))
+
+        assert len(series) == 2
+        assert series.dates.dtype == np.dtype("datetime64[s]")
+        assert series.prices.tolist() == [250.50, 255.75]
+
+    def test_round_trip_to_price_data(self, sample_price_data):
+        """Test converting series back to PriceData records."""
+        records = PriceSeries.from_price_data(sample_price_data).to_price_data()
+
+        assert [item.date for item in records] == [date(2023, 1, 1), date(2023, 1, 2)]
+        assert [item.price for item in records] == [Decimal("250.5"), Decimal("255.75")]
+
+    def test_hourly_timestamps_are_preserved(self):
+        """Test that hourly series keep their time of day."""
+        series = PriceSeries(dates=[datetime(2023, 1, 1, 13)], prices=[300.0], energy_type="electricity")
+
+        assert series.to_price_data()[0].date == datetime(2023, 1, 1, 13)
+
+    def test_negative_price_validation(self):
+        """Test price series validation."""
+        with pytest.raises(ValueError, match="Price cannot be negative"):
+            PriceSeries(dates=[date(2023, 1, 1)], prices=[-1.0], energy_type="electricity")
+
+
+class TestPriceAccumulator:
+    """Test cases for PriceAccumulator."""
+
+    def _series(self, start, prices):
+        """Build a daily price series starting at given date."""
+        dates = np.arange(np.datetime64(start), np.datetime64(start) + len(prices), dtype="datetime64[D]")
+        return PriceSeries(dates=dates, prices=prices, energy_type="electricity")
+
+    def test_incremental_matches_batch_analysis(self):
+        """Test that incremental updates reproduce the batch metrics."""
+        prices = [100.0, 104.0, 98.0, 120.0, 125.0, 131.0, 90.0]
+        accumulator = PriceAccumulator()
+        accumulator.update(self._series("2023-01-01", prices[:3]))
+        accumulator.update(self._series("2023-01-04", prices[3:5]))
+        for item in self._series("2023-01-06", prices[5:]).to_price_data():
+            accumulator.update(item)
+
+        expected = EnergyPriceAnalyzer().analyze_price_series(
+            self._series("2023-01-01", prices), date(2023, 1, 1), date(2023, 1, 7)
+        )
+        result = accumulator.analysis()
+
+        assert accumulator.count == len(prices)
+        assert result.period_start == date(2023, 1, 1)
+        assert result.period_end == date(2023, 1, 7)
+        assert result.average_price == pytest.approx(expected.average_price)
+        assert result.volatility == pytest.approx(expected.volatility)
+        assert (result.min_price, result.max_price) == (expected.min_price, expected.max_price)
+        assert result.price_trend == expected.price_trend
+
+    def test_overlapping_updates_are_ignored(self):
+        """Test that observations already accumulated are not counted twice."""
+        accumulator = PriceAccumulator()
+        accumulator.update(self._series("2023-01-01", [100.0, 110.0]))
+        accumulator.update(self._series("2023-01-02", [110.0, 120.0]))
+
+        assert accumulator.count == 3
+        assert accumulator.mean == pytest.approx(110.0)
+
+    def test_serialization_round_trip(self):
+        """Test restoring accumulator state from its dictionary form."""
+        accumulator = PriceAccumulator(energy_type="gas").update(self._series("2023-01-01", [10.0, 12.0, 15.0]))
+        restored = PriceAccumulator.from_dict(accumulator.to_dict())
+        restored.update(self._series("2023-01-04", [20.0]))
+        accumulator.update(self._series("2023-01-04", [20.0]))
+
+        assert restored.to_dict() == accumulator.to_dict()
+        assert restored.analysis().price_trend == accumulator.analysis().price_trend
+
+
+class TestResponseCache:
+    """Test cases for the persistent HTTP response cache."""
+
+    URL = UREPriceScraper.BASE_URL + UREPriceScraper.PRICE_ENDPOINTS["electricity"]
+
+    @responses.activate
+    def test_repeated_fetch_is_served_from_cache(self, tmp_path):
+        """Test that a fresh cached page does not hit the network."""
+        responses.add(responses.GET, self.URL, body="<html></html>", headers={"ETag": '"v1"'})
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        scraper = UREPriceScraper(cache=cache)
+
+        scraper.fetch_price_data(date(2023, 1, 1), date(2023, 1, 31))
+        scraper.fetch_price_data(date(2023, 1, 1), date(2023, 1, 31))
+
+        assert len(responses.calls) == 1
+        assert cache.stats["misses"] == 1
+        assert cache.stats["hits"] == 1
+
+    @responses.activate
+    def test_stale_entry_is_revalidated(self, tmp_path, mocker):
+        """Test conditional revalidation of expired entries."""
+        responses.add(responses.GET, self.URL, body="<html></html>", headers={"ETag": '"v1"'})
+        responses.add(responses.GET, self.URL, status=304)
+        path = UREPriceScraper.PRICE_ENDPOINTS["electricity"]
+        cache = ResponseCache(tmp_path / "cache.sqlite", endpoint_ttls={path: 0.0})
+        scraper = UREPriceScraper(cache=cache)
+
+        scraper.fetch_price_data(date(2023, 1, 1), date(2023, 1, 31))
+        close = mocker.spy(Response, "close")
+        response = scraper.session.get(self.URL)
+
+        assert close.call_count == 1
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert response.status_code == 200
+        assert response.text == "<html></html>"
+        assert cache.stats["revalidated"] == 1
+
+    def test_close_releases_every_thread_connection(self, tmp_path):
+        """Test that closing the session closes the connections opened by all threads."""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        scraper = UREPriceScraper(cache=cache)
+        worker = threading.Thread(target=cache.store, args=("https://example.com/a", 200, {}, b"a"))
+        worker.start()
+        worker.join()
+        connections = list(cache._connections)
+
+        scraper.session.close()
+
+        assert len(connections) == 2
+        for connection in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                connection.execute("SELECT 1")
+        assert cache.get("https://example.com/a").content == b"a"
+
+    def test_lru_eviction_respects_byte_budget(self, tmp_path):
+        """Test that least recently used entries are evicted first."""
+        cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=250)
+        cache.store("https://example.com/a", 200, {}, b"a" * 100)
+        cache.store("https://example.com/b", 200, {}, b"b" * 100)
+        cache.get("https://example.com/a")
+        cache.store("https://example.com/c", 200, {}, b"c" * 100)
+
+        assert cache.get("https://example.com/b") is None
+        assert cache.get("https://example.com/a") is not None
+        assert cache.total_bytes() <= 250
+        assert cache.stats["evictions"] == 1
+
+
 class TestTariffStructure:
     """Test cases for TariffStructure model."""
 
@@ -113,6 +580,82 @@ class TestTariffStructure:
         assert total_cost == expected_cost
 
 
+class TestCostMatrix:
+    """Test cases for the vectorized tariff cost matrix."""
+
+    @staticmethod
+    def _tariff(tariff_id, base_price, energy_price, network_fee):
+        """Build a tariff from string amounts."""
+        return TariffStructure(
+            tariff_id=tariff_id,
+            name=tariff_id,
+            base_price=Decimal(base_price),
+            energy_price=Decimal(energy_price),
+            network_fee=Decimal(network_fee),
+            valid_from=date(2023, 1, 1),
+        )
+
+    def test_matches_decimal_path(self):
+        """Test that fixed-point costs equal quantized Decimal costs."""
+        tariffs = [self._tariff("G11", "45.00", "0.6543", "25.10"), self._tariff("G12", "12.34", "0.812345", "0")]
+        consumption = [0.0, 100.0, 123.456, 2500.125, 0.005]
+
+        costs = calculate_cost_matrix(tariffs, consumption)
+
+        assert costs.shape == (2, 5)
+        for i, tariff in enumerate(tariffs):
+            for j, kwh in enumerate(consumption):
+                expected = tariff.calculate_total_cost(kwh).quantize(Decimal("0.01"), rounding=ROUND_HALF_EVEN)
+                assert costs[i, j] == int(expected * 100)
+
+    def test_profiles_sum_over_periods(self):
+        """Test cost of consumption profiles with several periods."""
+        tariff = self._tariff("C11", "10.00", "0.50", "5.00")
+        profiles = np.array([[100.0, 200.0, 300.0], [0.0, 0.0, 1.5]])
+
+        costs = calculate_cost_matrix([tariff], profiles)
+
+        assert costs.tolist() == [[34500, 4575]]
+
+    def test_portfolio_costs(self, mock_ure_scraper):
+        """Test analyzer portfolio pricing against several tariffs."""
+        mock_ure_scraper.fetch_tariff_data.side_effect = lambda tariff_id: {
+            "tariff_id": tariff_id,
+            "name": tariff_id,
+            "base_price": 45.0,
+            "energy_price": 0.65,
+            "network_fee": 25.0,
+            "valid_from": date(2023, 1, 1),
+        }
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        result = analyzer.calculate_portfolio_costs(["G11", "G12"], [100.0, 200.0])
+
+        assert list(result.index) == ["G11", "G12"]
+        assert result.loc["G11"].tolist() == [13500, 20000]
+
+    def test_compare_tariffs_ranks_by_profile(self, mock_ure_scraper):
+        """Test that a consumption profile orders tariffs by their cost for it."""
+        prices = {"G11": (10.0, 0.80), "G12": (40.0, 0.50), "G13": (60.0, 0.40)}
+        mock_ure_scraper.fetch_tariff_data.side_effect = lambda tariff_id: {
+            "tariff_id": tariff_id,
+            "name": tariff_id,
+            "base_price": prices[tariff_id][0],
+            "energy_price": prices[tariff_id][1],
+            "network_fee": 0.0,
+            "valid_from": date(2023, 1, 1),
+        }
+        analyzer = EnergyPriceAnalyzer(scraper=mock_ure_scraper)
+
+        unranked = analyzer.compare_tariffs(["G11", "G12", "G13"])
+        small = analyzer.compare_tariffs(["G11", "G12", "G13"], consumption_profile={"peak": 20.0, "off_peak": 30.0})
+        large = analyzer.compare_tariffs(["G11", "G12", "G13"], consumption_profile={"peak": 600.0, "off_peak": 900.0})
+
+        assert list(unranked) == ["G11", "G12", "G13"]
+        assert list(small) == ["G11", "G12", "G13"]
+        assert list(large) == ["G13", "G12", "G11"]
+
+
 class TestUtils:
     """Test cases for utility functions."""
 
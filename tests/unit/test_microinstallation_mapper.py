@@ -0,0 +1,395 @@
+"""
+Unit tests for microinstallation mapper module.
+"""
+
+import io
+import re
+from datetime import date
+
+import numpy as np
+import pytest
+import responses
+
+from polish_energy_regulatory_office.microinstallation_mapper import (
+    GenerationSimulation,
+    GridConnection,
+    Microinstallation,
+    MicroinstallationAggregates,
+    MicroinstallationChunk,
+    MicroinstallationMapper,
+    MicroinstallationScraper,
+    ProsumerCohorts,
+    ProsumerData,
+    analyze_grid_impact,
+    calculate_prosumer_growth,
+    coincidence_factor,
+    hourly_indicators,
+    hourly_yield_profiles,
+    installation_yield,
+    iter_chunks,
+    simulate_generation,
+)
+
+EXPORT_URL = re.compile(r"https://www\.ure\.gov\.pl/.*")
+VOIVODESHIPS = ["łódzkie", "małopolskie", "śląskie"]
+MUNICIPALITIES = ["Łódź", "Kraków", "Żywiec", "Sępólno Krajeńskie"]
+
+
+def export_rows(start, stop):
+    """Return registry rows with IDs in range(start, stop)."""
+    return [
+        [f"M{index}", f"{index % 10 + 1},5", "2023-05-01", VOIVODESHIPS[index % 3], MUNICIPALITIES[index % 4]]
+        for index in range(start, stop)
+    ]
+
+
+def html_page(rows):
+    """Render rows as a UTF-8 HTML export page with a header row and no charset declaration."""
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table><tr><th>ID</th><th>Moc</th><th>Data</th><th>Woj.</th><th>Gmina</th></tr>{body}</table>".encode()
+
+
+def csv_page(rows):
+    """Render rows as a semicolon-separated UTF-8 CSV export with a byte order mark and a header line."""
+    return ("\ufeffid;moc;data;województwo;gmina\n" + "".join(";".join(row) + "\n" for row in rows)).encode()
+
+
+def serve_pages(pages, render, content_type="text/html"):
+    """Serve rendered pages by ``page`` parameter without a declared charset, empty past the last page."""
+
+    def callback(request):
+        """Render the requested page."""
+        page = int(re.search(r"page=(\d+)", request.url).group(1))
+        return 200, {"Content-Type": content_type}, render(pages[page - 1] if page <= len(pages) else [])
+
+    responses.add_callback(responses.GET, EXPORT_URL, callback=callback)
+
+
+class TestChunks:
+    """Test cases for row parsing and chunking."""
+
+    def test_iter_chunks(self):
+        """Test fixed-size chunks with header and malformed rows skipped."""
+        rows = (
+            [["ID", "Moc", "Data", "Woj.", "Gmina"]]
+            + export_rows(0, 7)
+            + [["M9", "n/a", "2023-05-01", "x", "y"], ["M10", "2,0", "0001-01-01", "opolskie", "Nysa"]]
+        )
+
+        chunks = list(iter_chunks(rows, chunk_size=3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert chunks[0].capacity_kw.tolist() == [1.5, 2.5, 3.5]
+        assert MicroinstallationChunk.from_microinstallations(chunks[2].to_microinstallations()).capacity_kw == [7.5]
+        assert chunks[2].to_microinstallations() == [
+            Microinstallation("M6", 7.5, date(2023, 5, 1), "łódzkie", "Żywiec")
+        ]
+        with pytest.raises(ValueError):
+            next(iter_chunks(rows, chunk_size=0))
+
+    def test_aggregates_merge_chunk_categories(self):
+        """Test that chunks with different category codes aggregate by name."""
+        aggregates = MicroinstallationAggregates()
+        for chunk in iter_chunks(export_rows(0, 30), chunk_size=7):
+            aggregates.add(chunk)
+
+        assert aggregates.installation_count == 30
+        assert aggregates.total_capacity_kw == pytest.approx(sum(index % 10 + 1.5 for index in range(30)))
+        assert aggregates.regional_statistics()["małopolskie"]["installation_count"] == 10
+        assert sum(row["installation_count"] for row in aggregates.municipal_statistics("śląskie").values()) == 10
+        assert aggregates.municipal_statistics("opolskie") == {}
+
+
+class TestProsumerCohorts:
+    """Test cases for daily cumulative prosumer cohorts."""
+
+    installations = [
+        Microinstallation("M1", 5.0, date(2022, 3, 10), "slaskie", "Gliwice"),
+        Microinstallation("M2", 4.0, date(2022, 12, 31), "pomorskie", "Gdynia"),
+        Microinstallation("M3", 6.0, date(2023, 1, 1), "slaskie", "Zabrze"),
+        Microinstallation("M4", 10.0, date(2023, 3, 15), "slaskie", "Gliwice"),
+        Microinstallation("M5", 3.0, date(2023, 3, 31), "pomorskie", "Sopot"),
+    ]
+
+    def test_chunks_update_in_place(self):
+        """Test that chunks arriving out of order give the same arrays as one chunk."""
+        cohorts = ProsumerCohorts()
+        for part in (self.installations[2:4], self.installations[4:], self.installations[:2]):
+            cohorts.add(MicroinstallationChunk.from_microinstallations(part))
+        whole = ProsumerCohorts()
+        whole.add(MicroinstallationChunk.from_microinstallations(self.installations))
+
+        assert cohorts.first_day == date(2022, 3, 10)
+        assert cohorts.last_day == date(2023, 3, 31)
+        assert np.array_equal(cohorts.counts.sum(axis=1), whole.counts.sum(axis=1))
+        assert np.allclose(cohorts.capacities.sum(axis=1), whole.capacities.sum(axis=1))
+        assert cohorts.totals_at(date(2022, 12, 31)) == (2, 9.0)
+        assert cohorts.totals_at(date(2030, 1, 1), "slaskie") == (3, 21.0)
+        assert cohorts.totals_at(date(2000, 1, 1)) == (0, 0.0)
+        assert cohorts.trailing_year() == (date(2022, 4, 1), date(2023, 3, 31))
+        assert cohorts.trailing_year(date(2024, 2, 29)) == (date(2023, 3, 1), date(2024, 2, 29))
+
+    def test_windows(self):
+        """Test growth, year-over-year and monthly cohort lookups."""
+        cohorts = ProsumerCohorts()
+        cohorts.add(MicroinstallationChunk.from_microinstallations(self.installations))
+
+        growth = cohorts.growth(date(2023, 1, 1), date(2023, 3, 31))
+        yoy = cohorts.year_over_year(date(2023, 1, 1), date(2023, 3, 31), "slaskie")
+        monthly = cohorts.monthly_cohorts(date(2023, 1, 1), date(2023, 3, 20))
+
+        assert growth["installations_added"] == 3
+        assert growth["growth_rate"] == pytest.approx(150.0)
+        assert growth["capacity_growth_rate"] == pytest.approx(19.0 / 9.0 * 100)
+        assert yoy["previous_installations_added"] == 1
+        assert yoy["installations_change_percent"] == pytest.approx(100.0)
+        assert monthly == {
+            "2023-01": {"installations_added": 1, "capacity_added_kw": 6.0},
+            "2023-02": {"installations_added": 0, "capacity_added_kw": 0.0},
+            "2023-03": {"installations_added": 1, "capacity_added_kw": 10.0},
+        }
+        assert cohorts.period_totals(date(2023, 1, 1), date(2023, 12, 31), "opolskie") == (0, 0.0)
+        with pytest.raises(ValueError):
+            cohorts.period_totals(date(2023, 3, 1), date(2023, 1, 1))
+
+    def test_calculate_prosumer_growth(self):
+        """Test growth over the default trailing year from installations, prosumers or chunks."""
+        empty = calculate_prosumer_growth([])
+
+        growth = calculate_prosumer_growth([ProsumerData("P1", self.installations[:3])] + self.installations[3:])
+        assert empty.keys() == growth.keys()
+        assert set(empty.values()) == {0}
+        by_region = calculate_prosumer_growth(
+            iter_chunks([], 1), date(2023, 1, 1), date(2023, 12, 31), voivodeship="pomorskie"
+        )
+
+        # The year up to 2023-03-31 starts on 2022-04-01, after M1
+        assert growth["installations_added"] == 4
+        assert growth["growth_rate"] == pytest.approx(400.0)
+        assert growth["year_over_year_change_percent"] == pytest.approx(300.0)
+        assert by_region["installations_added"] == 0
+
+
+class TestGridImpact:
+    """Test cases for the vectorized grid impact engine."""
+
+    def test_hourly_indicators(self):
+        """Test generation and hosting capacity overruns against an explicit hourly matrix."""
+        profile = np.array([0.0, 0.5, 1.0, 0.5])
+        capacities = np.array([10.0, 100.0, 40.0])
+        counts = np.array([1, 4, 0])
+        hosting = np.array([np.nan, 50.0, 100.0])
+
+        indicators = hourly_indicators(capacities, counts, hosting, profile)
+        generation = (capacities * coincidence_factor(counts))[:, None] * profile[None, :]
+        excess = np.where(generation > hosting[:, None], generation - hosting[:, None], 0.0)
+
+        # 100 kW of 4 installations coincide at 0.8 + 0.2 / 2 = 0.9: 0, 45, 90, 45 kW
+        assert indicators["peak_generation_kw"].tolist() == pytest.approx([10.0, 90.0, 40.0])
+        assert indicators["hours_over_hosting_capacity"].tolist() == [0, 1, 0]
+        assert indicators["energy_over_hosting_capacity_kwh"][1] == pytest.approx(40.0)
+        assert indicators["utilisation"][1:].tolist() == pytest.approx([1.8, 0.4])
+        assert np.isnan(indicators["utilisation"][0])
+        assert np.allclose(indicators["energy_kwh"], generation.sum(axis=1))
+        assert np.allclose(indicators["energy_over_hosting_capacity_kwh"], excess.sum(axis=1))
+        assert coincidence_factor(np.array([1, 10_000]))[1] == pytest.approx(0.802)
+
+    def test_analyze_grid_impact(self):
+        """Test roll-up of linked, unknown and unlinked installations to voltage levels and municipalities."""
+        installations = [
+            Microinstallation("M1", 10.0, date(2023, 5, 1), "slaskie", "Gliwice", connection_id="C1"),
+            Microinstallation("M2", 10.0, date(2023, 5, 1), "slaskie", "Gliwice", connection_id="C1"),
+            Microinstallation("M3", 5.0, date(2023, 5, 1), "slaskie", "Zabrze", connection_id="C2"),
+            Microinstallation("M4", 3.0, date(2023, 5, 1), "opolskie", "Nysa", connection_id="C9"),
+            Microinstallation("M5", 2.0, date(2023, 5, 1), "opolskie", "Nysa"),
+        ]
+        connections = [
+            GridConnection("C1", "nN", hosting_capacity_kw=10.0),
+            GridConnection("C2", "SN", hosting_capacity_kw=100.0),
+        ]
+
+        impact = analyze_grid_impact(iter_chunks([], 1), connections)
+        assert impact["grid_impact"] == 0.0
+
+        impact = analyze_grid_impact(installations, connections, profile=np.array([0.5, 1.0]))
+        levels = impact["by_voltage_level"]
+
+        assert impact["installation_count"] == 5
+        assert impact["grid_impact"] == pytest.approx(30.0 * coincidence_factor(np.array([5]))[0])
+        assert levels["nN"]["installed_capacity_kw"] == 20.0
+        assert levels["nN"]["overloaded_connections"] == 1
+        assert levels["SN"]["utilisation"] == pytest.approx(0.05)
+        assert levels["unassigned"]["installation_count"] == 2
+        assert np.isnan(levels["unassigned"]["hosting_capacity_kw"])
+        assert impact["by_municipality"]["slaskie"]["Gliwice"]["installed_capacity_kw"] == 20.0
+        assert impact["by_municipality"]["opolskie"]["Nysa"]["energy_kwh"] == pytest.approx(
+            5.0 * coincidence_factor(np.array([2]))[0] * 1.5
+        )
+
+
+class TestGenerationSimulation:
+    """Test cases for the hourly PV generation simulation."""
+
+    def test_yield_profiles(self):
+        """Test that profiles cover every hour and sum to each voivodeship's annual yield."""
+        regions, profiles = hourly_yield_profiles(2024)
+
+        assert profiles.shape == (len(regions) + 1, 8784)
+        assert profiles[regions.index("lubelskie")].sum() == pytest.approx(1040.0)
+        assert profiles[:, :4].max() == 0.0
+        assert profiles[:, 4380:4392].max() > 0.0
+
+    def test_diacritic_voivodeships_select_own_profile(self):
+        """Test that registry spellings with Polish diacritics select their voivodeship's profile."""
+        regions, profiles = hourly_yield_profiles(2023)
+        chunk = MicroinstallationChunk.from_microinstallations(
+            [
+                Microinstallation("M1", 1.0, date(2022, 1, 1), "śląskie", "Gliwice"),
+                Microinstallation("M2", 1.0, date(2022, 1, 1), "ŁÓDZKIE", "Łódź"),
+                Microinstallation("M3", 1.0, date(2022, 1, 1), "Dolnośląskie", "Wrocław"),
+            ]
+        )
+
+        energy = installation_yield(chunk, 2023)
+
+        for position, region in enumerate(["slaskie", "lodzkie", "dolnoslaskie"]):
+            assert energy[position] == pytest.approx(profiles[regions.index(region)].sum())
+        assert energy[0] != pytest.approx(profiles[-1].sum())
+
+    def test_curves_match_installation_sums(self):
+        """Test that aggregated curves equal the sum of explicit per-installation curves."""
+        installations = [
+            Microinstallation("M1", 10.0, date(2021, 3, 1), "slaskie", "Gliwice"),
+            Microinstallation("M2", 4.0, date(2023, 7, 1), "slaskie", "Zabrze"),
+            Microinstallation("M3", 6.0, date(2023, 2, 10), "Pomorskie", "Gdynia"),
+            Microinstallation("M4", 3.0, date(2023, 5, 5), "nieznane", "Nysa"),
+            Microinstallation("M5", 8.0, date(2024, 1, 1), "slaskie", "Gliwice"),
+        ]
+        chunks = [
+            MicroinstallationChunk.from_microinstallations(part) for part in (installations[:2], installations[2:])
+        ]
+        regions, profiles = hourly_yield_profiles(2023)
+        hours = np.arange(np.datetime64("2023-01-01T00", "h"), np.datetime64("2024-01-01T00", "h"))
+        expected = {}
+        installation_curves = []
+        for inst in installations:
+            row = regions.index(inst.voivodeship.lower()) if inst.voivodeship.lower() in regions else len(regions)
+            curve = inst.capacity_kw * profiles[row] * (hours >= np.datetime64(inst.commissioning_date, "h"))
+            installation_curves.append(curve)
+            expected[inst.voivodeship] = expected.get(inst.voivodeship, 0.0) + curve
+
+        simulation = simulate_generation(chunks, 2023)
+        curves = simulation.voivodeship_curves()
+        blocks = list(simulation.municipality_curves(block_size=2))
+        energy = installation_yield(MicroinstallationChunk.from_microinstallations(installations), 2023)
+
+        assert sorted(curves) == sorted(expected)
+        for voivodeship, curve in expected.items():
+            assert np.allclose(curves[voivodeship], curve)
+        assert [len(cells) for cells, _ in blocks] == [2, 2]
+        assert np.allclose(sum(block.sum(axis=0) for _, block in blocks), simulation.total_curve())
+        assert energy.tolist() == pytest.approx([curve.sum() for curve in installation_curves])
+        assert energy[-1] == 0.0
+
+    def test_process_pool_and_merge(self):
+        """Test that pooled reduction matches the serial one and years cannot be mixed."""
+        chunks = list(iter_chunks(export_rows(0, 40), chunk_size=7))
+
+        serial = simulate_generation(chunks, 2023)
+        pooled = simulate_generation(iter(chunks), 2023, max_workers=2)
+
+        assert sorted(pooled.cells) == sorted(serial.cells)
+        assert np.allclose(pooled.total_curve(), serial.total_curve())
+        with pytest.raises(ValueError):
+            serial.merge(GenerationSimulation(2022))
+
+
+class TestMicroinstallationScraper:
+    """Test cases for paged export streaming."""
+
+    @responses.activate
+    def test_html_pages(self):
+        """Test that HTML pages are followed until an empty page."""
+        serve_pages([export_rows(0, 5), export_rows(5, 8)], html_page)
+        scraper = MicroinstallationScraper()
+
+        chunks = list(scraper.iter_chunks(chunk_size=4))
+
+        assert [len(chunk) for chunk in chunks] == [4, 4]
+        assert sum((chunk.installation_id.decode() for chunk in chunks), []) == [f"M{i}" for i in range(8)]
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_overlapping_pages_counted_once(self):
+        """Test that rows repeated by a shifted page are dropped before aggregation."""
+        serve_pages([export_rows(0, 5), export_rows(3, 8), export_rows(7, 9)], html_page)
+        mapper = MicroinstallationMapper()
+
+        ids = [row[0] for row in mapper.scraper.iter_rows() if row[0].startswith("M")]
+
+        assert ids == [f"M{i}" for i in range(9)]
+        assert mapper.aggregates.installation_count == 9
+        assert mapper.cohorts.totals_at(date(2023, 5, 1))[0] == 9
+
+    @responses.activate
+    def test_csv_export_ignoring_page_parameter(self):
+        """Test that paging stops when a CSV page repeats the previous one."""
+        responses.add(responses.GET, EXPORT_URL, body=csv_page(export_rows(0, 6)), content_type="text/csv")
+        scraper = MicroinstallationScraper(export_format="csv")
+
+        installations = scraper.fetch_microinstallations(voivodeship="małopolskie")
+
+        assert [inst.installation_id for inst in installations] == ["M1", "M4"]
+        assert [inst.municipality for inst in installations] == ["Kraków", "Łódź"]
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_xlsx_export(self):
+        """Test reading a spreadsheet export with typed cells."""
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["ID", "Moc", "Data", "Woj.", "Gmina"])
+        sheet.append(["M1", 4.2, date(2023, 5, 1), "slaskie", "Gliwice"])
+        content = io.BytesIO()
+        workbook.save(content)
+        responses.add(responses.GET, EXPORT_URL, body=content.getvalue())
+
+        chunks = list(MicroinstallationScraper().iter_chunks(export_format="xlsx", paged=False))
+
+        assert chunks[0].to_microinstallations() == [
+            Microinstallation("M1", 4.2, date(2023, 5, 1), "slaskie", "Gliwice")
+        ]
+
+    def test_unsupported_format(self):
+        """Test rejecting unknown export formats."""
+        with pytest.raises(ValueError):
+            MicroinstallationScraper(export_format="json")
+        with pytest.raises(ValueError):
+            next(MicroinstallationScraper().iter_rows(export_format="json"))
+
+
+class TestMicroinstallationMapper:
+    """Test cases for chunk-by-chunk aggregation in the mapper."""
+
+    @responses.activate
+    def test_regional_statistics_and_region_lookup(self):
+        """Test that statistics are aggregated once and region lookups stream matching rows."""
+        serve_pages([export_rows(0, 10), export_rows(10, 20)], html_page)
+        mapper = MicroinstallationMapper(chunk_size=3)
+
+        stats = mapper.generate_regional_statistics()
+        municipal = mapper.generate_municipal_statistics("łódzkie")
+        requests_after_aggregation = len(responses.calls)
+        by_region = mapper.get_microinstallations_by_region("śląskie")
+
+        growth = mapper.calculate_prosumer_growth(date(2023, 5, 1), date(2023, 5, 1))
+        mapper.add_chunks(iter_chunks([["M99", "2,0", "2023-06-01", "opolskie", "Nysa"]]))
+
+        assert stats["łódzkie"]["installation_count"] == 7
+        assert sorted(municipal) == sorted(MUNICIPALITIES)
+        assert requests_after_aggregation == 3
+        assert growth["installations_added"] == 20
+        assert mapper.cohorts.totals_at(date(2023, 6, 30), "opolskie") == (1, 2.0)
+        assert mapper.generate_regional_statistics()["opolskie"]["installation_count"] == 1
+        assert [inst.installation_id for inst in by_region] == [f"M{i}" for i in range(2, 20, 3)]
@@ -0,0 +1,59 @@
+"""
+Unit tests for HTML table parser backends.
+"""
+
+import pytest
+
+from polish_energy_regulatory_office.parsers import (
+    BeautifulSoupTableParser,
+    FallbackTableParser,
+    LxmlTableParser,
+    declared_charset,
+    get_table_parser,
+    stream_rows,
+)
+
+PAGE = """
+<html><body><table>
+<tr><th>ID</th><th>Name</th></tr>
+<tr><td> A1 </td><td>Farm <b>North</b></td></tr>
+<tr><td>A2</td><td></td></tr>
+</table></body></html>
+"""
+
+
+class TestTableParsers:
+    """Test cases for table parser backends."""
+
+    @pytest.mark.parametrize("parser", [LxmlTableParser(), BeautifulSoupTableParser(), get_table_parser()])
+    def test_backends_extract_same_rows(self, parser):
+        """Test that all backends return identical cell text."""
+        assert parser.extract_rows(PAGE) == [[], ["A1", "FarmNorth"], ["A2", ""]]
+
+    def test_fallback_used_when_primary_fails(self):
+        """Test fallback to BeautifulSoup for pages lxml rejects."""
+        parser = get_table_parser()
+
+        assert isinstance(parser, FallbackTableParser)
+        assert parser.extract_rows("") == []
+        assert parser.extract_rows(b"<tr><td>1</td></tr>") == [["1"]]
+
+    def test_unknown_backend(self):
+        """Test error for unsupported backend names."""
+        with pytest.raises(ValueError, match="Unsupported parser backend"):
+            get_table_parser("regex")
+
+    def test_stream_rows_keeps_nested_table_text(self):
+        """Test that a table nested in a cell keeps its text in the enclosing row."""
+        page = b"<table><tr><td>A1</td><td><table><tr><td>x</td><td>y</td></tr></table></td></tr></table>"
+
+        rows = list(stream_rows(page[i : i + 8] for i in range(0, len(page), 8)))
+
+        assert rows == [["x", "y"], ["A1", "xy", "x", "y"]]
+        assert sorted(rows) == sorted(LxmlTableParser().extract_rows(page))
+
+    def test_declared_charset(self):
+        """Test that only an explicit charset parameter is reported."""
+        assert declared_charset("text/html; charset=UTF-8") == "utf-8"
+        assert declared_charset("text/html") is None
+        assert declared_charset(None) is None
@@ -0,0 +1,864 @@
+"""
+Unit tests for renewable energy sources mapper module.
+"""
+
+import io
+import json
+import re
+from dataclasses import replace
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+import responses
+
+from polish_energy_regulatory_office.columns import TextColumn
+from polish_energy_regulatory_office.parsers import BeautifulSoupTableParser
+from polish_energy_regulatory_office.renewable_energy_sources_mapper import (
+    CapacityCube,
+    ClusterPyramid,
+    CompactInstallation,
+    InstallationQuery,
+    InstallationTable,
+    InstallationType,
+    RegistryAggregates,
+    RenewableEnergyMapper,
+    RenewableInstallation,
+    RESRegistryScraper,
+    SnapshotStore,
+    SpatialIndex,
+    TableIndex,
+    analyze_installation_trends,
+    calculate_capacity_growth,
+    diff_tables,
+    find_optimal_locations,
+    generate_geospatial_data,
+    haversine_km,
+    iter_geojson,
+    write_geojson,
+)
+from polish_energy_regulatory_office.renewable_energy_sources_mapper.crawl import (
+    CrawlCheckpoint,
+    CrawlResult,
+    CrawlTask,
+    IncompleteCrawlError,
+    TokenBucket,
+)
+from polish_energy_regulatory_office.renewable_energy_sources_mapper.geospatial import mercator
+from polish_energy_regulatory_office.renewable_energy_sources_mapper.models import (
+    EARLIEST_COMMISSIONING_DATE,
+    plausible_commissioning_date,
+)
+
+REGISTRY_PAGE = """
+<table>
+<tr><th>ID</th><th>Nazwa</th><th>Moc</th><th>Data</th><th>Woj.</th><th>Gmina</th><th>Operator</th><th>Status</th></tr>
+<tr><td>OZE001</td><td>Farma PV</td><td>1000,5</td><td>2023-06-15</td><td>mazowieckie</td><td>Warszawa</td>
+<td>Energa</td><td>active</td></tr>
+<tr><td>OZE002</td><td>Broken</td><td>n/a</td><td>2023-06-15</td><td>mazowieckie</td><td>Warszawa</td>
+<td>Energa</td><td>active</td></tr>
+</table>
+"""
+
+
+class TestRESRegistryScraper:
+    """Test cases for RESRegistryScraper."""
+
+    @pytest.mark.parametrize("parser", [None, BeautifulSoupTableParser()])
+    def test_parse_html_installations(self, parser):
+        """Test parsing registry rows with each parser backend."""
+        scraper = RESRegistryScraper(parser=parser)
+
+        installations = scraper._parse_html_installations(REGISTRY_PAGE)
+
+        assert [inst.installation_id for inst in installations] == ["OZE001"]
+        assert installations[0].capacity_kw == 1000.5
+        assert installations[0].commissioning_date == date(2023, 6, 15)
+
+    def test_parse_rejects_implausible_commissioning_date(self):
+        """Test that rows with mistyped commissioning years are skipped."""
+        scraper = RESRegistryScraper()
+        cells = ["OZE001", "Farm", "1000,5", "0001-01-01", "mazowieckie", "Warszawa", "Operator", "active"]
+
+        assert scraper._parse_installation_row(cells) is None
+        assert scraper._parse_installation_row(cells[:3] + ["1936-05-01"] + cells[4:]) is not None
+        assert plausible_commissioning_date(EARLIEST_COMMISSIONING_DATE)
+        assert not plausible_commissioning_date(date.today() + timedelta(days=400))
+        assert not plausible_commissioning_date(date(1936, 5, 1), earliest=date(1990, 1, 1))
+
+    def test_iter_installations_from_chunks(self):
+        """Test streaming parse over small chunks matches the DOM parser."""
+        scraper = RESRegistryScraper()
+        content = REGISTRY_PAGE.encode("utf-8")
+
+        streamed = list(scraper.iter_installations(content[i : i + 16] for i in range(0, len(content), 16)))
+
+        assert streamed == scraper._parse_html_installations(REGISTRY_PAGE)
+
+    @responses.activate
+    def test_stream_export_tables(self):
+        """Test downloading an export as bounded columnar chunks."""
+        url = "https://www.ure.gov.pl/export.html"
+        rows = "".join(
+            f"<tr><td>OZE{i}</td><td>PV</td><td>{i},5</td><td>2023-06-15</td><td>opolskie</td><td>Nysa</td>"
+            "<td>Tauron</td><td>active</td></tr>"
+            for i in range(5)
+        )
+        responses.add(responses.GET, url, body=f"<table><tr><th>ID</th></tr>{rows}</table>")
+
+        chunks = list(RESRegistryScraper().stream_export_tables(url, rows_per_chunk=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert chunks[2].installation_id.decode() == ["OZE4"]
+        assert chunks[0].capacity_kw.tolist() == [0.5, 1.5]
+
+    @responses.activate
+    def test_stream_export_without_declared_charset(self):
+        """Test that a UTF-8 page served without a charset is decoded from its meta tag."""
+        url = "https://www.ure.gov.pl/export.html"
+        page = (
+            '<html><head><meta charset="utf-8"></head><body><table><tr><th>ID</th></tr>'
+            "<tr><td>OZE1</td><td>Farma Żółw</td><td>5,0</td><td>2023-06-15</td><td>łódzkie</td><td>Łódź</td>"
+            "<td>PGE</td><td>active</td></tr></table></body></html>"
+        )
+        responses.add(responses.GET, url, body=page.encode("utf-8"), content_type="text/html")
+
+        installations = list(RESRegistryScraper().stream_export(url, chunk_size=16))
+
+        assert [(inst.name, inst.voivodeship, inst.municipality) for inst in installations] == [
+            ("Farma Żółw", "łódzkie", "Łódź")
+        ]
+
+
+def registry_page(voivodeship, page, last_page=2):
+    """Render a registry page with one installation, or only the header past the last page."""
+    header = "<tr><th>ID</th><th>Nazwa</th><th>Moc</th><th>Data</th><th>Woj.</th><th>Gmina</th><th>Operator</th></tr>"
+    if page > last_page:
+        return f"<table>{header}</table>"
+    cells = [f"{voivodeship}-{page}", "PV", "10,0", "2024-01-02", voivodeship, "Gmina", "Operator", "active"]
+    return f"<table>{header}<tr>{''.join(f'<td>{cell}</td>' for cell in cells)}</tr></table>"
+
+
+class TestRegistryCrawler:
+    """Test cases for the concurrent registry crawl."""
+
+    @pytest.fixture
+    def scraper(self, tmp_path):
+        """Scraper with a fast rate limit, no backoff and a checkpoint file."""
+        scraper = RESRegistryScraper(requests_per_second=1000.0, checkpoint_path=tmp_path / "crawl.jsonl")
+        scraper.crawler.backoff = 0.0
+        return scraper
+
+    @staticmethod
+    def serve(requested, failures=None):
+        """Register a callback serving registry pages and recording requested pages."""
+        failures = failures if failures is not None else {}
+
+        def callback(request):
+            """Render the page selected by query parameters."""
+            params = dict(item.split("=") for item in request.url.split("?")[1].split("&"))
+            key = (request.url.split("?")[0], params["wojewodztwo"], int(params["page"]))
+            requested.append(key)
+            if failures.get(key, 0) > 0:
+                failures[key] -= 1
+                return 503, {}, "unavailable"
+            return 200, {}, registry_page(params["wojewodztwo"], int(params["page"]))
+
+        responses.add_callback(responses.GET, re.compile(r"https://www\.ure\.gov\.pl/.*"), callback=callback)
+
+    @responses.activate
+    def test_crawl_all_pages(self, scraper):
+        """Test that every voivodeship and endpoint is paged to the end and IDs deduplicated."""
+        requested = []
+        self.serve(requested)
+
+        result = scraper.crawl(["opolskie", "lubuskie"])
+
+        assert result.is_complete
+        assert result.pages_fetched == 12
+        assert len(requested) == 12
+        assert [inst.installation_id for inst in result.installations] == [
+            "opolskie-1",
+            "opolskie-2",
+            "lubuskie-1",
+            "lubuskie-2",
+        ]
+        assert not scraper.crawler.checkpoint.path.exists()
+
+    @responses.activate
+    def test_retry_and_resume(self, scraper):
+        """Test transient failures are retried and a failed crawl resumes from its checkpoint."""
+        requested = []
+        url = scraper.BASE_URL + scraper.REGISTRY_ENDPOINTS["installations"]
+        self.serve(requested, failures={(url, "opolskie", 1): 1, (url, "opolskie", 2): 4})
+
+        first = scraper.crawler.crawl(["opolskie"], endpoints=["installations"])
+
+        assert first.errors.keys() == {"installations/opolskie/2"}
+        assert requested.count((url, "opolskie", 1)) == 2
+        assert CrawlTask("installations", "opolskie", 1) in CrawlCheckpoint(scraper.crawler.checkpoint.path).load()
+
+        requested.clear()
+        second = scraper.crawler.crawl(["opolskie"], endpoints=["installations"])
+
+        assert second.is_complete
+        assert second.pages_resumed == 1
+        assert requested == [(url, "opolskie", 2), (url, "opolskie", 3)]
+        assert len(second.installations) == 2
+
+    @responses.activate
+    def test_stale_checkpoint_is_discarded(self, scraper):
+        """Test that a checkpoint older than the maximum age is cleared instead of resumed."""
+        requested = []
+        url = scraper.BASE_URL + scraper.REGISTRY_ENDPOINTS["installations"]
+        self.serve(requested, failures={(url, "opolskie", 2): 4})
+        scraper.crawler.crawl(["opolskie"], endpoints=["installations"])
+        path = scraper.crawler.checkpoint.path
+        header, *entries = path.read_text(encoding="utf-8").splitlines()
+        stale = dict(json.loads(header), started_at=json.loads(header)["started_at"] - 2 * 24 * 3600)
+        path.write_text("\n".join([json.dumps(stale), *entries]) + "\n", encoding="utf-8")
+
+        assert CrawlCheckpoint(path, max_age=None).load()
+        assert CrawlCheckpoint(path).load() == {}
+        assert not path.exists()
+
+        path.write_text("\n".join([json.dumps(stale), *entries]) + "\n", encoding="utf-8")
+        requested.clear()
+        result = scraper.crawler.crawl(["opolskie"], endpoints=["installations"])
+
+        assert result.is_complete
+        assert result.pages_resumed == 0
+        assert requested == [(url, "opolskie", 1), (url, "opolskie", 2), (url, "opolskie", 3)]
+
+    @responses.activate
+    def test_fetch_installations_refuses_incomplete_crawl(self, scraper):
+        """Test that fetching raises with the partial result when a page keeps failing."""
+        url = scraper.BASE_URL + scraper.REGISTRY_ENDPOINTS["installations"]
+        self.serve([], failures={(url, "opolskie", 2): 10})
+
+        with pytest.raises(IncompleteCrawlError) as error:
+            scraper.fetch_installations(voivodeship="opolskie")
+
+        assert error.value.result.errors.keys() == {"installations/opolskie/2"}
+        assert "opolskie-1" in [inst.installation_id for inst in error.value.result.installations]
+
+    def test_token_bucket(self):
+        """Test that the bucket allows a burst and then spaces requests at the configured rate."""
+        now = [0.0]
+        sleeps = []
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleeps.append)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+        assert sleeps == [0.5, 1.0]
+
+
+def make_installation(installation_id, installation_type, capacity_kw, voivodeship, municipality, **kwargs):
+    """Build installation with default name, date and operator."""
+    return RenewableInstallation(
+        installation_id=installation_id,
+        name=kwargs.pop("name", f"Installation {installation_id}"),
+        installation_type=installation_type,
+        capacity_kw=capacity_kw,
+        commissioning_date=kwargs.pop("commissioning_date", date(2023, 6, 15)),
+        voivodeship=voivodeship,
+        municipality=municipality,
+        operator=kwargs.pop("operator", "Energa"),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def registry():
+    """Small registry spanning two voivodeships and three municipalities."""
+    return [
+        make_installation(
+            "A1", InstallationType.SOLAR_PV, 100.0, "mazowieckie", "Warszawa", latitude=52.2, longitude=21.0
+        ),
+        make_installation("A2", InstallationType.WIND, 2000.0, "mazowieckie", "Radom"),
+        make_installation("A3", InstallationType.SOLAR_PV, 50.0, "mazowieckie", "warszawa", technology="mono-Si"),
+        make_installation("B1", InstallationType.BIOGAS, 500.0, "pomorskie", "Gdansk", status="inactive"),
+        make_installation("B2", InstallationType.SOLAR_PV, 300.0, "pomorskie", "Gdansk"),
+    ]
+
+
+@pytest.fixture
+def mapper(registry):
+    """Mapper backed by a mocked registry scraper."""
+    mapper = RenewableEnergyMapper()
+    mapper.scraper = Mock()
+    mapper.scraper.fetch_installations.return_value = registry
+    return mapper
+
+
+class TestCompactInstallation:
+    """Test cases for the slotted installation representation."""
+
+    def test_round_trip_and_interning(self, registry, mocker):
+        """Test conversion from regular installations shares categorical strings without re-validating."""
+        from_records = mocker.spy(CompactInstallation, "from_records")
+        to_dict = mocker.spy(RenewableInstallation, "to_dict")
+
+        compact = CompactInstallation.from_installations(registry)
+
+        assert from_records.call_count == to_dict.call_count == 0
+        assert CompactInstallation.from_installations(compact) == compact
+        assert not hasattr(compact[0], "__dict__")
+        assert [inst.to_installation() for inst in compact] == registry
+        assert compact[0].voivodeship is compact[1].voivodeship
+        assert InstallationTable.from_installations(compact).to_installations() == registry
+
+    def test_from_records_validates_batch(self, registry):
+        """Test that an invalid row rejects the whole batch before any object is built."""
+        records = [inst.to_dict() for inst in registry]
+        records[3]["capacity_kw"] = -1.0
+
+        with pytest.raises(ValueError, match="row 3"):
+            CompactInstallation.from_records(records)
+        with pytest.raises(ValueError):
+            CompactInstallation("", "x", InstallationType.WIND, 1.0, date(2024, 1, 1), "a", "b", "c")
+
+
+class TestInstallationTable:
+    """Test cases for the columnar installation table."""
+
+    def test_round_trip(self, registry):
+        """Test that installations survive conversion to columns and back."""
+        table = InstallationTable.from_installations(registry)
+
+        assert len(table) == 5
+        assert table.to_installations() == registry
+        assert table.voivodeship.categories == ["mazowieckie", "pomorskie"]
+        assert table.installation_type.categories[0] == InstallationType.SOLAR_PV.value
+        assert np.isnan(table.latitude[1])
+        assert table.technology.codes.tolist() == [-1, -1, 0, -1, -1]
+
+    def test_mask(self, registry):
+        """Test combined vectorized predicates."""
+        table = InstallationTable.from_installations(registry)
+
+        mask = table.mask(
+            voivodeship="mazowieckie", municipality="WARSZAWA", installation_type=InstallationType.SOLAR_PV
+        )
+
+        assert table.installation_id.decode(mask) == ["A1", "A3"]
+        assert not table.mask(voivodeship="opolskie").any()
+        assert table.mask(status="inactive", min_capacity_kw=100).sum() == 1
+
+    def test_group_totals(self, registry):
+        """Test dense bincount group-by over two columns."""
+        table = InstallationTable.from_installations(registry)
+
+        counts, capacities = table.group_totals(table.voivodeship, table.installation_type)
+
+        assert counts.shape == (2, len(InstallationType))
+        assert counts.sum() == 5
+        assert capacities[1].sum() == 800.0
+        assert counts[0, 0] == 2
+
+    def test_empty(self):
+        """Test that an empty registry produces an empty table."""
+        table = InstallationTable.from_installations([])
+
+        counts, _ = table.group_totals(table.voivodeship)
+        assert len(table) == 0
+        assert counts.shape == (0,)
+        assert table.to_installations() == []
+
+
+class TestInstallationQuery:
+    """Test cases for indexed queries and result cursors, checked against table masks."""
+
+    @pytest.mark.parametrize(
+        "predicates",
+        [
+            {},
+            {"municipality": "WARSZAWA"},
+            {"voivodeship": "mazowieckie", "installation_type": InstallationType.SOLAR_PV},
+            {"voivodeship": "pomorskie", "status": "active", "min_capacity_kw": 100.0},
+            {"min_capacity_kw": 60.0, "max_capacity_kw": 500.0},
+            {"municipality": "nowhere"},
+        ],
+    )
+    def test_matches_mask(self, registry, predicates):
+        """Test that indexed positions equal the full-scan mask."""
+        table = InstallationTable.from_installations(registry)
+
+        positions = InstallationQuery(**predicates).positions(TableIndex(table))
+
+        assert positions.tolist() == np.flatnonzero(table.mask(**predicates)).tolist()
+
+    def test_cursor_pages(self, mapper):
+        """Test paging through a query result."""
+        cursor = mapper.query(voivodeship="mazowieckie", page_size=2)
+
+        assert len(cursor) == 3
+        assert cursor.page_count == 2
+        assert [inst.installation_id for inst in cursor.page(2)] == ["A3"]
+        assert [[inst.installation_id for inst in page] for page in cursor.pages()] == [["A1", "A2"], ["A3"]]
+        assert [inst.installation_id for inst in cursor.fetch(1, 5)] == ["A2", "A3"]
+        with pytest.raises(ValueError):
+            cursor.page(0)
+
+
+class TestRegistryAggregates:
+    """Test cases for single-pass registry aggregates."""
+
+    def test_reductions(self, registry):
+        """Test that totals, per-type and regional reductions agree with the registry."""
+        aggregates = RegistryAggregates.from_table(InstallationTable.from_installations(registry))
+
+        assert aggregates.counts.shape == (4, 2, len(InstallationType))
+        assert aggregates.installation_count == 5
+        assert aggregates.total_capacity_kw == 2950.0
+        assert aggregates.by_type()["wind"] == {"count": 1, "capacity_kw": 2000.0}
+        assert list(aggregates.regional_statistics()) == ["mazowieckie", "pomorskie"]
+
+    def test_reports_share_one_pass(self, mapper, mocker):
+        """Test that all report methods read one cached aggregation."""
+        spy = mocker.spy(InstallationTable, "group_totals")
+
+        mapper.generate_regional_statistics()
+        mapper.get_top_municipalities()
+        mapper.generate_summary_report()
+        mapper.analyze_capacity_trends()
+
+        assert spy.call_count == 1
+        assert mapper.scraper.fetch_installations.call_count == 1
+
+
+class TestCapacityCube:
+    """Test cases for cumulative capacity cube period queries, checked against a rescan."""
+
+    @pytest.fixture
+    def history(self):
+        """Installations commissioned over ten years in three voivodeships."""
+        rng = np.random.default_rng(11)
+        voivodeships = ["mazowieckie", "pomorskie", "slaskie"]
+        types = list(InstallationType)
+        days = rng.integers(0, 3650, 400)
+        return [
+            make_installation(
+                f"H{index}",
+                types[rng.integers(0, 3)],
+                float(rng.integers(1, 100)),
+                voivodeships[rng.integers(0, 3)],
+                "Gmina",
+                commissioning_date=date.fromordinal(date(2014, 1, 1).toordinal() + int(day)),
+            )
+            for index, day in enumerate(days)
+        ]
+
+    def test_period_growth_matches_rescan(self, history):
+        """Test additions, base capacity and breakdown of a period against a full scan."""
+        cube = CapacityCube.from_table(InstallationTable.from_installations(history))
+        start, end = date(2017, 3, 10), date(2019, 8, 2)
+
+        analysis = cube.growth(start, end)
+        added = [inst for inst in history if date(2017, 3, 1) <= inst.commissioning_date < date(2019, 9, 1)]
+        base = sum(inst.capacity_kw for inst in history if inst.commissioning_date < date(2017, 3, 1))
+        pomorskie = sum(inst.capacity_kw for inst in added if inst.voivodeship == "pomorskie")
+
+        assert analysis.installations_added == len(added)
+        assert analysis.total_capacity_added_kw == pytest.approx(sum(inst.capacity_kw for inst in added))
+        assert analysis.growth_rate_percent == pytest.approx(analysis.total_capacity_added_kw / base * 100)
+        assert analysis.regional_breakdown["pomorskie"] == pytest.approx(pomorskie)
+        assert cube.growth(start, end, voivodeship="pomorskie").total_capacity_added_kw == pytest.approx(pomorskie)
+        with pytest.raises(ValueError):
+            cube.period_totals(end, start)
+
+    def test_incremental_build(self, history):
+        """Test that adding batches out of date order equals building at once."""
+        ordered = sorted(history, key=lambda inst: inst.commissioning_date)
+        cube = CapacityCube()
+        for batch in (ordered[200:300], ordered[:50], ordered[300:], ordered[50:200]):
+            cube.add(InstallationTable.from_installations(batch))
+        full = CapacityCube.from_table(InstallationTable.from_installations(history))
+
+        order = [cube.voivodeships.index(voivodeship) for voivodeship in full.voivodeships]
+        assert (cube.first_month, cube.last_month) == (full.first_month, full.last_month)
+        assert np.array_equal(cube.counts[:, order], full.counts)
+        assert np.allclose(cube.capacities[:, order], full.capacities)
+
+    def test_growth_functions(self, registry):
+        """Test growth helpers with the default trailing year and with empty input."""
+        earlier = replace(registry[0], installation_id="A0", commissioning_date=date(2022, 1, 1))
+        metrics = calculate_capacity_growth(registry + [earlier])
+        trends = analyze_installation_trends(registry + [earlier])
+
+        assert metrics == {"total_capacity": 3050.0, "growth_rate": 2950.0, "installations_count": 6}
+        assert trends.period_start == date(2022, 7, 1)
+        assert trends.dominant_technology == InstallationType.WIND
+        assert calculate_capacity_growth([]) == {"total_capacity": 0.0, "growth_rate": 0.0, "installations_count": 0}
+        assert analyze_installation_trends([]).installations_added == 0
+
+
+class TestSnapshotStore:
+    """Test cases for memory-mapped registry snapshots."""
+
+    def test_save_and_load(self, registry, tmp_path):
+        """Test that a snapshot reloads memory-mapped with identical rows."""
+        store = SnapshotStore(tmp_path)
+        store.save(InstallationTable.from_installations(registry), date(2024, 1, 31))
+
+        table = store.load()
+
+        assert isinstance(table.capacity_kw, np.memmap)
+        assert table.to_installations() == registry
+        assert table.mask(municipality="warszawa").sum() == 2
+
+    def test_text_columns_not_padded(self, registry, tmp_path, mocker):
+        """Test that identifiers and names are stored per row, not padded to the longest value."""
+        long_name = "Elektrownia słoneczna " + "Ż" * 200
+        installations = registry + [
+            make_installation("Ł1", InstallationType.HYDRO, 5.0, "śląskie", "Żywiec", name=long_name)
+        ]
+        table = InstallationTable.from_installations(installations)
+        store = SnapshotStore(tmp_path)
+        path = store.save(table, date(2024, 1, 31))
+
+        decode = mocker.spy(TextColumn, "decode")
+        loaded = store.load()
+
+        assert decode.call_count == 0
+        assert isinstance(loaded.name.data, np.memmap)
+        assert isinstance(loaded.installation_id.offsets, np.memmap)
+        assert (path / "name.bytes.npy").stat().st_size < 1024
+        assert loaded.take(np.array([len(installations) - 1])).name.decode() == [long_name]
+        assert loaded.to_installations() == installations
+
+    def test_snapshot_as_of_date(self, registry, tmp_path):
+        """Test choosing the newest snapshot on or before a date and replacing a snapshot."""
+        store = SnapshotStore(tmp_path)
+        store.save(InstallationTable.from_installations(registry[:1]), date(2024, 1, 1))
+        store.save(InstallationTable.from_installations(registry[:3]), date(2024, 2, 1))
+        store.save(InstallationTable.from_installations(registry), date(2024, 2, 1))
+
+        assert store.dates() == [date(2024, 1, 1), date(2024, 2, 1)]
+        assert len(store.load(date(2024, 1, 15))) == 1
+        assert len(store.load()) == 5
+        with pytest.raises(FileNotFoundError):
+            store.load(date(2023, 12, 31))
+
+    def test_mapper_uses_snapshot(self, mapper, registry, tmp_path):
+        """Test that a mapper seeds an empty store once and later mappers start from it."""
+        store = SnapshotStore(tmp_path)
+        mapper.snapshot_store = store
+
+        assert mapper.generate_summary_report()["total_installations"] == 5
+        assert len(store.dates()) == 1
+
+        restarted = RenewableEnergyMapper(snapshot_store=store)
+        restarted.scraper = Mock()
+        assert restarted.get_installations_by_region("pomorskie") == registry[3:]
+        restarted.scraper.fetch_installations.assert_not_called()
+
+
+class TestRegistrySync:
+    """Test cases for incremental registry sync."""
+
+    @pytest.fixture
+    def updated(self, registry):
+        """Registry with one installation removed, one re-rated and relocated, and one added."""
+        return [
+            registry[0],
+            replace(registry[1], capacity_kw=2500.0, municipality="Plock"),
+            registry[2],
+            registry[4],
+            make_installation("C1", InstallationType.HYDRO, 75.0, "opolskie", "Nysa"),
+        ]
+
+    def test_diff_tables(self, registry, updated):
+        """Test added, removed and changed records with the fields that changed."""
+        diff = diff_tables(
+            InstallationTable.from_installations(registry), InstallationTable.from_installations(updated)
+        )
+
+        feed = {change.installation_id: change for change in diff.changes()}
+
+        assert len(diff) == 3
+        assert feed["C1"].change_type == "added"
+        assert feed["B1"].change_type == "removed"
+        assert feed["A2"].change_type == "changed"
+        assert feed["A2"].changed_fields == ["capacity_kw", "municipality"]
+        assert feed["A2"].previous.capacity_kw == 2000.0
+        assert diff_tables(
+            InstallationTable.from_installations(registry), InstallationTable.from_installations(registry)
+        ).is_empty
+
+    def test_apply_diff_matches_recompute(self, registry, updated):
+        """Test that applying a diff gives the same reports as aggregating the new registry."""
+        previous = InstallationTable.from_installations(registry)
+        current = InstallationTable.from_installations(updated)
+        aggregates = RegistryAggregates.from_table(previous)
+
+        aggregates.apply_diff(diff_tables(previous, current))
+        expected = RegistryAggregates.from_table(current)
+
+        assert aggregates.regional_statistics() == expected.regional_statistics()
+        assert aggregates.top_municipalities() == expected.top_municipalities()
+        assert aggregates.by_type() == expected.by_type()
+
+    def test_mapper_sync(self, mapper, updated, mocker):
+        """Test that mapper sync updates cached aggregates and capacity cube without recomputing them."""
+        mapper.generate_summary_report()
+        mapper.analyze_installation_trends()
+        mapper.scraper.fetch_installations.return_value = updated
+        spy = mocker.spy(RegistryAggregates, "from_table")
+        cube_spy = mocker.spy(CapacityCube, "from_table")
+
+        diff = mapper.sync()
+
+        assert len(diff) == 3
+        assert mapper.generate_summary_report()["total_capacity_kw"] == 3025.0
+        assert mapper.generate_regional_statistics()["opolskie"].installation_count == 1
+        assert mapper.analyze_installation_trends().regional_breakdown == {
+            "mazowieckie": 2650.0,
+            "pomorskie": 300.0,
+            "opolskie": 75.0,
+        }
+        assert spy.call_count == 0
+        assert cube_spy.call_count == 0
+
+    def test_first_sync_is_initial_load(self, mapper, registry):
+        """Test that syncing a fresh mapper scrapes once and reports every installation as added."""
+        diff = mapper.sync()
+
+        assert mapper.scraper.fetch_installations.call_count == 1
+        assert len(diff.added) == len(registry)
+        assert len(mapper.table) == len(registry)
+
+    def test_diff_rejects_duplicate_ids(self, registry):
+        """Test that repeated installation IDs are rejected instead of mismatched."""
+        table = InstallationTable.from_installations(registry)
+        duplicated = InstallationTable.from_installations(registry + [registry[0]])
+
+        with pytest.raises(ValueError, match="A1"):
+            diff_tables(table, duplicated)
+
+    def test_mapper_refuses_incomplete_crawl(self, mapper, tmp_path):
+        """Test that a partial crawl neither syncs, snapshots nor loads a table."""
+        report = mapper.generate_summary_report()
+        mapper.snapshot_store = SnapshotStore(tmp_path)
+        mapper.scraper.fetch_installations.side_effect = IncompleteCrawlError(CrawlResult(errors={"page": "503"}))
+
+        with pytest.raises(IncompleteCrawlError):
+            mapper.sync()
+        with pytest.raises(IncompleteCrawlError):
+            mapper.save_snapshot()
+        with pytest.raises(IncompleteCrawlError):
+            mapper.refresh()
+
+        assert mapper.snapshot_store.latest() is None
+        assert report == RenewableEnergyMapper.generate_summary_report(mapper)
+
+
+class TestSpatialIndex:
+    """Test cases for the haversine grid index, checked against brute force."""
+
+    @pytest.fixture
+    def points(self):
+        """Random coordinates over Poland, some of them missing."""
+        rng = np.random.default_rng(7)
+        latitudes = rng.uniform(49.0, 54.8, 3000)
+        longitudes = rng.uniform(14.1, 24.1, 3000)
+        latitudes[::100] = np.nan
+        return latitudes, longitudes
+
+    def test_haversine(self):
+        """Test distance between Warsaw and Krakow."""
+        assert haversine_km(52.2297, 21.0122, 50.0647, 19.9450) == pytest.approx(252.0, abs=1.0)
+
+    def test_radius_and_bbox(self, points):
+        """Test radius and bounding box queries."""
+        latitudes, longitudes = points
+        index = SpatialIndex(latitudes, longitudes, cell_km=10.0)
+
+        positions, distances = index.query_radius(52.0, 19.0, 25.0)
+        brute = haversine_km(52.0, 19.0, latitudes, longitudes)
+
+        assert len(index) == 2970
+        assert set(positions) == set(np.flatnonzero(brute <= 25.0))
+        assert np.all(np.diff(distances) >= 0)
+        inside = (latitudes >= 50) & (latitudes <= 51) & (longitudes >= 20) & (longitudes <= 22)
+        assert index.query_bbox(50.0, 20.0, 51.0, 22.0).tolist() == np.flatnonzero(inside).tolist()
+
+    def test_wide_radius_batch_in_blocks(self, points, mocker):
+        """Test that a radius reaching every cell checks queries in bounded blocks with exact results."""
+        latitudes, longitudes = points
+        index = SpatialIndex(latitudes, longitudes, cell_km=10.0)
+        query_lat, query_lon = latitudes[:50], longitudes[:50]
+        mocker.patch(
+            "polish_energy_regulatory_office.renewable_energy_sources_mapper.spatial.MAX_CANDIDATE_PAIRS", 7000
+        )
+        candidates = mocker.spy(index, "_candidates")
+
+        query, positions, distances = index.query_radius_batch(query_lat, query_lon, 400.0)
+        brute = haversine_km(query_lat[:, None], query_lon[:, None], latitudes[None, :], longitudes[None, :])
+
+        assert candidates.call_count == 25
+        assert max(len(call.args[0]) for call in candidates.call_args_list) == 2
+        assert sorted(zip(query.tolist(), positions.tolist())) == sorted(
+            zip(*(axis.tolist() for axis in np.nonzero(brute <= 400.0)))
+        )
+        assert distances.max() <= 400.0
+
+    def test_nearest(self, points):
+        """Test k-nearest neighbours."""
+        latitudes, longitudes = points
+        index = SpatialIndex(latitudes, longitudes, cell_km=2.0)
+
+        positions, distances = index.nearest(50.5, 17.5, k=5)
+        brute = haversine_km(50.5, 17.5, latitudes, longitudes)
+
+        assert positions.tolist() == np.argsort(np.nan_to_num(brute, nan=np.inf))[:5].tolist()
+        assert distances[0] == pytest.approx(np.nanmin(brute))
+
+    def test_find_optimal_locations(self, registry):
+        """Test that candidates close to existing installations are rejected."""
+        candidates = [
+            (52.21, 21.0),
+            (52.5, 21.0),
+            (None, None),
+            make_installation(
+                "X", InstallationType.WIND, 1.0, "mazowieckie", "Warszawa", latitude=52.2, longitude=21.05
+            ),
+        ]
+
+        accepted = find_optimal_locations(registry, candidates, min_distance_km=5.0)
+
+        assert accepted == [(52.5, 21.0)]
+        assert find_optimal_locations(registry, candidates[:2], min_distance_km=0.5) == candidates[:2]
+
+
+class TestGeospatialExport:
+    """Test cases for GeoJSON export and zoom-level clustering."""
+
+    def test_generate_geospatial_data(self, registry):
+        """Test that only installations with coordinates become map points."""
+        points = generate_geospatial_data(registry)
+
+        assert [(point.installation_id, point.latitude, point.longitude) for point in points] == [("A1", 52.2, 21.0)]
+
+    def test_cluster_pyramid_conserves_totals(self):
+        """Test that every zoom level holds all installations and capacity."""
+        rng = np.random.default_rng(3)
+        installations = [
+            make_installation(
+                f"P{index}",
+                InstallationType.SOLAR_PV,
+                10.0,
+                "mazowieckie",
+                "Warszawa",
+                latitude=float(rng.uniform(49.0, 54.8)),
+                longitude=float(rng.uniform(14.1, 24.1)),
+            )
+            for index in range(500)
+        ]
+        pyramid = ClusterPyramid.build(InstallationTable.from_installations(installations), max_zoom=12)
+
+        sizes = [len(pyramid.level(zoom)) for zoom in range(13)]
+        assert all(int(pyramid.level(zoom).count.sum()) == 500 for zoom in range(13))
+        assert all(pyramid.level(zoom).capacity_kw.sum() == pytest.approx(5000.0) for zoom in range(13))
+        assert sizes == sorted(sizes) and sizes[0] == 1
+        assert pyramid.level(20) is pyramid.level(12)
+        with pytest.raises(ValueError):
+            ClusterPyramid.build(InstallationTable.from_installations(installations), cells_per_tile=6)
+
+    def test_cluster_pyramid_cells_fit_packed_keys(self):
+        """Test that grids whose cell coordinates overflow the 32-bit key halves are rejected."""
+        table = InstallationTable.from_installations(
+            [
+                make_installation(
+                    "E", InstallationType.SOLAR_PV, 1.0, "podlaskie", "Suwałki", latitude=-85.0, longitude=179.9
+                )
+            ]
+        )
+
+        finest = ClusterPyramid.build(table, min_zoom=27, max_zoom=28, cells_per_tile=8).level(28)
+
+        assert (finest.cell_x[0], finest.cell_y[0]) == tuple(np.floor(mercator([-85.0], [179.9])[0] * 2.0**31))
+        with pytest.raises(ValueError):
+            ClusterPyramid.build(table, max_zoom=29, cells_per_tile=8)
+
+    def test_mapper_clusters_and_export(self, mapper):
+        """Test zoomed map clusters, pyramid caching and streamed GeoJSON export."""
+        clusters = mapper.create_geospatial_map(zoom=5)
+        handle = io.StringIO()
+        written = mapper.export_geojson(handle)
+        collection = json.loads(handle.getvalue())
+
+        assert clusters["zoom"] == 5
+        assert clusters["clusters"][0]["properties"]["count"] == 1
+        assert mapper.create_geospatial_map(zoom=5, bbox=[14.0, 49.0, 15.0, 50.0])["clusters"] == []
+        assert mapper.cluster_pyramid() is mapper.cluster_pyramid()
+        assert mapper.create_geospatial_map(InstallationType.WIND, zoom=5)["clusters"] == []
+        assert written == 1
+        assert collection["features"][0]["properties"]["installation_id"] == "A1"
+        handle = io.StringIO()
+        assert write_geojson(iter([{"id": 1}, {"id": 2}]), handle) == 2
+        assert handle.getvalue() == "".join(iter_geojson([{"id": 1}, {"id": 2}]))
+        assert write_geojson([], io.StringIO()) == 0
+        assert collection["features"][0]["geometry"]["coordinates"] == [21.0, 52.2]
+
+        mapper.refresh()
+        assert mapper._pyramids == {}
+
+
+class TestRenewableEnergyMapper:
+    """Test cases for RenewableEnergyMapper queries over the installation table."""
+
+    def test_registry_fetched_once(self, mapper):
+        """Test that queries reuse the cached table until refresh."""
+        mapper.get_installations_by_region(voivodeship="pomorskie")
+        mapper.generate_summary_report()
+        assert mapper.scraper.fetch_installations.call_count == 1
+
+        mapper.refresh()
+        assert mapper.scraper.fetch_installations.call_count == 2
+
+    def test_get_installations(self, mapper):
+        """Test filtering by region, type and municipality."""
+        by_type = mapper.get_installations_by_region("mazowieckie", InstallationType.SOLAR_PV)
+        by_municipality = mapper.get_installations_by_municipality("warszawa", "mazowieckie")
+
+        assert [inst.installation_id for inst in by_type] == ["A1", "A3"]
+        assert [inst.installation_id for inst in by_municipality] == ["A1", "A3"]
+
+    def test_generate_regional_statistics(self, mapper):
+        """Test per-voivodeship totals and type distribution."""
+        stats = mapper.generate_regional_statistics()
+
+        assert stats["mazowieckie"].total_capacity_kw == 2150.0
+        assert stats["mazowieckie"].installation_count == 3
+        assert stats["pomorskie"].type_distribution["biogas"] == 1
+        assert stats["pomorskie"].type_distribution["wind"] == 0
+
+    def test_get_top_municipalities(self, mapper):
+        """Test ranking municipalities by capacity and by count."""
+        by_capacity = mapper.get_top_municipalities(limit=2)
+        by_count = mapper.get_top_municipalities(limit=1, sort_by="count")
+
+        assert [(row["municipality"], row["total_capacity_kw"]) for row in by_capacity] == [
+            ("Radom", 2000.0),
+            ("Gdansk", 800.0),
+        ]
+        assert by_count[0]["installation_count"] == 2
+
+    def test_generate_summary_report(self, mapper):
+        """Test registry totals by installation type."""
+        report = mapper.generate_summary_report()
+
+        assert report["total_installations"] == 5
+        assert report["total_capacity_kw"] == 2950.0
+        assert report["by_type"]["solar_pv"] == {"count": 3, "capacity_kw": 450.0}
+        assert mapper.analyze_capacity_trends()["installations_count"] == 5
+
+    def test_proximity_queries(self, mapper):
+        """Test radius, nearest and bounding box queries through the mapper."""
+        assert [inst.installation_id for inst in mapper.find_installations_near(52.21, 21.0, 5.0)] == ["A1"]
+        assert mapper.find_nearest_installations(50.0, 20.0)[0].installation_id == "A1"
+        assert mapper.find_installations_in_bbox(52.0, 20.0, 53.0, 22.0)[0].installation_id == "A1"
+        assert mapper.find_optimal_locations([(52.21, 21.0), (54.0, 18.0)]) == [(54.0, 18.0)]